@@ -0,0 +1,72 @@
+"""
+包导入耗时基准
+
+在全新的解释器中以 ``python -X importtime`` 导入目标模块，汇总总耗时并列出
+累计耗时最多的模块，用于检查冷启动（Serverless 实例、命令行批处理）开销。
+
+用法:
+    python benchmarks/bench_import.py [--stmt "import ecjtu_wechat_api"] [--top 15]
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+
+STATEMENTS = (
+    "import ecjtu_wechat_api",
+    "from ecjtu_wechat_api import parse_score_info",
+    "from ecjtu_wechat_api.main import app",
+)
+
+
+def import_times(stmt: str) -> list[tuple[str, int, int]]:
+    """执行导入语句，返回 (模块名, 自身耗时 us, 累计耗时 us) 列表，按导入完成顺序。"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", stmt],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line.removeprefix("import time:").split("|")
+        if not fields[0].strip().isdigit():
+            # 表头行
+            continue
+        rows.append((fields[2].strip(), int(fields[0]), int(fields[1])))
+    return rows
+
+
+def total_ms(rows: list[tuple[str, int, int]]) -> float:
+    """所有模块自身耗时之和（毫秒）。"""
+    return sum(own for _, own, _ in rows) / 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--stmt", action="append", help="导入语句，可重复指定")
+    parser.add_argument("--top", type=int, default=10, help="列出的模块数")
+    parser.add_argument("--repeat", type=int, default=5, help="重复次数（取中位数）")
+    args = parser.parse_args()
+
+    # 空解释器启动（site 等）的导入耗时，从各语句的总耗时中扣除
+    baseline = statistics.median(
+        total_ms(import_times("pass")) for _ in range(args.repeat)
+    )
+    for stmt in args.stmt or STATEMENTS:
+        runs = [import_times(stmt) for _ in range(args.repeat)]
+        elapsed = statistics.median(total_ms(r) for r in runs) - baseline
+        print(f"{stmt}")
+        print(f"  总耗时 {elapsed:8.1f} ms")
+        print(f"  模块数 {len(runs[0]):8d}")
+        heaviest = sorted(runs[-1], key=lambda row: row[2], reverse=True)
+        for name, _, cumulative in heaviest[: args.top]:
+            print(f"    {cumulative / 1000:8.1f} ms  {name}")
+        print()
+
+
+if __name__ == "__main__":
+    main()
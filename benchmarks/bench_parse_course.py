@@ -0,0 +1,129 @@
+"""
+课程表解析基准
+
+对比逐条目重建文本行列表、重复编译正则的旧实现与单次遍历 stripped_strings
+的 parse_course_schedule，输出每秒解析的课程条目数，并校验两者结果一致。
+文档树构建（make_soup）不计入耗时。
+
+用法:
+    python benchmarks/bench_parse_course.py [--courses 60] [--repeat 50]
+"""
+
+import argparse
+import re
+import time
+
+from ecjtu_wechat_api.mock.pages import course_page
+from ecjtu_wechat_api.models.course import Course
+from ecjtu_wechat_api.services import parse_course
+from ecjtu_wechat_api.utils.html import make_soup
+
+
+def legacy_extract(soup) -> list[Course]:
+    """改写前的课程条目解析。"""
+    courses = []
+    calendar_div = soup.find("div", class_="calendar")
+    if calendar_div and (ul_list := calendar_div.find("ul", class_="rl_info")):
+        for item in ul_list.find_all("li"):
+            if not (p := item.find("p")):
+                continue
+
+            course_info = {
+                "name": "",
+                "status": "",
+                "time": "",
+                "location": "",
+                "teacher": "",
+                "weeks": [],
+                "periods": [],
+            }
+
+            def clean_val(line):
+                return line.replace("：", ":").split(":", 1)[-1].strip()
+
+            lines = [line.strip() for line in item.stripped_strings if line.strip()]
+            period_span = p.find("span", class_="class_span")
+            period_label = period_span.get_text(strip=True) if period_span else ""
+            lines = [line for line in lines if line != period_label]
+
+            found_name = False
+            for line in lines:
+                if line.startswith(("时间", "时间:")):
+                    time_val = clean_val(line)
+                    course_info["time"] = time_val
+                    try:
+                        t_parts = time_val.split(" ")
+                        if len(t_parts) == 2:
+                            weeks_part = t_parts[0].replace("，", ",")
+                            for w_range in weeks_part.split(","):
+                                if "-" in w_range:
+                                    w_start, w_end = w_range.split("-", 1)
+                                    course_info["weeks"].append(
+                                        [int(w_start), int(w_end)]
+                                    )
+                                elif w_range.strip():
+                                    course_info["weeks"].append([int(w_range)])
+                            periods_part = t_parts[1].replace("，", ",")
+                            course_info["periods"] = [
+                                int(p_p)
+                                for p_p in periods_part.split(",")
+                                if p_p.strip()
+                            ]
+                    except (ValueError, IndexError):
+                        pass
+                elif line.startswith(("地点", "地点:")):
+                    course_info["location"] = clean_val(line)
+                elif line.startswith(("教师", "教师:")):
+                    course_info["teacher"] = clean_val(line)
+                elif not found_name:
+                    match = re.search(r"(.+?)[（(]([^（()）]+)[)）]$", line)
+                    if match:
+                        course_info["name"] = match.group(1).strip()
+                        course_info["status"] = match.group(2).strip()
+                    else:
+                        course_info["name"] = line
+                    found_name = True
+
+            if course_info["name"]:
+                courses.append(course_info)
+    return [Course(**c) for c in courses]
+
+
+def current_extract(soup) -> list[Course]:
+    return parse_course._parse_courses(soup)
+
+
+def measure(extract, soup, repeat: int) -> float:
+    """返回 repeat 次提取中最快一次的耗时（秒）。"""
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        extract(soup)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--courses", type=int, default=60, help="合成页面的课程数")
+    parser.add_argument("--repeat", type=int, default=50, help="重复次数，取最快一次")
+    args = parser.parse_args()
+
+    html = course_page(args.courses)
+    soup = make_soup(html)
+    if legacy_extract(soup) != current_extract(soup):
+        raise SystemExit("新旧实现的解析结果不一致")
+
+    print(f"合成页面: {args.courses} 个课程条目, {len(html) / 1024:.1f} KiB")
+    results = {}
+    for label, extract in (("before", legacy_extract), ("after", current_extract)):
+        elapsed = measure(extract, soup, args.repeat)
+        results[label] = args.courses / elapsed
+        print(
+            f"{label:>6}: {results[label]:>10.0f} courses/s ({elapsed * 1000:.2f} ms)"
+        )
+    print(f"speedup: {results['after'] / results['before']:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+成绩页面解析基准
+
+对比逐行多次 find/find_all 的旧实现与单次遍历的 parse_score_info，输出每秒
+解析的成绩行数，并校验两者结果一致。文档树构建（make_soup）不计入耗时。
+
+用法:
+    python benchmarks/bench_parse_score.py [--rows 200] [--repeat 20]
+"""
+
+import argparse
+import re
+import time
+from contextlib import suppress
+
+from ecjtu_wechat_api.mock.pages import score_page
+from ecjtu_wechat_api.models.score import ScoreItem
+from ecjtu_wechat_api.services import parse_score
+from ecjtu_wechat_api.utils.html import make_soup
+
+
+def legacy_parse_score_row(row) -> ScoreItem | None:
+    """改写前的成绩行解析：每个字段各自 find 一次，正则在每行重新查找。"""
+    text_div = row.find("div", class_="text")
+    if not text_div:
+        return None
+    course_span = text_div.find("span", class_="course")
+    if not course_span:
+        return None
+
+    raw_course_text = course_span.get_text(strip=True)
+    credit = 0.0
+    credit_match = re.search(r"\(学分:([\d.]+)\)", raw_course_text)
+    if credit_match:
+        with suppress(ValueError):
+            credit = float(credit_match.group(1))
+    name_match = re.search(r"【(.*?)】【(.*?)】(.*?)(?:\(|$)", raw_course_text)
+    major = name_match.group(1) if name_match else None
+    course_code = name_match.group(2) if name_match else None
+    course_name = name_match.group(3).strip() if name_match else raw_course_text
+
+    grade_div = text_div.find("div", class_="grade")
+    final_score = ""
+    reexam_score = None
+    retake_score = None
+    if grade_div:
+        score_spans = grade_div.find_all("span", class_="score")
+        if len(score_spans) >= 1:
+            final_score = score_spans[0].get_text(strip=True)
+        if len(score_spans) >= 2:
+            reexam_score = score_spans[1].get_text(strip=True) or None
+        if len(score_spans) >= 3:
+            retake_score = score_spans[2].get_text(strip=True) or None
+
+    course_type = ""
+    type_div = row.find("div", class_="type")
+    if type_div and (mark := type_div.find("mark")):
+        course_type = mark.get_text(strip=True)
+
+    return ScoreItem(
+        course_name=course_name,
+        course_code=course_code,
+        final_score=final_score,
+        reexam_score=reexam_score,
+        retake_score=retake_score,
+        course_type=course_type,
+        credit=credit,
+        major=major,
+    )
+
+
+def legacy_extract(soup) -> list[ScoreItem]:
+    soup.find("div", class_="right")
+    soup.find("ul", class_="dropdown-menu")
+    soup.find("div", class_="words")
+    return [
+        item
+        for row in soup.find_all("div", class_="row")
+        if (item := legacy_parse_score_row(row))
+    ]
+
+
+def current_extract(soup) -> list[ScoreItem]:
+    *_, rows = parse_score._scan_document(soup)
+    return [item for row in rows if (item := parse_score._parse_score_row(row))]
+
+
+def measure(extract, soup, repeat: int) -> float:
+    """返回 repeat 次提取中最快一次的耗时（秒）。"""
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        extract(soup)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=200, help="合成页面的课程数")
+    parser.add_argument("--repeat", type=int, default=20, help="重复次数，取最快一次")
+    args = parser.parse_args()
+
+    html = score_page(args.rows)
+    soup = make_soup(html)
+    if legacy_extract(soup) != current_extract(soup):
+        raise SystemExit("新旧实现的解析结果不一致")
+    if parse_score.parse_score_info(html).scores != current_extract(soup):
+        raise SystemExit("parse_score_info 与单次遍历的结果不一致")
+
+    print(f"合成页面: {args.rows} 门课程, {len(html) / 1024:.1f} KiB")
+    results = {}
+    for label, extract in (("before", legacy_extract), ("after", current_extract)):
+        elapsed = measure(extract, soup, args.repeat)
+        results[label] = args.rows / elapsed
+        print(f"{label:>6}: {results[label]:>10.0f} rows/s ({elapsed * 1000:.2f} ms)")
+    print(f"speedup: {results['after'] / results['before']:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
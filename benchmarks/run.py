@@ -0,0 +1,280 @@
+"""
+基准测试套件
+
+生成不同规模的合成页面，测量课表、成绩、考试安排三个解析函数的吞吐量与内存
+峰值；再以 httpx.MockTransport 模拟教务系统，通过 ASGITransport 端到端驱动
+FastAPI 应用，测量各接口在缓存未命中/命中时的请求吞吐量与延迟分位数。
+
+结果以 JSON 输出，每项以 name 标识，可用 --compare 与之前保存的结果逐项比较。
+
+用法:
+    python benchmarks/run.py [--quick] [--output results.json]
+    python benchmarks/run.py --compare baseline.json [--threshold 0.2]
+"""
+
+import os
+
+# 基准只衡量本服务自身的开销：放开上游限流，关闭重试与高频日志
+os.environ.setdefault("UPSTREAM_RATE", "1000000")
+os.environ.setdefault("UPSTREAM_BURST", "1000000")
+os.environ.setdefault("UPSTREAM_MAX_CONCURRENCY", "1024")
+os.environ.setdefault("UPSTREAM_INITIAL_CONCURRENCY", "1024")
+os.environ.setdefault("HTTP_RETRIES", "0")
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+import argparse  # noqa: E402
+import asyncio  # noqa: E402
+import json  # noqa: E402
+import platform  # noqa: E402
+import statistics  # noqa: E402
+import subprocess  # noqa: E402
+import sys  # noqa: E402
+import time  # noqa: E402
+import tracemalloc  # noqa: E402
+from collections.abc import Callable  # noqa: E402
+from datetime import datetime  # noqa: E402
+from typing import Any  # noqa: E402
+
+import httpx  # noqa: E402
+
+from ecjtu_wechat_api.main import app  # noqa: E402
+from ecjtu_wechat_api.mock.pages import course_page, exam_page, score_page  # noqa: E402
+from ecjtu_wechat_api.services.parse_course import parse_course_schedule  # noqa: E402
+from ecjtu_wechat_api.services.parse_exam import parse_exam_schedule  # noqa: E402
+from ecjtu_wechat_api.services.parse_score import parse_score_info  # noqa: E402
+from ecjtu_wechat_api.utils import http  # noqa: E402
+from ecjtu_wechat_api.utils.cache import response_cache  # noqa: E402
+
+# 解析基准: (名称, 页面生成函数, 解析函数, 完整规模, --quick 规模)
+# 规模为课程条目数 / 成绩行数 / 考试行数；成绩与考试页面带 12 个可选学期
+PARSER_CASES = [
+    ("courses", course_page, parse_course_schedule, (6, 24, 96), (6,)),
+    (
+        "scores",
+        lambda n: score_page(n, terms=12),
+        parse_score_info,
+        (40, 200, 800),
+        (40,),
+    ),
+    (
+        "exams",
+        lambda n: exam_page(n, terms=12),
+        parse_exam_schedule,
+        (10, 50, 200),
+        (10,),
+    ),
+]
+
+# 端到端基准: (名称, 接口路径及参数)
+ENDPOINT_CASES = [
+    ("courses", "/courses/daily?date=2026-01-05"),
+    ("scores", "/scores/info?term=2025.1"),
+    ("exams", "/exams/schedule?term=2025.1"),
+]
+
+
+def bench_parser(
+    name: str,
+    page: Callable[[int], str],
+    parse: Callable[[str], Any],
+    size: int,
+    repeat: int,
+) -> dict:
+    """测量解析整页（含构建文档树）的耗时与内存峰值。"""
+    html = page(size)
+    parse(html)  # 预热
+
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        parse(html)
+        times.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    parse(html)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    best = min(times)
+    return {
+        "name": f"parse.{name}[{size}]",
+        "kind": "parse",
+        "size": size,
+        "html_kib": round(len(html.encode("utf-8")) / 1024, 1),
+        "best_ms": round(best * 1000, 3),
+        "median_ms": round(statistics.median(times) * 1000, 3),
+        "items_per_s": round(size / best, 1),
+        "peak_kib": round(peak / 1024, 1),
+    }
+
+
+def _upstream(size: int, latency: float) -> httpx.MockTransport:
+    """按路径返回合成页面的模拟教务系统。"""
+    pages = {
+        "/weixin/CalendarServlet": course_page(max(6, size // 8)),
+        "/weixin/ScoreQuery": score_page(size, terms=12),
+        "/weixin/ExamArrangeCl": exam_page(max(10, size // 4), terms=12),
+    }
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        if latency:
+            await asyncio.sleep(latency)
+        body = pages.get(request.url.path)
+        if body is None:
+            return httpx.Response(404)
+        return httpx.Response(200, text=body)
+
+    return httpx.MockTransport(handler)
+
+
+async def bench_endpoint(
+    name: str, path: str, requests: int, concurrency: int, cached: bool
+) -> dict:
+    """
+    并发请求接口并统计吞吐量与延迟。cached 为 False 时每个请求使用不同的
+    weiXinID（每次都抓取并解析），为 True 时使用同一个已预热的 weiXinID。
+    """
+    response_cache.clear()
+    latencies: list[float] = []
+    semaphore = asyncio.Semaphore(concurrency)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as c:
+
+        async def one(index: int) -> None:
+            weixin_id = "bench" if cached else f"bench{index}"
+            async with semaphore:
+                start = time.perf_counter()
+                response = await c.get(f"{path}&weiXinID={weixin_id}")
+                latencies.append(time.perf_counter() - start)
+            if response.status_code != 200:
+                raise SystemExit(f"{path} 返回 {response.status_code}: {response.text}")
+
+        if cached:
+            await one(-1)
+            latencies.clear()
+        start = time.perf_counter()
+        await asyncio.gather(*(one(i) for i in range(requests)))
+        elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "name": f"e2e.{name}.{'hit' if cached else 'miss'}",
+        "kind": "e2e",
+        "requests": requests,
+        "concurrency": concurrency,
+        "requests_per_s": round(requests / elapsed, 1),
+        "p50_ms": round(latencies[len(latencies) // 2] * 1000, 3),
+        "p95_ms": round(latencies[int(len(latencies) * 0.95) - 1] * 1000, 3),
+    }
+
+
+async def run_endpoints(
+    requests: int, concurrency: int, size: int, latency: float
+) -> list[dict]:
+    http._client = httpx.AsyncClient(transport=_upstream(size, latency))
+    try:
+        return [
+            await bench_endpoint(name, path, requests, concurrency, cached)
+            for name, path in ENDPOINT_CASES
+            for cached in (False, True)
+        ]
+    finally:
+        await http.close_http_client()
+
+
+def _metadata() -> dict:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+    }
+
+
+# 用于比较的主要指标（均为越大越好）
+_PRIMARY = {"parse": "items_per_s", "e2e": "requests_per_s"}
+
+
+def compare(results: list[dict], baseline: list[dict], threshold: float) -> bool:
+    """逐项打印与基线的比值，任一项下降超过 threshold 时返回 False。"""
+    previous = {item["name"]: item for item in baseline}
+    ok = True
+    for item in results:
+        old = previous.get(item["name"])
+        if old is None:
+            continue
+        metric = _PRIMARY[item["kind"]]
+        ratio = item[metric] / old[metric] if old[metric] else float("inf")
+        regressed = ratio < 1 - threshold
+        ok = ok and not regressed
+        flag = "  <-- 退化" if regressed else ""
+        print(f"{item['name']:<28} {metric:>15} {ratio:6.2f}x{flag}", file=sys.stderr)
+    return ok
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--quick", action="store_true", help="只运行小规模用例")
+    parser.add_argument("--repeat", type=int, default=None, help="解析基准重复次数")
+    parser.add_argument("--requests", type=int, default=None, help="端到端请求数")
+    parser.add_argument("--concurrency", type=int, default=16, help="端到端并发数")
+    parser.add_argument(
+        "--latency", type=float, default=0.0, help="模拟的教务系统响应延迟（秒）"
+    )
+    parser.add_argument("--output", help="结果 JSON 的写入路径（默认输出到 stdout）")
+    parser.add_argument("--compare", help="用于比较的基线结果 JSON")
+    parser.add_argument(
+        "--threshold", type=float, default=0.2, help="视为退化的下降比例"
+    )
+    args = parser.parse_args()
+    repeat = args.repeat or (3 if args.quick else 20)
+    requests = args.requests or (20 if args.quick else 200)
+
+    results = []
+    for name, page, parse, sizes, quick_sizes in PARSER_CASES:
+        for size in quick_sizes if args.quick else sizes:
+            result = bench_parser(name, page, parse, size, repeat)
+            results.append(result)
+            print(
+                f"{result['name']:<24} {result['items_per_s']:>10.0f} items/s "
+                f"{result['best_ms']:>9.2f} ms {result['peak_kib']:>9.0f} KiB peak",
+                file=sys.stderr,
+            )
+    for result in asyncio.run(
+        run_endpoints(
+            requests, args.concurrency, 40 if args.quick else 200, args.latency
+        )
+    ):
+        results.append(result)
+        print(
+            f"{result['name']:<24} {result['requests_per_s']:>10.0f} req/s "
+            f"p50 {result['p50_ms']:.2f} ms  p95 {result['p95_ms']:.2f} ms",
+            file=sys.stderr,
+        )
+
+    report = {"meta": _metadata(), "results": results}
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+        if not compare(results, baseline, args.threshold):
+            raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,31 +1,85 @@
-import tomllib
-from pathlib import Path
+"""
+华东交通大学教务系统微信版 API
 
-_pyproject = Path(__file__).parent.parent.parent / "pyproject.toml"
-with _pyproject.open("rb") as f:
-    __version__ = tomllib.load(f)["project"]["version"]
+包本身只提供按需加载的入口：路由与解析服务在首次访问时才导入（PEP 562），
+只使用 parse_score_info 等解析函数的脚本不会加载 FastAPI 及全部路由。
+"""
+
+from importlib import import_module
+from typing import TYPE_CHECKING
 
 __author__ = "mochenyaa"
 __copyright__ = "Copyright (c) 2026 mochenyaa"
 
-from ecjtu_wechat_api.api import (  # noqa: E402
-    courses_router,
-    exams_router,
-    scores_router,
-)
-from ecjtu_wechat_api.services import (  # noqa: E402
-    fetch_course_schedule,
-    fetch_exam_schedule,
-    fetch_score_info,
-    parse_course_schedule,
-    parse_exam_schedule,
-    parse_score_info,
-)
+# 公开名称 -> 所在模块
+_LAZY_ATTRS = {
+    "courses_router": "ecjtu_wechat_api.api.routes.courses",
+    "scores_router": "ecjtu_wechat_api.api.routes.scores",
+    "exams_router": "ecjtu_wechat_api.api.routes.exams",
+    "notifications_router": "ecjtu_wechat_api.api.routes.notifications",
+    "batch_router": "ecjtu_wechat_api.api.routes.batch",
+    "fetch_course_schedule": "ecjtu_wechat_api.services.parse_course",
+    "parse_course_schedule": "ecjtu_wechat_api.services.parse_course",
+    "fetch_score_info": "ecjtu_wechat_api.services.parse_score",
+    "parse_score_info": "ecjtu_wechat_api.services.parse_score",
+    "fetch_exam_schedule": "ecjtu_wechat_api.services.parse_exam",
+    "parse_exam_schedule": "ecjtu_wechat_api.services.parse_exam",
+}
+
+if TYPE_CHECKING:
+    from ecjtu_wechat_api.api import (
+        batch_router,
+        courses_router,
+        exams_router,
+        notifications_router,
+        scores_router,
+    )
+    from ecjtu_wechat_api.services import (
+        fetch_course_schedule,
+        fetch_exam_schedule,
+        fetch_score_info,
+        parse_course_schedule,
+        parse_exam_schedule,
+        parse_score_info,
+    )
+
+    __version__: str
+
+
+def _package_version() -> str:
+    """从安装的包元数据读取版本号，未安装（直接运行源码）时返回占位版本。"""
+    from importlib.metadata import PackageNotFoundError, version
+
+    try:
+        return version("ecjtu-wechat-api")
+    except PackageNotFoundError:
+        return "0.0.0+unknown"
+
+
+def __getattr__(name: str):
+    if name == "__version__":
+        value = _package_version()
+    elif name in _LAZY_ATTRS:
+        # 路由模块中的对象名为 router，服务模块中与公开名称同名
+        module = import_module(_LAZY_ATTRS[name])
+        value = getattr(module, "router" if name.endswith("_router") else name)
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    # 写入模块命名空间，之后的访问不再经过 __getattr__
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted([*globals(), "__version__", *_LAZY_ATTRS])
+
 
 __all__ = [
     "courses_router",
     "scores_router",
     "exams_router",
+    "notifications_router",
+    "batch_router",
     "fetch_course_schedule",
     "parse_course_schedule",
     "fetch_score_info",
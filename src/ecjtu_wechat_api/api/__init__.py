@@ -1,3 +1,15 @@
-from ecjtu_wechat_api.api.routes import courses_router, exams_router, scores_router
+from ecjtu_wechat_api.api.routes import (
+    batch_router,
+    courses_router,
+    exams_router,
+    notifications_router,
+    scores_router,
+)
 
-__all__ = ["courses_router", "scores_router", "exams_router"]
+__all__ = [
+    "courses_router",
+    "scores_router",
+    "exams_router",
+    "notifications_router",
+    "batch_router",
+]
@@ -0,0 +1,102 @@
+"""
+请求耗时中间件
+
+ServerTimingMiddleware 为每个请求建立阶段耗时记录，发送响应时附加 Server-Timing
+头，并汇总为请求耗时与响应大小直方图；TimedRoute 记录路由函数返回的时刻，
+其后到开始发送响应之间计为 serialize 阶段。
+"""
+
+import functools
+import inspect
+import time
+from collections.abc import Callable
+from typing import Any
+
+from fastapi.routing import APIRoute
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from ecjtu_wechat_api.utils.metrics import Histogram
+from ecjtu_wechat_api.utils.timing import RequestTimings, request_timings
+
+HTTP_REQUEST_DURATION = Histogram(
+    "ecjtu_http_request_duration_seconds",
+    "处理请求的耗时（至响应发送完毕）",
+    ("route", "method", "status"),
+)
+HTTP_RESPONSE_SIZE = Histogram(
+    "ecjtu_http_response_size_bytes",
+    "响应体大小",
+    ("route",),
+    buckets=tuple(256 * 4**i for i in range(9)),
+)
+
+
+def _mark_handler_end(endpoint: Callable[..., Any]) -> Callable[..., Any]:
+    """包装路由函数，在其返回时记录时刻，用于计算序列化耗时。"""
+
+    @functools.wraps(endpoint)
+    async def wrapper(*args: Any, **kwargs: Any) -> Any:
+        result = await endpoint(*args, **kwargs)
+        timings = request_timings.get()
+        if timings is not None:
+            timings.handler_end = time.perf_counter()
+        return result
+
+    return wrapper
+
+
+class TimedRoute(APIRoute):
+    """记录路由函数返回时刻的路由类，用于 APIRouter(route_class=TimedRoute)。"""
+
+    def __init__(self, path: str, endpoint: Callable[..., Any], **kwargs: Any):
+        # 生成器及同步路由函数保持原样（不统计序列化耗时）
+        if inspect.iscoroutinefunction(endpoint):
+            endpoint = _mark_handler_end(endpoint)
+        super().__init__(path, endpoint, **kwargs)
+
+
+class ServerTimingMiddleware:
+    """为 HTTP 响应附加 Server-Timing 头，并记录请求耗时与响应大小。"""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timings = RequestTimings()
+        token = request_timings.set(timings)
+        start = time.perf_counter()
+        status = 500
+        size = 0
+
+        async def send_with_timing(message: Message) -> None:
+            nonlocal status, size
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                now = time.perf_counter()
+                if timings.handler_end is not None:
+                    timings.stages["serialize"] = now - timings.handler_end
+                headers = MutableHeaders(scope=message)
+                headers.append("Server-Timing", timings.header(now - start))
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+                if not message.get("more_body", False):
+                    # 以路由模板（如 /scores/info）作为标签，避免时间序列过多
+                    route = getattr(scope.get("route"), "path", "unmatched")
+                    HTTP_RESPONSE_SIZE.observe(size, route=route)
+                    HTTP_REQUEST_DURATION.observe(
+                        time.perf_counter() - start,
+                        route=route,
+                        method=scope["method"],
+                        status=str(status),
+                    )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            request_timings.reset(token)
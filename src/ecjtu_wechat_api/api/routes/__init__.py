@@ -1,5 +1,13 @@
+from ecjtu_wechat_api.api.routes.batch import router as batch_router
 from ecjtu_wechat_api.api.routes.courses import router as courses_router
 from ecjtu_wechat_api.api.routes.exams import router as exams_router
+from ecjtu_wechat_api.api.routes.notifications import router as notifications_router
 from ecjtu_wechat_api.api.routes.scores import router as scores_router
 
-__all__ = ["courses_router", "scores_router", "exams_router"]
+__all__ = [
+    "courses_router",
+    "scores_router",
+    "exams_router",
+    "notifications_router",
+    "batch_router",
+]
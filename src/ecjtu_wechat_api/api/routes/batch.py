@@ -0,0 +1,108 @@
+import asyncio
+from collections.abc import AsyncIterator, Awaitable, Callable
+from datetime import date as date_type
+from typing import Any
+
+from fastapi import APIRouter
+from fastapi.responses import StreamingResponse
+
+from ecjtu_wechat_api.api.middleware import TimedRoute
+from ecjtu_wechat_api.core.config import settings
+from ecjtu_wechat_api.core.exceptions import ECJTUAPIError, InvalidParameterError
+from ecjtu_wechat_api.models.batch import (
+    BatchError,
+    BatchJob,
+    BatchRequest,
+    BatchResult,
+)
+from ecjtu_wechat_api.services.loader import (
+    load_course_schedule,
+    load_exam_schedule,
+    load_score_info,
+)
+from ecjtu_wechat_api.utils.logger import logger
+
+router = APIRouter(tags=["batch"], route_class=TimedRoute)
+
+
+def _loader(job: BatchJob) -> Callable[[], Awaitable[Any]]:
+    """按任务类型选择对应单项接口的加载函数（与单项接口共用缓存）。"""
+    if job.kind == "courses":
+        day = job.date or date_type.today().strftime("%Y-%m-%d")
+        return lambda: load_course_schedule(job.weiXinID, day)
+    if job.kind == "scores":
+        return lambda: load_score_info(job.weiXinID, job.term)
+    return lambda: load_exam_schedule(job.weiXinID, job.term)
+
+
+async def run_job(index: int, job: BatchJob) -> BatchResult:
+    """执行单个任务，失败时将异常转换为该任务的错误结果而不向外抛出。"""
+    result = BatchResult(index=index, weiXinID=job.weiXinID, kind=job.kind, status="ok")
+    try:
+        data = await _loader(job)()
+    except ECJTUAPIError as e:
+        result.status = "error"
+        result.error = BatchError(
+            message=e.message,
+            status_code=getattr(e, "status_code", 400),
+            details=e.details,
+        )
+        return result
+    except Exception as e:
+        logger.exception("批量任务执行失败: %s, %s", job.kind, e)
+        result.status = "error"
+        result.error = BatchError(message="服务器内部错误，请稍后再试", status_code=500)
+        return result
+    result.data = data.model_dump(mode="json")
+    return result
+
+
+async def run_batch(jobs: list[BatchJob]) -> AsyncIterator[BatchResult]:
+    """
+    并发执行批量任务，按完成顺序逐个产出结果。
+
+    同时进行的任务不超过 BATCH_CONCURRENCY，访问教务系统的请求另受上游限流
+    约束。调用方停止迭代（如客户端断开连接）时取消尚未完成的任务。
+    """
+    semaphore = asyncio.Semaphore(settings.BATCH_CONCURRENCY)
+
+    async def run(index: int, job: BatchJob) -> BatchResult:
+        async with semaphore:
+            return await run_job(index, job)
+
+    tasks = [asyncio.ensure_future(run(i, job)) for i, job in enumerate(jobs)]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+async def _ndjson(jobs: list[BatchJob]) -> AsyncIterator[str]:
+    async for result in run_batch(jobs):
+        yield result.model_dump_json() + "\n"
+
+
+@router.post(
+    "/batch",
+    summary="批量查询",
+    description=(
+        "一次提交多个 (weiXinID, 数据类型, 学期/日期) 查询任务，并发执行，"
+        "以 NDJSON（每行一个 JSON）按完成顺序流式返回各任务的结果。"
+        "单个任务失败只在该行返回错误信息，不影响其余任务。"
+    ),
+)
+async def batch(request: BatchRequest):
+    """
+    具体的批量查询逻辑：
+    1. 校验任务数不超过 BATCH_MAX_JOBS。
+    2. 在并发上限内执行各任务（与单项接口共用缓存、单飞合并与上游限流）。
+    3. 每完成一个任务立即输出一行结果，index 对应请求中任务的下标。
+    """
+    if len(request.jobs) > settings.BATCH_MAX_JOBS:
+        raise InvalidParameterError(
+            f"任务数过多，单次最多支持 {settings.BATCH_MAX_JOBS} 个",
+            details={"jobs": len(request.jobs)},
+        )
+    return StreamingResponse(_ndjson(request.jobs), media_type="application/x-ndjson")
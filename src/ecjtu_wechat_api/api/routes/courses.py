@@ -1,14 +1,100 @@
+import asyncio
 from datetime import date as date_type
+from datetime import timedelta
 
-from fastapi import APIRouter, Query
+from fastapi import APIRouter, Query, Request
+from fastapi.responses import Response
 
-from ecjtu_wechat_api.models.course import CourseSchedule
-from ecjtu_wechat_api.services.parse_course import (
-    fetch_course_schedule,
-    parse_course_schedule,
+from ecjtu_wechat_api.api.middleware import TimedRoute
+from ecjtu_wechat_api.core.config import settings
+from ecjtu_wechat_api.core.exceptions import InvalidParameterError, ParseError
+from ecjtu_wechat_api.models.course import (
+    CourseSchedule,
+    CourseTimetable,
+    TermTimetable,
 )
+from ecjtu_wechat_api.services.calendar import course_events
+from ecjtu_wechat_api.services.loader import load_course_schedule
+from ecjtu_wechat_api.services.timetable import (
+    build_timetable,
+    date_of,
+    expand_term_timetable,
+    next_sample_dates,
+    schedule_from_index,
+    term_start_from,
+)
+from ecjtu_wechat_api.utils.cache import response_cache
+from ecjtu_wechat_api.utils.ics import calendar_etag, calendar_response
+from ecjtu_wechat_api.utils.logger import logger
+
+router = APIRouter(prefix="/courses", tags=["courses"], route_class=TimedRoute)
+
+
+async def _load_days(
+    weiXinID: str, dates: list[date_type]
+) -> list[tuple[date_type, CourseSchedule]]:
+    """在并发上限内抓取多个日期的课表，返回 (日期, 课表) 列表。"""
+    semaphore = asyncio.Semaphore(settings.COURSES_FANOUT_CONCURRENCY)
+
+    async def load_day(day: date_type) -> CourseSchedule:
+        async with semaphore:
+            return await load_course_schedule(weiXinID, day.isoformat())
+
+    schedules = await asyncio.gather(*(load_day(d) for d in dates))
+    return list(zip(dates, schedules, strict=True))
 
-router = APIRouter(prefix="/courses", tags=["courses"])
+
+async def _load_timetable(
+    weiXinID: str, start: date_type, end: date_type
+) -> CourseTimetable:
+    """在并发上限内抓取区间内每一天的课表，并组装为课表网格。"""
+    dates = [start + timedelta(days=i) for i in range((end - start).days + 1)]
+    return build_timetable(await _load_days(weiXinID, dates), start, end)
+
+
+async def _load_term_start(
+    weiXinID: str, ref_date: date_type
+) -> tuple[date_type, CourseSchedule]:
+    """由参考日期的课表识别学期起始周，返回 (第 1 周的周一, 参考日期的课表)。"""
+    ref = await load_course_schedule(weiXinID, ref_date.isoformat())
+    term_start = term_start_from(ref.date_info)
+    if term_start is None:
+        raise ParseError(
+            "无法从课表页面识别教学周次", details={"date": ref_date.isoformat()}
+        )
+    return term_start, ref
+
+
+async def _load_term_timetable(
+    weiXinID: str,
+    ref_date: date_type,
+    term: tuple[date_type, CourseSchedule] | None = None,
+) -> TermTimetable:
+    """
+    由参考日期识别学期起始周，抓取参考日期所在周（及 TIMETABLE_SAMPLE_WEEKS）
+    的课表，再按已知课程的周次补充抓取未覆盖的周，推导整学期课表索引。
+    总抓取天数不超过 TIMETABLE_MAX_SAMPLE_DAYS。
+
+    Args:
+        term: 已由 _load_term_start 得到的 (学期起始日, 参考日期的课表)
+    """
+    term_start, ref = term or await _load_term_start(weiXinID, ref_date)
+
+    ref_week = (ref_date - term_start).days // 7 + 1
+    sample_dates = sorted(
+        {
+            date_of(term_start, week, weekday)
+            for week in {ref_week, *settings.TIMETABLE_SAMPLE_WEEKS}
+            for weekday in range(1, 8)
+        }
+        - {ref_date}
+    )
+    samples = [(ref_date, ref), *await _load_days(weiXinID, sample_dates)]
+    budget = settings.TIMETABLE_MAX_SAMPLE_DAYS - len(samples)
+    while budget > 0 and (dates := next_sample_dates(term_start, samples, budget)):
+        samples.extend(await _load_days(weiXinID, dates))
+        budget -= len(dates)
+    return expand_term_timetable(term_start, sorted(samples, key=lambda s: s[0]))
 
 
 @router.get(
@@ -33,18 +119,208 @@ async def get_course(
     """
     具体的课程表获取逻辑：
     1. 校验并格式化日期（默认为当天）。
-    2. 调用解析服务，模拟移动端环境从教务系统抓取原始 HTML。
-    3. 解析 HTML 并映射到 CourseSchedule 结构化模型。
-    4. 返回 JSON 格式的解析结果。
+    2. 命中缓存时直接返回已解析的结果。
+    3. 否则调用解析服务，模拟移动端环境从教务系统抓取原始 HTML。
+    4. 解析 HTML 并映射到 CourseSchedule 结构化模型，写入缓存后返回。
     """
     # 默认使用当天日期
     if not date:
         date = date_type.today().strftime("%Y-%m-%d")
 
-    # 获取原始 HTML
-    html_content = await fetch_course_schedule(weiXinID, date)
+    return await load_course_schedule(weiXinID, date)
+
+
+@router.get(
+    "/week",
+    response_model=CourseTimetable,
+    summary="获取一周课程表",
+    description=(
+        "获取指定日期所在自然周（星期一至星期日）的课程表，"
+        "按星期和节次组织并合并重复课程。"
+    ),
+)
+async def get_week_courses(
+    weiXinID: str = Query(
+        ...,
+        description="教务系统绑定的微信用户ID，通过访问微信教务公众号获取。",
+    ),
+    date: date_type | None = Query(
+        None,
+        description=("该周内的任意日期，格式为 YYYY-MM-DD。如果不提供，默认为本周。"),
+    ),
+):
+    """
+    具体的周课表获取逻辑：
+    1. 计算日期所在周的星期一和星期日。
+    2. 并发抓取 7 天的课表（已缓存的日期直接复用）。
+    3. 合并为 星期 -> 节次 -> 课程 的课表网格。
+    """
+    day = date or date_type.today()
+    monday = day - timedelta(days=day.weekday())
+    return await _load_timetable(weiXinID, monday, monday + timedelta(days=6))
+
+
+@router.get(
+    "/range",
+    response_model=CourseTimetable,
+    summary="获取日期区间课程表",
+    description=(
+        "获取起止日期（含）之间每一天的课程表，按星期和节次组织并合并重复课程，"
+        "可用于整学期课表。"
+    ),
+)
+async def get_range_courses(
+    weiXinID: str = Query(
+        ...,
+        description="教务系统绑定的微信用户ID，通过访问微信教务公众号获取。",
+    ),
+    start: date_type = Query(..., description="起始日期，格式为 YYYY-MM-DD"),
+    end: date_type = Query(..., description="结束日期（含），格式为 YYYY-MM-DD"),
+):
+    """
+    具体的区间课表获取逻辑：
+    1. 校验日期区间（起始不晚于结束，且不超过 COURSES_RANGE_MAX_DAYS 天）。
+    2. 在并发上限内抓取区间内每一天的课表（已缓存的日期直接复用）。
+    3. 合并为 星期 -> 节次 -> 课程 的课表网格。
+    """
+    if start > end:
+        raise InvalidParameterError("起始日期不能晚于结束日期")
+    days = (end - start).days + 1
+    if days > settings.COURSES_RANGE_MAX_DAYS:
+        raise InvalidParameterError(
+            f"查询区间过长，最多支持 {settings.COURSES_RANGE_MAX_DAYS} 天",
+            details={"days": days},
+        )
+    return await _load_timetable(weiXinID, start, end)
+
+
+@router.get(
+    "/term",
+    response_model=TermTimetable,
+    summary="获取整学期课表索引",
+    description=(
+        "抓取少量采样周的课表，根据每门课程的周次与节次推导整学期课表，"
+        "返回 周次 -> 星期几 -> 节次 -> 课程 的索引。"
+    ),
+)
+async def get_term_timetable(
+    weiXinID: str = Query(
+        ...,
+        description="教务系统绑定的微信用户ID，通过访问微信教务公众号获取。",
+    ),
+    date: date_type | None = Query(
+        None,
+        description=(
+            "学期内的任意日期，用于识别学期起始周，格式为 YYYY-MM-DD。"
+            "如果不提供，默认为今天。"
+        ),
+    ),
+):
+    """
+    具体的整学期课表推导逻辑：
+    1. 抓取参考日期的课表，根据日期与教学周次推算第 1 周星期一。
+    2. 并发抓取参考日期所在周，再按已知课程的周次补充抓取未覆盖的周
+       （已缓存的日期直接复用，总天数不超过 TIMETABLE_MAX_SAMPLE_DAYS）。
+    3. 将常规课程按周次展开为整学期索引，调课等异常日期单独标记。
+    """
+    return await _load_term_timetable(weiXinID, date or date_type.today())
+
+
+@router.get(
+    "/term/week",
+    response_model=CourseTimetable,
+    summary="获取学期第 N 周课程表",
+    description=(
+        "基于整学期课表索引返回指定教学周的课表，"
+        "仅对存在调课等异常状态的日期重新抓取教务系统页面核实。"
+    ),
+)
+async def get_term_week(
+    weiXinID: str = Query(
+        ...,
+        description="教务系统绑定的微信用户ID，通过访问微信教务公众号获取。",
+    ),
+    week: int = Query(..., ge=1, le=30, description="教学周次，如 12"),
+    date: date_type | None = Query(
+        None,
+        description=(
+            "学期内的任意日期，用于识别学期起始周，格式为 YYYY-MM-DD。"
+            "如果不提供，默认为今天。"
+        ),
+    ),
+):
+    """
+    具体的教学周课表获取逻辑：
+    1. 获取（或推导）整学期课表索引。
+    2. 采样日期及被标记为异常的日期使用教务系统的实际页面，其余日期由索引还原。
+    3. 合并为 星期 -> 节次 -> 课程 的课表网格。
+    """
+    term = await _load_term_timetable(weiXinID, date or date_type.today())
+    term_start = date_type.fromisoformat(term.term_start)
+    verify = set(term.anomalous_days.get(week, []))
+
+    real_dates = [
+        date_of(term_start, week, weekday)
+        for weekday in range(1, 8)
+        if weekday in verify
+        or date_of(term_start, week, weekday).isoformat() in term.sampled_dates
+    ]
+    days = dict(await _load_days(weiXinID, real_dates))
+    for weekday in range(1, 8):
+        day = date_of(term_start, week, weekday)
+        if day not in days:
+            days[day] = schedule_from_index(term, week, weekday)
+
+    start = date_of(term_start, week, 1)
+    return build_timetable(sorted(days.items()), start, start + timedelta(days=6))
 
-    # 解析并构造 Pydantic 模型
-    parsed_data = parse_course_schedule(html_content)
 
-    return parsed_data
+@router.get(
+    "/calendar.ics",
+    summary="订阅整学期课表日历",
+    description=(
+        "由整学期课表索引按周次展开每门课程，并按节次作息时间表换算为具体时间，"
+        "以 iCalendar 格式返回，可在日历应用中订阅。"
+        "响应附带 ETag，内容未变化时对条件请求返回 304。"
+    ),
+    response_class=Response,
+    responses={200: {"content": {"text/calendar": {}}}},
+)
+async def get_course_calendar(
+    request: Request,
+    weiXinID: str = Query(
+        ...,
+        description="教务系统绑定的微信用户ID，通过访问微信教务公众号获取。",
+    ),
+    date: date_type | None = Query(
+        None,
+        description=(
+            "学期内的任意日期，用于识别学期起始周，格式为 YYYY-MM-DD。"
+            "如果不提供，默认为今天。"
+        ),
+    ),
+):
+    """
+    具体的课表日历生成逻辑：
+    1. 由参考日期的课表识别学期起始周，同一学期内的任意日期共用一份日历。
+    2. 命中缓存时直接复用已生成的日历事件及 ETag。
+    3. 否则推导整学期课表索引，按周次和节次展开为日历事件，
+       以 CACHE_TTL_CALENDAR 写入缓存。
+    4. 请求的 If-None-Match 与 ETag 一致时直接返回 304。
+    """
+    ref_date = date or date_type.today()
+    term_start, ref = await _load_term_start(weiXinID, ref_date)
+    key = ("courses_ics", weiXinID, term_start.isoformat())
+    calendar = response_cache.get(key)
+    if calendar is None:
+        term = await _load_term_timetable(weiXinID, ref_date, (term_start, ref))
+        name = f"课表 {term.term_start} 起"
+        events = course_events(term)
+        calendar = (name, events, calendar_etag(name, events))
+        response_cache.set(key, calendar, settings.CACHE_TTL_CALENDAR)
+    else:
+        logger.debug("缓存命中: %s weiXinID=%s %s", *key)
+    name, events, etag = calendar
+    return calendar_response(
+        request, name, events, max_age=settings.CACHE_TTL_CALENDAR, etag=etag
+    )
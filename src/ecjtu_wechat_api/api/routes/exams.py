@@ -1,12 +1,14 @@
-from fastapi import APIRouter, Query
+from fastapi import APIRouter, Query, Request
+from fastapi.responses import Response
 
+from ecjtu_wechat_api.api.middleware import TimedRoute
+from ecjtu_wechat_api.core.config import settings
 from ecjtu_wechat_api.models.exam import ExamSchedule
-from ecjtu_wechat_api.services.parse_exam import (
-    fetch_exam_schedule,
-    parse_exam_schedule,
-)
+from ecjtu_wechat_api.services.calendar import exam_events
+from ecjtu_wechat_api.services.loader import load_exam_schedule
+from ecjtu_wechat_api.utils.ics import calendar_response
 
-router = APIRouter(prefix="/exams", tags=["exams"])
+router = APIRouter(prefix="/exams", tags=["exams"], route_class=TimedRoute)
 
 
 @router.get(
@@ -29,14 +31,46 @@ async def get_exam_schedule(
 ):
     """
     具体的考试安排获取逻辑：
-    1. 调用解析服务，模拟移动端环境从教务系统抓取原始 HTML。
-    2. 解析 HTML 并映射到 ExamSchedule 结构化模型。
-    3. 返回 JSON 格式的解析结果。
+    1. 命中缓存时直接返回已解析的结果（历史学期缓存时间更长）。
+    2. 否则调用解析服务，模拟移动端环境从教务系统抓取原始 HTML。
+    3. 解析 HTML 并映射到 ExamSchedule 结构化模型，写入缓存后返回。
     """
-    # 获取原始 HTML
-    html_content = await fetch_exam_schedule(weiXinID, term)
+    return await load_exam_schedule(weiXinID, term)
 
-    # 解析并构造 Pydantic 模型
-    parsed_data = parse_exam_schedule(html_content)
 
-    return parsed_data
+@router.get(
+    "/schedule.ics",
+    summary="订阅考试安排日历",
+    description=(
+        "以 iCalendar 格式返回考试安排，可在日历应用中订阅。"
+        "响应附带 ETag，内容未变化时对条件请求返回 304。"
+    ),
+    response_class=Response,
+    responses={200: {"content": {"text/calendar": {}}}},
+)
+async def get_exam_calendar(
+    request: Request,
+    weiXinID: str = Query(
+        ...,
+        description="教务系统绑定的微信用户ID，通过访问微信教务公众号获取。",
+    ),
+    term: str | None = Query(
+        None,
+        description=(
+            "查询的学期，如 '2025.1'。如果不提供，系统将默认查询当前学期的数据。"
+        ),
+    ),
+):
+    """
+    具体的日历生成逻辑：
+    1. 获取考试安排（与 /exams/schedule 共用缓存）。
+    2. 有具体时间段的考试转换为定时事件，只有日期的转换为全天事件。
+    3. 由事件内容计算 ETag，与 If-None-Match 一致时直接返回 304。
+    """
+    schedule = await load_exam_schedule(weiXinID, term)
+    return calendar_response(
+        request,
+        f"考试安排 {schedule.current_term}",
+        exam_events(schedule),
+        max_age=settings.CACHE_TTL_EXAMS,
+    )
@@ -0,0 +1,144 @@
+import asyncio
+from collections.abc import AsyncIterator
+
+from fastapi import APIRouter, Header, Query
+from fastapi.responses import StreamingResponse
+
+from ecjtu_wechat_api.api.middleware import TimedRoute
+from ecjtu_wechat_api.core.config import settings
+from ecjtu_wechat_api.models.notification import (
+    ChangeEvent,
+    NotificationKind,
+    Subscription,
+)
+from ecjtu_wechat_api.services.notifier import change_poller, event_broker
+
+router = APIRouter(
+    prefix="/notifications", tags=["notifications"], route_class=TimedRoute
+)
+
+
+@router.post(
+    "/subscriptions",
+    response_model=Subscription,
+    summary="订阅成绩/考试安排变化",
+    description=(
+        "登记需要后台轮询的用户。检测到新成绩或考试安排调整时，"
+        "通过 Webhook 及 /notifications/stream 推送变化事件。"
+    ),
+)
+async def create_subscription(
+    weiXinID: str = Query(
+        ...,
+        description="教务系统绑定的微信用户ID，通过访问微信教务公众号获取。",
+    ),
+    kinds: list[NotificationKind] = Query(
+        ["scores", "exams"],
+        description="订阅的数据类型，可重复传入: scores（成绩）、exams（考试安排）。",
+    ),
+    term: str | None = Query(
+        None,
+        description="订阅的学期，如 '2025.1'。如果不提供，默认跟随当前学期。",
+    ),
+    webhook_url: str | None = Query(
+        None,
+        description=(
+            "检测到变化时以 POST 推送事件 JSON 的地址，必须指向公网地址"
+            "（NOTIFY_WEBHOOK_ALLOWLIST 中的主机除外）。"
+        ),
+    ),
+):
+    """
+    同一 weiXinID 重复订阅时覆盖原有的订阅设置。
+    """
+    return await change_poller.subscribe(weiXinID, kinds, term, webhook_url)
+
+
+@router.get(
+    "/subscriptions",
+    response_model=Subscription,
+    summary="查询订阅",
+    description="查询指定用户的变化通知订阅。",
+)
+async def get_subscription(
+    weiXinID: str = Query(..., description="教务系统绑定的微信用户ID。"),
+):
+    return change_poller.get(weiXinID)
+
+
+@router.delete(
+    "/subscriptions",
+    response_model=Subscription,
+    summary="取消订阅",
+    description="取消指定用户的变化通知订阅，返回被删除的订阅。",
+)
+async def delete_subscription(
+    weiXinID: str = Query(..., description="教务系统绑定的微信用户ID。"),
+):
+    return await change_poller.unsubscribe(weiXinID)
+
+
+@router.get(
+    "/events",
+    response_model=list[ChangeEvent],
+    summary="查询最近的变化事件",
+    description=(
+        "返回指定用户最近保留的变化事件，可用 after 只获取某个事件之后的新事件。"
+    ),
+)
+async def list_events(
+    weiXinID: str = Query(..., description="教务系统绑定的微信用户ID。"),
+    after: int = Query(0, ge=0, description="只返回序号大于该值的事件。"),
+):
+    return event_broker.history(weiXinID, after)
+
+
+def _format_sse(event: ChangeEvent) -> str:
+    return f"id: {event.id}\nevent: {event.kind}\ndata: {event.model_dump_json()}\n\n"
+
+
+async def _event_stream(weixin_id: str, last_event_id: int) -> AsyncIterator[str]:
+    if event_broker.is_future_id(last_event_id):
+        last_event_id = 0
+    # 先注册监听队列再补发历史事件，避免两者之间发布的事件丢失
+    queue = event_broker.subscribe(weixin_id)
+    try:
+        for event in event_broker.history(weixin_id, last_event_id):
+            last_event_id = event.id
+            yield _format_sse(event)
+        while True:
+            try:
+                event = await asyncio.wait_for(
+                    queue.get(), timeout=settings.NOTIFY_KEEPALIVE
+                )
+            except TimeoutError:
+                yield ": ping\n\n"
+                continue
+            # 补发历史事件时已发送过的事件不再重复发送
+            if event.id <= last_event_id:
+                continue
+            last_event_id = event.id
+            yield _format_sse(event)
+    finally:
+        event_broker.unsubscribe(queue)
+
+
+@router.get(
+    "/stream",
+    summary="订阅变化事件流",
+    description=(
+        "以 Server-Sent Events 推送指定用户的变化事件。断线重连时浏览器会携带 "
+        "Last-Event-ID 请求头，服务端据此补发期间错过的事件。"
+    ),
+)
+async def stream_events(
+    weiXinID: str = Query(..., description="教务系统绑定的微信用户ID。"),
+    last_event_id: int = Header(
+        0, alias="Last-Event-ID", description="上次收到的事件序号。"
+    ),
+):
+    return StreamingResponse(
+        _event_stream(weiXinID, last_event_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
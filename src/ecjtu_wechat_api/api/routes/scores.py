@@ -1,12 +1,30 @@
+import asyncio
+import weakref
+
 from fastapi import APIRouter, Query
 
-from ecjtu_wechat_api.models.score import StudentScoreInfo
-from ecjtu_wechat_api.services.parse_score import (
-    fetch_score_info,
-    parse_score_info,
+from ecjtu_wechat_api.api.middleware import TimedRoute
+from ecjtu_wechat_api.core.config import settings
+from ecjtu_wechat_api.models.score import AllScoresInfo, StudentScoreInfo
+from ecjtu_wechat_api.services.loader import load_score_info
+from ecjtu_wechat_api.services.score_summary import merge_term_scores
+
+router = APIRouter(prefix="/scores", tags=["scores"], route_class=TimedRoute)
+
+# 各用户的 /scores/all 并发配额，同一用户的多个请求共用一个信号量；
+# 没有进行中的请求持有时自动回收
+_fanout_semaphores: weakref.WeakValueDictionary[str, asyncio.Semaphore] = (
+    weakref.WeakValueDictionary()
 )
 
-router = APIRouter(prefix="/scores", tags=["scores"])
+
+def _fanout_semaphore(weiXinID: str) -> asyncio.Semaphore:
+    """获取用户的并发抓取配额（调用方持有期间不会被回收）。"""
+    semaphore = _fanout_semaphores.get(weiXinID)
+    if semaphore is None:
+        semaphore = asyncio.Semaphore(settings.SCORES_FANOUT_CONCURRENCY)
+        _fanout_semaphores[weiXinID] = semaphore
+    return semaphore
 
 
 @router.get(
@@ -29,14 +47,50 @@ async def get_score_info(
 ):
     """
     具体的成绩获取逻辑：
-    1. 调用解析服务，模拟移动端环境从教务系统抓取原始 HTML。
-    2. 解析 HTML 并映射到 StudentScoreInfo 结构化模型。
-    3. 返回 JSON 格式的解析结果。
+    1. 命中缓存时直接返回已解析的结果（历史学期缓存时间更长）。
+    2. 否则调用解析服务，模拟移动端环境从教务系统抓取原始 HTML。
+    3. 解析 HTML 并映射到 StudentScoreInfo 结构化模型，写入缓存后返回。
+    """
+    return await load_score_info(weiXinID, term)
+
+
+@router.get(
+    "/all",
+    response_model=AllScoresInfo,
+    summary="获取全部学期成绩汇总",
+    description=(
+        "一次性获取所有可查询学期的成绩，合并去重后返回各学期学分合计"
+        "及学分加权平均绩点。"
+    ),
+)
+async def get_all_scores(
+    weiXinID: str = Query(
+        ...,
+        description="教务系统绑定的微信用户ID，通过访问微信教务公众号获取。",
+    ),
+):
+    """
+    具体的成绩汇总逻辑：
+    1. 获取当前学期成绩页面，从中读取可查询的学期列表。
+    2. 在用户的并发上限内同时抓取其余各学期的成绩（同一用户的并发请求
+       共用上限，各学期结果均走缓存）。
+    3. 合并去重并计算各学期及总体的学分加权绩点。
     """
-    # 获取原始 HTML
-    html_content = await fetch_score_info(weiXinID, term)
+    first = await load_score_info(weiXinID, None)
+
+    semaphore = _fanout_semaphore(weiXinID)
+
+    async def load_term(term: str) -> StudentScoreInfo:
+        async with semaphore:
+            return await load_score_info(weiXinID, term)
 
-    # 解析并构造 Pydantic 模型
-    parsed_data = parse_score_info(html_content)
+    other_terms = [
+        t.name for t in first.available_terms if t.name != first.current_term
+    ]
+    other_infos = await asyncio.gather(*(load_term(t) for t in other_terms))
+    infos = dict(zip(other_terms, other_infos, strict=True))
+    infos[first.current_term] = first
 
-    return parsed_data
+    # 按学期从新到旧排列
+    ordered = sorted(infos.items(), key=lambda item: item[0], reverse=True)
+    return merge_term_scores(first.student_name, ordered)
@@ -1,4 +1,5 @@
 import os
+from datetime import time, timedelta, timezone
 from pathlib import Path
 
 from dotenv import load_dotenv
@@ -8,6 +9,74 @@ env_path = Path(__file__).parent.parent.parent.parent / ".env"
 load_dotenv(dotenv_path=env_path)
 
 
+def _env_int(name: str, default: int) -> int:
+    """读取整数类型的环境变量，未设置或为空时返回默认值。"""
+    value = os.getenv(name)
+    return int(value) if value else default
+
+
+def _env_float(name: str, default: float) -> float:
+    """读取浮点类型的环境变量，未设置或为空时返回默认值。"""
+    value = os.getenv(name)
+    return float(value) if value else default
+
+
+def _env_int_list(name: str, default: list[int]) -> list[int]:
+    """读取以逗号分隔的整数列表环境变量，如 "1,5,9"。"""
+    value = os.getenv(name)
+    if not value:
+        return default
+    return [int(item) for item in value.split(",") if item.strip()]
+
+
+def _env_list(name: str, default: list[str]) -> list[str]:
+    """读取以逗号分隔的字符串列表环境变量，如 "a.example.com,b.example.com"。"""
+    value = os.getenv(name)
+    if not value:
+        return default
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+
+def _env_section_times(
+    name: str, default: dict[int, tuple[str, str]]
+) -> dict[int, tuple[str, str]]:
+    """
+    读取节次作息时间表环境变量，格式为 "1=08:00-08:45,2=08:55-09:40"。
+
+    Raises:
+        ValueError: 条目格式错误时抛出（启动时即失败，而不是在导出日历时出错）。
+    """
+    value = os.getenv(name)
+    if not value:
+        return default
+    table = {}
+    for item in value.split(","):
+        if not item.strip():
+            continue
+        period, _, span = item.partition("=")
+        start, _, end = span.partition("-")
+        try:
+            start_time = time.fromisoformat(start.strip())
+            end_time = time.fromisoformat(end.strip())
+            section = int(period)
+        except ValueError as e:
+            raise ValueError(
+                f"{name} 中的条目 {item.strip()!r} 格式错误，应为 节次=HH:MM-HH:MM"
+            ) from e
+        if start_time >= end_time:
+            raise ValueError(f"{name} 中的条目 {item.strip()!r} 结束时间不晚于开始时间")
+        table[section] = (start_time.strftime("%H:%M"), end_time.strftime("%H:%M"))
+    return table
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    """读取布尔类型的环境变量，支持 1/true/yes/on（不区分大小写）。"""
+    value = os.getenv(name)
+    if not value:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
 class Config:
     """
     项目全局配置类，负责管理环境变量加载及路径常量定义。
@@ -19,11 +88,22 @@ class Config:
     # 后端 API 基准地址，默认为本地 6894 端口
     API_BASE_URL = os.getenv("API_BASE_URL", "http://localhost:6894")
 
+    # 学校所在时区（中国标准时间，无夏令时），用于考试时间等日期时间字段
+    TIMEZONE = timezone(timedelta(hours=8), "Asia/Shanghai")
+
     # 项目根目录路径
     PROJECT_ROOT = Path(__file__).parent.parent.parent.parent
 
-    # 调试运用数据存储目录，用于保存抓取的原始 HTML 和解析后的 JSON。
-    DATA_DIR = PROJECT_ROOT / "data"
+    # 数据存储目录，用于保存抓取的原始 HTML 和解析后的 JSON。
+    DATA_DIR = Path(os.getenv("DATA_DIR", PROJECT_ROOT / "data"))
+
+    # 页面持久化存储：开启后每次抓取的 HTML 与解析结果都会压缩写入 SQLite
+    STORE_ENABLED = _env_bool("STORE_ENABLED", False)
+    STORE_PATH = Path(os.getenv("STORE_PATH", DATA_DIR / "pages.sqlite3"))
+    # 是否同时保存原始 HTML（关闭后只保存解析结果）
+    STORE_SAVE_HTML = _env_bool("STORE_SAVE_HTML", True)
+    # zlib 压缩级别（1-9）
+    STORE_COMPRESS_LEVEL = _env_int("STORE_COMPRESS_LEVEL", 6)
 
     # 微信移动端 User-Agent（模拟安卓设备上的微信内置浏览器）
     WECHAT_USER_AGENT = (
@@ -41,12 +121,161 @@ class Config:
         "Accept-Language": "zh-CN,zh;q=0.9",
     }
 
-    # 教务系统相关接口地址
-    BASE_URL = "https://jwxt.ecjtu.edu.cn/weixin"
+    # 教务系统相关接口地址，压测或离线调试时可指向模拟教务系统
+    # （python -m ecjtu_wechat_api.mock）
+    BASE_URL = os.getenv("JWXT_BASE_URL", "https://jwxt.ecjtu.edu.cn/weixin").rstrip(
+        "/"
+    )
     SCORE_URL = f"{BASE_URL}/ScoreQuery"
     COURSE_URL = f"{BASE_URL}/CalendarServlet"
     EXAM_URL = f"{BASE_URL}/ExamArrangeCl"
 
+    # 访问教务系统的 HTTP 客户端配置（进程级共享连接池）
+    # 单次请求超时时间（秒）
+    HTTP_TIMEOUT = _env_float("HTTP_TIMEOUT", 10.0)
+    # 连接池允许的最大连接数
+    HTTP_MAX_CONNECTIONS = _env_int("HTTP_MAX_CONNECTIONS", 100)
+    # 连接池中保持 keep-alive 的最大空闲连接数
+    HTTP_MAX_KEEPALIVE_CONNECTIONS = _env_int("HTTP_MAX_KEEPALIVE_CONNECTIONS", 20)
+    # 空闲 keep-alive 连接的过期时间（秒）
+    HTTP_KEEPALIVE_EXPIRY = _env_float("HTTP_KEEPALIVE_EXPIRY", 30.0)
+    # 是否启用 HTTP/2（需要安装 h2，即 `pip install httpx[http2]`）
+    HTTP2_ENABLED = _env_bool("HTTP2_ENABLED", False)
+
+    # 请求失败（网络错误、5xx、429）时的重试次数，0 表示不重试
+    HTTP_RETRIES = _env_int("HTTP_RETRIES", 2)
+    # 指数退避的基数与上限（秒），实际等待时间在 [0, 基数 * 2^n] 内随机
+    HTTP_RETRY_BACKOFF = _env_float("HTTP_RETRY_BACKOFF", 0.1)
+    HTTP_RETRY_BACKOFF_MAX = _env_float("HTTP_RETRY_BACKOFF_MAX", 2.0)
+    # 对冲请求：原请求超过最近延迟的 p95 仍未返回时，再发出一个相同请求，取先返回者
+    HTTP_HEDGE_ENABLED = _env_bool("HTTP_HEDGE_ENABLED", False)
+    # 延迟样本不足 HTTP_HEDGE_MIN_SAMPLES 个时使用的对冲等待时间（秒）
+    HTTP_HEDGE_DELAY = _env_float("HTTP_HEDGE_DELAY", 1.0)
+    HTTP_HEDGE_MIN_SAMPLES = _env_int("HTTP_HEDGE_MIN_SAMPLES", 20)
+    # 对冲等待时间的下限（秒）
+    HTTP_HEDGE_MIN_DELAY = _env_float("HTTP_HEDGE_MIN_DELAY", 0.05)
+    # 熔断器：连续失败次数阈值（0 表示关闭熔断）及熔断持续时间（秒）
+    CIRCUIT_FAILURE_THRESHOLD = _env_int("CIRCUIT_FAILURE_THRESHOLD", 5)
+    CIRCUIT_RESET_TIMEOUT = _env_float("CIRCUIT_RESET_TIMEOUT", 30.0)
+
+    # 访问教务系统的限流配置（按主机），避免流量高峰时压垮教务系统
+    # 令牌桶平均速率（请求/秒），0 表示不限速
+    UPSTREAM_RATE = _env_float("UPSTREAM_RATE", 50.0)
+    # 令牌桶容量，即允许的瞬时突发请求数
+    UPSTREAM_BURST = _env_float("UPSTREAM_BURST", 100.0)
+    # 自适应并发上限的初始值、下限与上限
+    UPSTREAM_INITIAL_CONCURRENCY = _env_int("UPSTREAM_INITIAL_CONCURRENCY", 16)
+    UPSTREAM_MIN_CONCURRENCY = _env_int("UPSTREAM_MIN_CONCURRENCY", 2)
+    UPSTREAM_MAX_CONCURRENCY = _env_int("UPSTREAM_MAX_CONCURRENCY", 64)
+    # 目标延迟（秒），超过该值或请求出错时收缩并发上限
+    UPSTREAM_LATENCY_TARGET = _env_float("UPSTREAM_LATENCY_TARGET", 2.0)
+    # 排队等待许可的最长时间（秒），超时返回 503
+    UPSTREAM_ACQUIRE_TIMEOUT = _env_float("UPSTREAM_ACQUIRE_TIMEOUT", 10.0)
+
+    # HTML 解析后端: html.parser（标准库）或 lxml（需安装 lxml，速度更快）
+    HTML_PARSER = os.getenv("HTML_PARSER", "html.parser")
+
+    # 流式解析：成绩与考试安排页面边下载边增量解析，降低大页面的峰值内存
+    STREAM_PARSE_ENABLED = _env_bool("STREAM_PARSE_ENABLED", False)
+
+    # HTML 解析工作池配置，避免同步解析阻塞事件循环
+    # 工作池类型: thread 或 process（大页面解析为主要开销时可选 process）
+    PARSE_EXECUTOR = os.getenv("PARSE_EXECUTOR", "thread")
+    # 同时执行解析的 worker 数
+    PARSE_WORKERS = _env_int("PARSE_WORKERS", 4)
+    # 等待解析的最大排队任务数，超出后返回 503
+    PARSE_QUEUE_SIZE = _env_int("PARSE_QUEUE_SIZE", 64)
+
+    # /courses/week、/courses/range 并发抓取每日课表时的最大并发请求数
+    COURSES_FANOUT_CONCURRENCY = _env_int("COURSES_FANOUT_CONCURRENCY", 8)
+    # /courses/range 单次查询允许的最大天数
+    COURSES_RANGE_MAX_DAYS = _env_int("COURSES_RANGE_MAX_DAYS", 186)
+
+    # 推导整学期课表时，除参考日期所在周外固定采样的教学周（每周抓取 7 天）
+    TIMETABLE_SAMPLE_WEEKS = _env_int_list("TIMETABLE_SAMPLE_WEEKS", [])
+    # 推导整学期课表时最多抓取的天数（含按课程周次补充抓取的日期）
+    TIMETABLE_MAX_SAMPLE_DAYS = _env_int("TIMETABLE_MAX_SAMPLE_DAYS", 21)
+
+    # 节次作息时间表: 节次 -> (开始时间, 结束时间)，用于生成课表日历
+    COURSE_SECTION_TIMES = _env_section_times(
+        "COURSE_SECTION_TIMES",
+        {
+            1: ("08:00", "08:45"),
+            2: ("08:50", "09:35"),
+            3: ("10:05", "10:50"),
+            4: ("10:55", "11:40"),
+            5: ("14:00", "14:45"),
+            6: ("14:50", "15:35"),
+            7: ("15:55", "16:40"),
+            8: ("16:45", "17:30"),
+            9: ("19:00", "19:45"),
+            10: ("19:50", "20:35"),
+            11: ("20:40", "21:25"),
+            12: ("21:30", "22:15"),
+        },
+    )
+
+    # /scores/all 并发抓取各学期成绩时，单个用户的最大并发请求数
+    # （同一用户同时发起的多个 /scores/all 请求合计）
+    SCORES_FANOUT_CONCURRENCY = _env_int("SCORES_FANOUT_CONCURRENCY", 4)
+
+    # POST /batch 单次请求允许的最大任务数及同时执行的任务数
+    BATCH_MAX_JOBS = _env_int("BATCH_MAX_JOBS", 200)
+    BATCH_CONCURRENCY = _env_int("BATCH_CONCURRENCY", 16)
+
+    # 成绩/考试安排变化通知：后台按固定节奏轮询已订阅的用户
+    POLL_ENABLED = _env_bool("POLL_ENABLED", True)
+    # 两轮轮询之间的间隔（秒）
+    POLL_INTERVAL = _env_float("POLL_INTERVAL", 300)
+    # 轮询发起抓取的速率（次/秒）及最大并发数，避免集中访问教务系统
+    POLL_RATE = _env_float("POLL_RATE", 2.0)
+    POLL_CONCURRENCY = _env_int("POLL_CONCURRENCY", 4)
+    # 最多允许的订阅数
+    NOTIFY_MAX_SUBSCRIPTIONS = _env_int("NOTIFY_MAX_SUBSCRIPTIONS", 10000)
+    # 全局 Webhook：所有变化事件都会推送到该地址（订阅也可单独指定 Webhook）
+    NOTIFY_WEBHOOK_URL = os.getenv("NOTIFY_WEBHOOK_URL") or None
+    NOTIFY_WEBHOOK_TIMEOUT = _env_float("NOTIFY_WEBHOOK_TIMEOUT", 5.0)
+    # 订阅的 Webhook 地址不能指向内网、本机等非公网地址；列出的主机不受此限制
+    NOTIFY_WEBHOOK_ALLOWLIST = _env_list("NOTIFY_WEBHOOK_ALLOWLIST", [])
+    # 内存中保留的最近事件数，用于 SSE 断线重连补发及事件查询
+    NOTIFY_HISTORY_SIZE = _env_int("NOTIFY_HISTORY_SIZE", 1000)
+    # 每个 SSE 连接的待发送事件队列长度，消费过慢时丢弃最旧的事件
+    NOTIFY_QUEUE_SIZE = _env_int("NOTIFY_QUEUE_SIZE", 100)
+    # SSE 心跳间隔（秒）
+    NOTIFY_KEEPALIVE = _env_float("NOTIFY_KEEPALIVE", 15.0)
+
+    # 解析结果缓存配置
+    # 缓存后端: memory（进程内 LRU）或 none（关闭缓存）
+    CACHE_BACKEND = os.getenv("CACHE_BACKEND", "memory")
+    # 缓存的最大条目数，超出后按 LRU 淘汰
+    CACHE_MAX_SIZE = _env_int("CACHE_MAX_SIZE", 10000)
+    # 各接口的缓存有效期（秒）。历史学期/日期的数据基本不会变化，使用较长的 TTL
+    CACHE_TTL_COURSES = _env_float("CACHE_TTL_COURSES", 600)
+    CACHE_TTL_COURSES_PAST = _env_float("CACHE_TTL_COURSES_PAST", 86400)
+    CACHE_TTL_SCORES = _env_float("CACHE_TTL_SCORES", 300)
+    CACHE_TTL_SCORES_PAST = _env_float("CACHE_TTL_SCORES_PAST", 7 * 86400)
+    CACHE_TTL_EXAMS = _env_float("CACHE_TTL_EXAMS", 600)
+    CACHE_TTL_EXAMS_PAST = _env_float("CACHE_TTL_EXAMS_PAST", 7 * 86400)
+    # 整学期课表日历（/courses/calendar.ics）按学期缓存，课程安排在学期内很少变化
+    CACHE_TTL_CALENDAR = _env_float("CACHE_TTL_CALENDAR", 86400)
+    # stale-while-revalidate：缓存过期后先返回旧数据，同时在后台刷新
+    SWR_ENABLED = _env_bool("SWR_ENABLED", True)
+    # 缓存过期后继续保留的时间（秒），期间可作为过期数据返回或在教务系统不可用时兜底
+    CACHE_STALE_TTL = _env_float("CACHE_STALE_TTL", 7 * 86400)
+
+    # 运行指标：/metrics 以 Prometheus 文本格式导出，响应附带 Server-Timing 头
+    METRICS_ENABLED = _env_bool("METRICS_ENABLED", True)
+
+    # 日志配置：日志经队列由后台线程写出，不阻塞事件循环
+    LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+    # 输出格式: json（每行一个 JSON 对象）或 text
+    LOG_FORMAT = os.getenv("LOG_FORMAT", "json")
+    # 高频日志（如每次请求教务系统）的采样比例，1 表示全部输出，0 表示全部丢弃；
+    # 超出 [0, 1] 的值按边界处理
+    LOG_SAMPLE_RATE = min(max(_env_float("LOG_SAMPLE_RATE", 1.0), 0.0), 1.0)
+    # 日志中的 weiXinID 替换为不可逆的短哈希，仍可用于关联同一用户的日志
+    LOG_REDACT = _env_bool("LOG_REDACT", True)
+
 
 # 全局单例配置对象
 settings = Config()
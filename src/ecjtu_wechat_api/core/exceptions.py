@@ -22,3 +22,40 @@ class ParseError(ECJTUAPIError):
     """HTML 解析错误"""
 
     pass
+
+
+class InvalidParameterError(ECJTUAPIError):
+    """请求参数不合法"""
+
+    def __init__(self, message: str, status_code: int = 400, details: Any = None):
+        super().__init__(message, details)
+        self.status_code = status_code
+
+
+class ServiceBusyError(ECJTUAPIError):
+    """服务过载，暂时无法处理请求"""
+
+    def __init__(self, message: str, status_code: int = 503, details: Any = None):
+        super().__init__(message, details)
+        self.status_code = status_code
+
+
+class UpstreamBusyError(ServiceBusyError):
+    """等待上游限流许可超时：教务系统变慢、并发上限收缩时排队过久"""
+
+    pass
+
+
+class CircuitOpenError(EducationSystemError):
+    """教务系统连续失败，熔断期间直接拒绝请求"""
+
+    def __init__(self, message: str, status_code: int = 503, details: Any = None):
+        super().__init__(message, status_code, details)
+
+
+class NotFoundError(ECJTUAPIError):
+    """请求的资源不存在"""
+
+    def __init__(self, message: str, status_code: int = 404, details: Any = None):
+        super().__init__(message, details)
+        self.status_code = status_code
@@ -1,16 +1,66 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI, Request
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
 
-from ecjtu_wechat_api import __version__, courses_router, exams_router, scores_router
+from ecjtu_wechat_api import (
+    __version__,
+    batch_router,
+    courses_router,
+    exams_router,
+    notifications_router,
+    scores_router,
+)
+from ecjtu_wechat_api.api.middleware import ServerTimingMiddleware
+from ecjtu_wechat_api.core.config import settings
 from ecjtu_wechat_api.core.exceptions import ECJTUAPIError
+from ecjtu_wechat_api.services.notifier import change_poller
+from ecjtu_wechat_api.utils.executor import parse_pool
+from ecjtu_wechat_api.utils.html import set_parser_backend
+from ecjtu_wechat_api.utils.http import close_http_client, init_http_client
 from ecjtu_wechat_api.utils.logger import logger
+from ecjtu_wechat_api.utils.metrics import render_prometheus
+from ecjtu_wechat_api.utils.persistence import page_store
+from ecjtu_wechat_api.utils.ratelimit import upstream_limiter
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    应用生命周期管理：启动时选定 HTML 解析后端、创建共享 HTTP 连接池、
+    解析工作池和页面存储，恢复保存的订阅并启动变化通知的后台轮询，关闭时依次释放。
+    """
+    logger.info("HTML 解析后端: %s", set_parser_backend())
+    await init_http_client()
+    parse_pool.start()
+    if settings.STORE_ENABLED:
+        page_store.open()
+        restored = await change_poller.restore()
+        if restored:
+            logger.info("已恢复 %d 个变化通知订阅", restored)
+    if settings.POLL_ENABLED:
+        change_poller.start()
+    try:
+        yield
+    finally:
+        await change_poller.stop()
+        page_store.close()
+        parse_pool.shutdown()
+        await close_http_client()
+
 
 app = FastAPI(
     title="华东交通大学教务系统微信版 API",
     description="提供华东交通大学教务系统的课程表查询、成绩获取与考试安排服务，支持结构化数据。",
     version=__version__,
+    lifespan=lifespan,
 )
 
+# 为响应附加 Server-Timing 头（upstream / parse / serialize 等阶段耗时），
+# 并统计请求耗时与响应大小
+if settings.METRICS_ENABLED:
+    app.add_middleware(ServerTimingMiddleware)
+
 
 @app.exception_handler(ECJTUAPIError)
 async def api_error_handler(request: Request, exc: ECJTUAPIError):
@@ -18,7 +68,7 @@ async def api_error_handler(request: Request, exc: ECJTUAPIError):
     统一处理项目自定义业务异常
     """
     status_code = getattr(exc, "status_code", 400)
-    logger.error(f"业务异常: {exc.message}, 详情: {exc.details}")
+    logger.error("业务异常: %s, 详情: %s", exc.message, exc.details)
     return JSONResponse(
         status_code=status_code,
         content={"status": "error", "message": exc.message, "details": exc.details},
@@ -30,7 +80,7 @@ async def global_exception_handler(request: Request, exc: Exception):
     """
     处理未捕获的系统异常
     """
-    logger.exception(f"未捕获的系统异常: {str(exc)}")
+    logger.exception("未捕获的系统异常: %s", exc)
     return JSONResponse(
         status_code=500,
         content={
@@ -45,6 +95,8 @@ async def global_exception_handler(request: Request, exc: Exception):
 app.include_router(courses_router)
 app.include_router(scores_router)
 app.include_router(exams_router)
+app.include_router(notifications_router)
+app.include_router(batch_router)
 
 
 @app.get(
@@ -66,6 +118,41 @@ async def root():
     }
 
 
+@app.get(
+    "/status",
+    summary="运行状态",
+    description="显示访问教务系统的限流状态（当前并发上限、进行中及排队的请求数）。",
+)
+async def status():
+    """
+    返回各上游主机当前的限流状态及解析工作池的排队任务数。
+    """
+    return {
+        "upstream": upstream_limiter.snapshot(),
+        "parse_queue_depth": parse_pool.queue_depth,
+    }
+
+
+@app.get(
+    "/metrics",
+    summary="运行指标",
+    description="以 Prometheus 文本格式导出上游请求、解析、缓存及请求处理等运行指标。",
+    response_class=PlainTextResponse,
+    include_in_schema=settings.METRICS_ENABLED,
+)
+async def metrics():
+    """
+    导出全部已注册的指标；METRICS_ENABLED 关闭时返回 404。
+    """
+    if not settings.METRICS_ENABLED:
+        return JSONResponse(
+            status_code=404, content={"status": "error", "message": "指标未开启"}
+        )
+    return PlainTextResponse(
+        render_prometheus(), media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
+
+
 if __name__ == "__main__":
     import uvicorn
 
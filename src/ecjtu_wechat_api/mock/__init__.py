@@ -0,0 +1,3 @@
+"""
+模拟教务系统：合成页面生成与用于压测、回放的本地服务
+"""
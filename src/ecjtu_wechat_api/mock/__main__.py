@@ -0,0 +1,3 @@
+from ecjtu_wechat_api.mock.server import main
+
+main()
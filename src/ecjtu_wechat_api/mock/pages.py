@@ -0,0 +1,193 @@
+"""
+合成的教务系统页面
+
+按教务系统真实页面的结构生成任意规模的 HTML，供性能基准与模拟教务系统使用。
+"""
+
+from datetime import date as Date
+
+_WEEKDAYS = "一二三四五六日"
+
+
+def _terms(path: str, terms: int) -> str:
+    """生成学期下拉菜单中的 terms 个学期链接，从 2025.1 起向前排列。"""
+    names = [f"{2025 - (i + 1) // 2}.{1 + i % 2}" for i in range(terms)]
+    return "".join(
+        f'\n            <li><a href="/weixin/{path}?weiXinID=xxx&term={name}">'
+        f"{name}</a></li>"
+        for name in names
+    )
+
+
+_SCORE_ROW = """
+<div class="row ">
+    <div class="col-xs-12">
+        <div class="text">
+            <span class="course">【主修】【{code}】课程{index}(学分:{credit})</span>
+            <div class="grade">
+                期末成绩:
+                <span class="score">{final}</span>
+                <br />
+                重考成绩:
+                <span class="score">{reexam}</span>
+                <br />
+                重修成绩:
+                <span class="score"></span>
+                <br />
+                <span class="flag">主修</span>
+            </div>
+        </div>
+        <div class="img">
+            <img src="/weixin/imgs/myschedule/dian.png;jsessionid=xxx">
+        </div>
+        <div class="type">
+            <span class="require"><mark>{course_type}</mark> </span>
+        </div>
+    </div>
+</div>"""
+
+
+def score_page(rows: int = 200, terms: int = 2, term: str = "2025.1") -> str:
+    """生成包含 rows 门课程成绩、terms 个可选学期的 term 学期成绩页面。"""
+    body = "".join(
+        _SCORE_ROW.format(
+            code=f"{1500000000 + i}",
+            index=i,
+            credit=f"{1 + i % 5}.{i % 2 * 5}",
+            final=("合格", "优秀", "55", f"{60 + i % 40}")[i % 4],
+            reexam="62" if i % 4 == 2 else "",
+            course_type=("必修课", "选修课", "限选课")[i % 3],
+        )
+        for i in range(rows)
+    )
+    menu = _terms("ScoreQuery", terms)
+    return f"""<!DOCTYPE html>
+<html>
+    <body>
+        <div class="right">
+            姓名:<span>张三</span>
+            <br />
+            当前学期:<span>{term}</span>
+        </div>
+        <ul class="dropdown-menu dropdown-menu-left btn-block" role="menu">{menu}
+        </ul>
+        <div class="words">
+            您好！本学期当前你共有
+            <strong>{rows}</strong>门考试成绩。
+        </div>{body}
+    </body>
+</html>
+"""
+
+
+_COURSE_ITEM = """
+<li>
+    <p>
+        <span class="class_span">{first}-{second}节<br /> </span>
+        课程{index}({status})
+        <br />
+        时间：{weeks} {first},{second}
+        <br />
+        地点：进贤{building}-{room}
+        <br />
+        教师：教师{index}
+        <br />
+    </p>
+</li>"""
+
+
+def course_page(courses: int = 5, date: str = "2026-01-05", week: int = 19) -> str:
+    """生成 date（第 week 周）包含 courses 个课程条目的每日课表页面。"""
+    weekday = _WEEKDAYS[Date.fromisoformat(date).weekday()]
+    items = "".join(
+        _COURSE_ITEM.format(
+            index=i,
+            first=i % 6 * 2 + 1,
+            second=i % 6 * 2 + 2,
+            status=("上课", "考试", "实验")[i % 3],
+            weeks=("1-17", "1,3,5-9", "19")[i % 3],
+            building=i % 9 + 1,
+            room=200 + i,
+        )
+        for i in range(courses)
+    )
+    return f"""<!DOCTYPE html>
+<html>
+    <body>
+        <div class="center">
+            <p>{date} 星期{weekday}（第{week}周）</p>
+        </div>
+        <div class="top">
+            <div class="calendar">
+                <ul class="rl_info">{items}
+                </ul>
+            </div>
+        </div>
+    </body>
+</html>
+"""
+
+
+_EXAM_ROW = """
+<div class="row">
+    <div class="col-xs-12">
+        <div class="text">
+            考试周次:<u>{week}</u>
+            <br />
+            考试时间:<u>{time}<br/>
+            <div style='color:red'>{note}</div></u>
+            <br />
+            考试地点:<u>进贤{building}-{room}</u>
+            <br />
+            课程性质:<span>{course_type}</span>
+            <br />
+            班级名称:<span>课程{index}(20251-{group})【{group}班】</span>
+            <br />
+            考试人数:<span>{count}</span>
+            <br />
+        </div>
+        <div class="course">
+            <mark>课程{index}</mark>
+        </div>
+    </div>
+</div>"""
+
+
+def exam_page(rows: int = 30, terms: int = 2, term: str = "2025.1") -> str:
+    """生成包含 rows 门考试安排、terms 个可选学期的 term 学期考试安排页面。"""
+    body = "".join(
+        _EXAM_ROW.format(
+            index=i,
+            week=17 + i % 4,
+            # 少量考试只有日期或时间待定，覆盖解析的各个分支
+            time=(
+                f"2026年01月{5 + i % 20:02d}日(星期{'一二三四五六日'[i % 7]})"
+                f"{8 + i % 3 * 3:02d}:00-{10 + i % 3 * 3:02d}:00",
+                f"2026年01月{5 + i % 20:02d}日",
+                "待定",
+            )[0 if i % 10 else i // 10 % 3],
+            note="携带学生证" if i % 5 == 0 else "",
+            building=i % 9 + 1,
+            room=300 + i,
+            course_type=("必修课", "选修课")[i % 2],
+            group=i % 6 + 1,
+            count=20 + i % 40,
+        )
+        for i in range(rows)
+    )
+    return f"""<!DOCTYPE html>
+<html>
+    <body>
+        <div class="right">
+            姓名:<span>张三</span>
+            <br />
+            当前学期:<span>{term}</span>
+        </div>
+        <ul class="dropdown-menu">{_terms("ExamArrangeCl", terms)}
+        </ul>
+        <div class="words">
+            您好！本学期你共有 <mark>{rows}</mark> 门考试安排。
+        </div>{body}
+    </body>
+</html>
+"""
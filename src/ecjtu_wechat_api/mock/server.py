@@ -0,0 +1,324 @@
+"""
+模拟教务系统
+
+以与教务系统相同的路径（/weixin/ScoreQuery、/weixin/CalendarServlet、
+/weixin/ExamArrangeCl）返回页面，页面依次从页面存储（回放真实抓取的页面）、
+HTML 目录和合成页面中查找；并可注入响应延迟、错误与吞吐量限制，
+使压测以及重试、缓存、连接池等逻辑的验证可以离线进行。
+
+用法:
+    ecjtu-mock-jwxt --port 6895 --latency 0.2 --jitter 0.1 --error-rate 0.05
+    JWXT_BASE_URL=http://127.0.0.1:6895/weixin uv run python -m ecjtu_wechat_api.main
+"""
+
+import argparse
+import asyncio
+import contextlib
+import hashlib
+import random
+from dataclasses import dataclass
+from datetime import date as Date
+from pathlib import Path
+from typing import Protocol
+
+from fastapi import FastAPI, Query, Request, Response
+from fastapi.responses import HTMLResponse, PlainTextResponse
+
+from ecjtu_wechat_api.mock.pages import course_page, exam_page, score_page
+from ecjtu_wechat_api.utils.metrics import Counter, Registry, render_prometheus
+from ecjtu_wechat_api.utils.persistence import PageStore
+from ecjtu_wechat_api.utils.ratelimit import TokenBucket
+
+# 教务系统接口 -> 页面类别（与页面存储中的 category 一致）
+ENDPOINTS = {
+    "ScoreQuery": "scores",
+    "CalendarServlet": "courses",
+    "ExamArrangeCl": "exams",
+}
+
+# 注入错误时随机返回的状态码
+ERROR_STATUSES = (500, 502, 503)
+
+
+class PageSource(Protocol):
+    """页面来源：按类别、用户及学期/日期查找页面。"""
+
+    async def page(self, category: str, weixin_id: str, key: str | None) -> str | None:
+        """返回页面 HTML，没有对应页面时返回 None。"""
+        ...
+
+
+class GeneratedPages:
+    """按请求参数生成合成页面，相同参数返回的页面相同。"""
+
+    def __init__(
+        self,
+        scores: int = 200,
+        exams: int = 30,
+        courses: int = 6,
+        terms: int = 12,
+        current_term: str = "2025.1",
+        term_start: str = "2025-09-01",
+    ):
+        """
+        Args:
+            scores: 成绩页面的课程数
+            exams: 考试安排页面的考试数
+            courses: 每日课表的课程条目数
+            terms: 可选学期数
+            current_term: 未指定学期时返回的当前学期
+            term_start: 第 1 教学周的周一，用于计算课表页面中的周次
+        """
+        self.scores = scores
+        self.exams = exams
+        self.courses = courses
+        self.terms = terms
+        self.current_term = current_term
+        self.term_start = Date.fromisoformat(term_start)
+        self._cache: dict[tuple[str, str], str | None] = {}
+
+    async def page(self, category: str, weixin_id: str, key: str | None) -> str | None:
+        cache_key = (category, key or "")
+        if cache_key not in self._cache:
+            self._cache[cache_key] = self._generate(category, key)
+        return self._cache[cache_key]
+
+    def _generate(self, category: str, key: str | None) -> str | None:
+        if category == "courses":
+            try:
+                day = Date.fromisoformat(key) if key else Date.today()
+            except ValueError:
+                return None
+            week = max(1, (day - self.term_start).days // 7 + 1)
+            return course_page(self.courses, day.isoformat(), week)
+        term = key or self.current_term
+        if category == "scores":
+            return score_page(self.scores, self.terms, term)
+        return exam_page(self.exams, self.terms, term)
+
+
+class DirectoryPages:
+    """
+    从目录读取 HTML 文件：优先 <category>/<key>.html（如 scores/2025.1.html、
+    courses/2026-01-05.html），其次 <category>.html。文件内容读取后缓存。
+    """
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+        self._cache: dict[Path, str | None] = {}
+
+    async def page(self, category: str, weixin_id: str, key: str | None) -> str | None:
+        candidates = []
+        # key 来自请求参数，只接受单个文件名，拒绝路径穿越
+        if key and Path(key).name == key:
+            candidates.append(self.root / category / f"{key}.html")
+        candidates.append(self.root / f"{category}.html")
+        for path in candidates:
+            if path not in self._cache:
+                self._cache[path] = (
+                    path.read_text(encoding="utf-8") if path.is_file() else None
+                )
+            if self._cache[path] is not None:
+                return self._cache[path]
+        return None
+
+
+class StoredPages:
+    """
+    回放页面存储（STORE_ENABLED 时保存的 SQLite 数据库）中的真实页面：
+    优先同一用户同一学期/日期最近一次抓取的页面，其次其他用户的。
+    """
+
+    def __init__(self, path: Path):
+        self.store = PageStore(path)
+
+    async def page(self, category: str, weixin_id: str, key: str | None) -> str | None:
+        stored = await self.store.alatest(category, weixin_id, key)
+        if stored is None or stored.html is None:
+            candidates = await self.store.afind(category, key_prefix=key or "")
+            stored = next(
+                (
+                    page
+                    for page in candidates
+                    if page.key == (key or "") and page.html is not None
+                ),
+                None,
+            )
+        return stored.html if stored else None
+
+
+@dataclass
+class MockOptions:
+    """模拟教务系统的延迟、错误注入与吞吐量限制。"""
+
+    # 平均响应延迟（秒）及波动范围，实际延迟均匀分布在 latency ± jitter 内
+    latency: float = 0.0
+    jitter: float = 0.0
+    # 返回 5xx 错误的请求比例
+    error_rate: float = 0.0
+    # 每秒最多接受的请求数（0 不限制）及突发容量，超出时返回 429
+    rate: float = 0.0
+    burst: float | None = None
+    # 同时处理的最大请求数（0 不限制），超出时排队，模拟处理能力饱和
+    concurrency: int = 0
+    # 随机数种子，指定后延迟与错误注入可复现
+    seed: int | None = None
+
+
+def _etag(html: str) -> str:
+    return f'"{hashlib.blake2b(html.encode("utf-8"), digest_size=8).hexdigest()}"'
+
+
+def create_app(
+    sources: list[PageSource] | None = None, options: MockOptions | None = None
+) -> FastAPI:
+    """
+    创建模拟教务系统应用。
+
+    Args:
+        sources: 按顺序查找页面的来源，默认只使用合成页面
+        options: 延迟、错误注入与限流配置
+    """
+    sources = sources if sources is not None else [GeneratedPages()]
+    options = options or MockOptions()
+    rng = random.Random(options.seed)
+    bucket = TokenBucket(options.rate, options.burst or max(options.rate, 1.0))
+    slots = asyncio.Semaphore(options.concurrency) if options.concurrency > 0 else None
+    registry = Registry()
+    requests_total = Counter(
+        "ecjtu_mock_requests_total",
+        "模拟教务系统收到的请求数，status 为返回的状态码",
+        ("endpoint", "status"),
+        registry=registry,
+    )
+
+    app = FastAPI(title="模拟教务系统", docs_url=None, redoc_url=None)
+    app.state.requests_total = requests_total
+
+    async def respond(
+        request: Request, category: str, weixin_id: str, key: str | None
+    ) -> Response:
+        if not bucket.try_acquire():
+            return Response(status_code=429, headers={"Retry-After": "1"})
+        async with slots or contextlib.nullcontext():
+            if options.latency or options.jitter:
+                delay = rng.uniform(
+                    options.latency - options.jitter, options.latency + options.jitter
+                )
+                await asyncio.sleep(max(0.0, delay))
+            if rng.random() < options.error_rate:
+                return Response(status_code=rng.choice(ERROR_STATUSES))
+            for source in sources:
+                if (html := await source.page(category, weixin_id, key)) is not None:
+                    break
+            else:
+                return PlainTextResponse("页面不存在", status_code=404)
+
+        # 支持条件请求，便于验证 ETag 重新校验
+        etag = _etag(html)
+        if request.headers.get("If-None-Match") == etag:
+            return Response(status_code=304, headers={"ETag": etag})
+        return HTMLResponse(html, headers={"ETag": etag})
+
+    @app.get("/weixin/{endpoint}", response_class=HTMLResponse)
+    async def weixin_page(
+        request: Request,
+        endpoint: str,
+        weiXinID: str = Query(..., description="微信用户ID"),
+        term: str | None = Query(None, description="学期，如 2025.1"),
+        date: str | None = Query(None, description="课表日期，如 2026-01-05"),
+    ):
+        """按接口返回成绩、课表或考试安排页面。"""
+        category = ENDPOINTS.get(endpoint)
+        if category is None:
+            response = PlainTextResponse("页面不存在", status_code=404)
+        else:
+            key = date if category == "courses" else term
+            response = await respond(request, category, weiXinID, key)
+        requests_total.inc(endpoint=endpoint, status=str(response.status_code))
+        return response
+
+    @app.get("/metrics", response_class=PlainTextResponse)
+    async def metrics():
+        """以 Prometheus 文本格式导出各接口、各状态码的请求数。"""
+        return PlainTextResponse(
+            render_prometheus(registry),
+            media_type="text/plain; version=0.0.4; charset=utf-8",
+        )
+
+    return app
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--host", default="127.0.0.1", help="监听地址")
+    parser.add_argument("--port", type=int, default=6895, help="监听端口")
+    parser.add_argument("--latency", type=float, default=0.0, help="平均延迟（秒）")
+    parser.add_argument("--jitter", type=float, default=0.0, help="延迟波动（秒）")
+    parser.add_argument(
+        "--error-rate", type=float, default=0.0, help="返回 5xx 的请求比例"
+    )
+    parser.add_argument(
+        "--rate", type=float, default=0.0, help="每秒最多接受的请求数，超出返回 429"
+    )
+    parser.add_argument("--burst", type=float, default=None, help="突发请求容量")
+    parser.add_argument(
+        "--concurrency", type=int, default=0, help="同时处理的最大请求数"
+    )
+    parser.add_argument("--seed", type=int, default=None, help="随机数种子")
+    parser.add_argument("--store", type=Path, help="回放的页面存储 SQLite 文件")
+    parser.add_argument("--pages", type=Path, help="HTML 页面目录")
+    parser.add_argument(
+        "--no-generate", action="store_true", help="找不到页面时返回 404 而不生成"
+    )
+    parser.add_argument("--scores", type=int, default=200, help="合成成绩页面课程数")
+    parser.add_argument("--exams", type=int, default=30, help="合成考试安排数")
+    parser.add_argument("--courses", type=int, default=6, help="合成每日课程数")
+    parser.add_argument("--terms", type=int, default=12, help="合成页面的可选学期数")
+    parser.add_argument("--current-term", default="2025.1", help="合成页面当前学期")
+    parser.add_argument("--term-start", default="2025-09-01", help="第 1 教学周的周一")
+    parser.add_argument("--log-level", default="warning", help="uvicorn 日志级别")
+    args = parser.parse_args()
+
+    sources: list[PageSource] = []
+    if args.store:
+        if not args.store.is_file():
+            parser.error(f"页面存储不存在: {args.store}")
+        sources.append(StoredPages(args.store))
+    if args.pages:
+        if not args.pages.is_dir():
+            parser.error(f"页面目录不存在: {args.pages}")
+        sources.append(DirectoryPages(args.pages))
+    if not args.no_generate:
+        sources.append(
+            GeneratedPages(
+                args.scores,
+                args.exams,
+                args.courses,
+                args.terms,
+                args.current_term,
+                args.term_start,
+            )
+        )
+    options = MockOptions(
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        rate=args.rate,
+        burst=args.burst,
+        concurrency=args.concurrency,
+        seed=args.seed,
+    )
+
+    import uvicorn
+
+    uvicorn.run(
+        create_app(sources, options),
+        host=args.host,
+        port=args.port,
+        log_level=args.log_level,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,11 @@
+from ecjtu_wechat_api.models.common import FreshnessInfo
 from ecjtu_wechat_api.models.course import (
     Course,
     CourseSchedule,
+    CourseTimetable,
     DateInfo,
+    TermTimetable,
+    TimetableCourse,
 )
 from ecjtu_wechat_api.models.exam import (
     ExamItem,
@@ -9,18 +13,28 @@ from ecjtu_wechat_api.models.exam import (
     ExamTermItem,
 )
 from ecjtu_wechat_api.models.score import (
+    AllScoresInfo,
     ScoreItem,
     StudentScoreInfo,
     TermItem,
+    TermScoreItem,
+    TermScoreSummary,
 )
 
 __all__ = [
+    "FreshnessInfo",
     "ScoreItem",
     "StudentScoreInfo",
     "TermItem",
+    "TermScoreItem",
+    "TermScoreSummary",
+    "AllScoresInfo",
     "Course",
     "CourseSchedule",
     "DateInfo",
+    "TimetableCourse",
+    "CourseTimetable",
+    "TermTimetable",
     "ExamItem",
     "ExamSchedule",
     "ExamTermItem",
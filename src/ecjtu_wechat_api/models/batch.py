@@ -0,0 +1,48 @@
+from typing import Any, Literal
+
+from pydantic import BaseModel, Field
+
+# 批量接口支持的数据类型
+BatchKind = Literal["courses", "scores", "exams"]
+
+
+class BatchJob(BaseModel):
+    """批量查询中的单个任务。"""
+
+    weiXinID: str = Field(..., description="教务系统绑定的微信用户ID")
+    kind: BatchKind = Field(
+        ..., description="数据类型: courses（每日课表）、scores（成绩）、exams（考试）"
+    )
+    term: str | None = Field(
+        None, description="成绩/考试安排的学期，如 '2025.1'，为空表示当前学期"
+    )
+    date: str | None = Field(
+        None, description="课表日期，格式为 YYYY-MM-DD，为空表示今天"
+    )
+
+
+class BatchRequest(BaseModel):
+    """批量查询请求。"""
+
+    jobs: list[BatchJob] = Field(..., min_length=1, description="查询任务列表")
+
+
+class BatchError(BaseModel):
+    """单个任务失败时的错误信息，与接口错误响应的字段一致。"""
+
+    message: str = Field(..., description="错误信息")
+    status_code: int = Field(..., description="该任务单独请求时对应的 HTTP 状态码")
+    details: Any = Field(None, description="错误详情")
+
+
+class BatchResult(BaseModel):
+    """单个任务的结果，以 NDJSON 的一行返回。"""
+
+    index: int = Field(..., description="任务在请求 jobs 列表中的下标")
+    weiXinID: str = Field(..., description="教务系统绑定的微信用户ID")
+    kind: BatchKind = Field(..., description="数据类型")
+    status: Literal["ok", "error"] = Field(..., description="任务是否成功")
+    data: dict[str, Any] | None = Field(
+        None, description="成功时的数据，结构与对应单项接口的响应相同"
+    )
+    error: BatchError | None = Field(None, description="失败时的错误信息")
@@ -0,0 +1,19 @@
+from pydantic import BaseModel, Field
+
+
+class FreshnessInfo(BaseModel):
+    """
+    响应数据的新鲜度信息：教务系统不可用或后台刷新中返回过期数据时填写
+    stale/age，重新抓取后填写页面内容是否变化。
+    """
+
+    stale: bool = Field(
+        False, description="是否为过期数据（缓存已过期或教务系统暂时不可用）"
+    )
+    age: float | None = Field(
+        None, description="过期数据距上次成功抓取的秒数，仅在 stale 为 true 时提供"
+    )
+    changed: bool | None = Field(
+        None,
+        description=("与上一次抓取相比页面内容是否变化；没有上一次抓取的记录时为 null"),
+    )
@@ -1,5 +1,7 @@
 from pydantic import BaseModel, Field
 
+from ecjtu_wechat_api.models.common import FreshnessInfo
+
 
 class DateInfo(BaseModel):
     """
@@ -32,7 +34,7 @@ class Course(BaseModel):
     periods: list[int] = Field(..., description="解析后的具体节次列表（如：[1, 2]）")
 
 
-class CourseSchedule(BaseModel):
+class CourseSchedule(FreshnessInfo):
     """
     完整的课程表响应模型，包含日期信息和课程列表。
     """
@@ -41,3 +43,50 @@ class CourseSchedule(BaseModel):
     courses: list[Course] = Field(
         default_factory=list, description="当日的所有课程列表"
     )
+
+
+class TimetableCourse(Course):
+    """
+    时间段课表中去重后的课程条目，同一门课在多个日期重复出现时只保留一条。
+    """
+
+    weekday: int = Field(..., description="星期几，1 表示星期一，7 表示星期日")
+    dates: list[str] = Field(
+        default_factory=list, description="该课程在查询范围内出现的日期列表"
+    )
+
+
+class CourseTimetable(BaseModel):
+    """
+    按星期和节次组织的时间段课表（周视图、区间视图）。
+    """
+
+    start_date: str = Field(..., description="查询范围的起始日期，格式为 YYYY-MM-DD")
+    end_date: str = Field(..., description="查询范围的结束日期，格式为 YYYY-MM-DD")
+    courses: list[TimetableCourse] = Field(
+        default_factory=list, description="去重后的课程列表"
+    )
+    grid: dict[int, dict[int, list[int]]] = Field(
+        default_factory=dict,
+        description="课表网格：星期几 -> 节次 -> 该节次课程在 courses 中的下标",
+    )
+
+
+class TermTimetable(BaseModel):
+    """
+    由少量采样日期推导出的整学期课表索引。
+    """
+
+    term_start: str = Field(..., description="第 1 周星期一的日期，格式为 YYYY-MM-DD")
+    sampled_dates: list[str] = Field(
+        default_factory=list, description="实际从教务系统抓取的采样日期"
+    )
+    courses: list[Course] = Field(default_factory=list, description="去重后的课程列表")
+    index: dict[int, dict[int, dict[int, list[int]]]] = Field(
+        default_factory=dict,
+        description="课表索引：周次 -> 星期几 -> 节次 -> 课程在 courses 中的下标",
+    )
+    anomalous_days: dict[int, list[int]] = Field(
+        default_factory=dict,
+        description="存在调课等异常状态、需要重新抓取核实的 周次 -> 星期几 列表",
+    )
@@ -1,5 +1,9 @@
+from datetime import date, datetime
+
 from pydantic import BaseModel, Field
 
+from ecjtu_wechat_api.models.common import FreshnessInfo
+
 
 class ExamTermItem(BaseModel):
     """考试学期条目模型，包含学期名称和查询 URL。"""
@@ -18,6 +22,15 @@ class ExamItem(BaseModel):
     time_range: str = Field(default="", description="考试时间段，如 '14:00-16:00'")
     time_start: str = Field(default="", description="考试开始时间，如 '14:00'")
     time_end: str = Field(default="", description="考试结束时间，如 '16:00'")
+    exam_day: date | None = Field(
+        None, description="考试日期（ISO 8601），无法识别时为 null"
+    )
+    starts_at: datetime | None = Field(
+        None, description="考试开始时间（ISO 8601，带时区），无法识别时为 null"
+    )
+    ends_at: datetime | None = Field(
+        None, description="考试结束时间（ISO 8601，带时区），无法识别时为 null"
+    )
     location: str = Field(..., description="考试地点")
     course_type: str = Field(..., description="课程性质")
     class_name: str = Field(..., description="班级名称")
@@ -25,7 +38,7 @@ class ExamItem(BaseModel):
     note: str = Field(default="", description="考试备注（红色提示文字）")
 
 
-class ExamSchedule(BaseModel):
+class ExamSchedule(FreshnessInfo):
     """考试安排完整响应模型，包含学生信息和考试列表。"""
 
     student_name: str = Field(..., description="学生姓名")
@@ -0,0 +1,49 @@
+from typing import Any, Literal
+
+from pydantic import BaseModel, Field
+
+# 支持订阅变化通知的数据类型
+NotificationKind = Literal["scores", "exams"]
+
+
+class Subscription(BaseModel):
+    """成绩/考试安排变化通知的订阅信息。"""
+
+    weixin_id: str = Field(..., description="教务系统绑定的微信用户ID")
+    kinds: list[NotificationKind] = Field(
+        ..., description="订阅的数据类型: scores（成绩）、exams（考试安排）"
+    )
+    term: str | None = Field(None, description="订阅的学期，为空表示当前学期")
+    webhook_url: str | None = Field(
+        None, description="检测到变化时以 POST 推送事件的 Webhook 地址"
+    )
+    created_at: str = Field(..., description="订阅时间（ISO 8601）")
+
+
+class ItemUpdate(BaseModel):
+    """同一条目在两次抓取之间的变化。"""
+
+    before: dict[str, Any] = Field(..., description="变化前的条目")
+    after: dict[str, Any] = Field(..., description="变化后的条目")
+
+
+class ChangeEvent(BaseModel):
+    """一次检测到的成绩或考试安排变化。"""
+
+    id: int = Field(
+        ...,
+        description="事件序号（微秒时间戳），单调递增，可用作 SSE 的 Last-Event-ID",
+    )
+    kind: NotificationKind = Field(..., description="数据类型")
+    weixin_id: str = Field(..., description="教务系统绑定的微信用户ID")
+    term: str = Field(..., description="发生变化的学期")
+    detected_at: str = Field(..., description="检测到变化的时间（ISO 8601）")
+    added: list[dict[str, Any]] = Field(
+        default_factory=list, description="新出现的条目，如新发布的成绩"
+    )
+    removed: list[dict[str, Any]] = Field(
+        default_factory=list, description="消失的条目"
+    )
+    updated: list[ItemUpdate] = Field(
+        default_factory=list, description="内容发生变化的条目，如考试时间或地点调整"
+    )
@@ -1,5 +1,7 @@
 from pydantic import BaseModel, Field
 
+from ecjtu_wechat_api.models.common import FreshnessInfo
+
 
 class TermItem(BaseModel):
     """学期条目模型，包含学期名称和查询 URL。"""
@@ -21,7 +23,7 @@ class ScoreItem(BaseModel):
     major: str | None = Field(None, description="专业标识，如 '主修'")
 
 
-class StudentScoreInfo(BaseModel):
+class StudentScoreInfo(FreshnessInfo):
     """学生成绩信息完整响应模型，包含学生信息和成绩列表。"""
 
     student_name: str = Field(..., description="学生姓名")
@@ -29,3 +31,33 @@ class StudentScoreInfo(BaseModel):
     available_terms: list[TermItem] = Field(..., description="可查询的学期列表")
     score_count: int = Field(..., description="成绩总数")
     scores: list[ScoreItem] = Field(..., description="成绩列表")
+
+
+class TermScoreItem(ScoreItem):
+    """带所属学期的成绩条目，用于多学期汇总。"""
+
+    term: str = Field(..., description="成绩所属学期，如 '2025.1'")
+
+
+class TermScoreSummary(BaseModel):
+    """单个学期的成绩统计。"""
+
+    term: str = Field(..., description="学期名称")
+    score_count: int = Field(..., description="该学期成绩条目数")
+    total_credit: float = Field(..., description="该学期课程学分合计")
+    gpa: float | None = Field(
+        None, description="该学期学分加权平均绩点，没有可计入绩点的课程时为空"
+    )
+
+
+class AllScoresInfo(BaseModel):
+    """全部学期成绩汇总响应模型。"""
+
+    student_name: str = Field(..., description="学生姓名")
+    terms: list[TermScoreSummary] = Field(..., description="各学期成绩统计")
+    score_count: int = Field(..., description="去重后的成绩总数")
+    total_credit: float = Field(..., description="去重后的课程学分合计")
+    gpa: float | None = Field(
+        None, description="全部学期学分加权平均绩点，重修课程取最高绩点"
+    )
+    scores: list[TermScoreItem] = Field(..., description="去重后的全部成绩列表")
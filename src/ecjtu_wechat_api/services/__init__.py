@@ -1,15 +1,42 @@
-from ecjtu_wechat_api.services.parse_course import (
-    fetch_course_schedule,
-    parse_course_schedule,
-)
-from ecjtu_wechat_api.services.parse_exam import (
-    fetch_exam_schedule,
-    parse_exam_schedule,
-)
-from ecjtu_wechat_api.services.parse_score import (
-    fetch_score_info,
-    parse_score_info,
-)
+from importlib import import_module
+from typing import TYPE_CHECKING
+
+# 公开名称 -> 所在模块，首次访问时才导入（PEP 562）
+_LAZY_ATTRS = {
+    "fetch_course_schedule": "ecjtu_wechat_api.services.parse_course",
+    "parse_course_schedule": "ecjtu_wechat_api.services.parse_course",
+    "fetch_score_info": "ecjtu_wechat_api.services.parse_score",
+    "parse_score_info": "ecjtu_wechat_api.services.parse_score",
+    "fetch_exam_schedule": "ecjtu_wechat_api.services.parse_exam",
+    "parse_exam_schedule": "ecjtu_wechat_api.services.parse_exam",
+}
+
+if TYPE_CHECKING:
+    from ecjtu_wechat_api.services.parse_course import (
+        fetch_course_schedule,
+        parse_course_schedule,
+    )
+    from ecjtu_wechat_api.services.parse_exam import (
+        fetch_exam_schedule,
+        parse_exam_schedule,
+    )
+    from ecjtu_wechat_api.services.parse_score import (
+        fetch_score_info,
+        parse_score_info,
+    )
+
+
+def __getattr__(name: str):
+    if name not in _LAZY_ATTRS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(_LAZY_ATTRS[name]), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted([*globals(), *_LAZY_ATTRS])
+
 
 __all__ = [
     "fetch_course_schedule",
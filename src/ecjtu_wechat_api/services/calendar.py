@@ -0,0 +1,142 @@
+"""
+日历订阅源：将考试安排、整学期课表转换为 iCalendar 事件
+"""
+
+from datetime import date, datetime, time, timedelta
+
+from ecjtu_wechat_api.core.config import settings
+from ecjtu_wechat_api.models.course import Course, TermTimetable
+from ecjtu_wechat_api.models.exam import ExamItem, ExamSchedule
+from ecjtu_wechat_api.services.timetable import date_of
+from ecjtu_wechat_api.utils.ics import Event, make_uid
+from ecjtu_wechat_api.utils.logger import logger
+
+
+def _exam_description(exam: ExamItem) -> str:
+    lines = [
+        f"考试周次: 第{exam.week}周" if exam.week else "",
+        f"课程性质: {exam.course_type}" if exam.course_type else "",
+        f"班级: {exam.class_name}" if exam.class_name else "",
+        f"考试人数: {exam.exam_count_num}" if exam.exam_count_num else "",
+        f"备注: {exam.note}" if exam.note else "",
+    ]
+    return "\n".join(line for line in lines if line)
+
+
+def exam_events(schedule: ExamSchedule) -> list[Event]:
+    """
+    将考试安排转换为日历事件。
+
+    有具体时间段的考试为定时事件，只识别出日期的为全天事件，
+    日期无法识别的考试不输出。同一课程、班级可能有多场考试，UID 中包含
+    考试日期与开始时间；仍然相同时再附加序号。
+    """
+    events = []
+    seen: dict[str, int] = {}
+    for exam in schedule.exams:
+        if exam.exam_day is None:
+            continue
+        if exam.starts_at is not None and exam.ends_at is not None:
+            start, end = exam.starts_at, exam.ends_at
+        else:
+            start, end = exam.exam_day, exam.exam_day + timedelta(days=1)
+        parts = [
+            "exam",
+            schedule.current_term,
+            exam.course_name,
+            exam.class_name,
+            exam.exam_day.isoformat(),
+            exam.time_start,
+        ]
+        uid = make_uid(*parts)
+        seen[uid] = seen.get(uid, 0) + 1
+        if seen[uid] > 1:
+            uid = make_uid(*parts, str(seen[uid]))
+        events.append(
+            Event(
+                uid=uid,
+                summary=f"{exam.course_name} 考试",
+                start=start,
+                end=end,
+                location=exam.location,
+                description=_exam_description(exam),
+            )
+        )
+    return events
+
+
+def _section_blocks(periods: list[int]) -> list[tuple[int, int]]:
+    """将节次列表合并为连续区间，如 [1, 2, 5, 6] -> [(1, 2), (5, 6)]。"""
+    blocks: list[tuple[int, int]] = []
+    for period in sorted(set(periods)):
+        if blocks and blocks[-1][1] == period - 1:
+            blocks[-1] = (blocks[-1][0], period)
+        else:
+            blocks.append((period, period))
+    return blocks
+
+
+def _at(day: date, hhmm: str) -> datetime:
+    hour, _, minute = hhmm.partition(":")
+    return datetime.combine(day, time(int(hour), int(minute), tzinfo=settings.TIMEZONE))
+
+
+def _course_description(course: Course, week: int, first: int, last: int) -> str:
+    sections = f"{first}-{last}节" if first != last else f"{first}节"
+    lines = [
+        f"第{week}周 {sections}",
+        f"教师: {course.teacher}" if course.teacher else "",
+        f"状态: {course.status}" if course.status else "",
+    ]
+    return "\n".join(line for line in lines if line)
+
+
+def course_events(term: TermTimetable) -> list[Event]:
+    """
+    将整学期课表索引展开为日历事件。
+
+    每门课程在其每个教学周的上课日按连续节次生成一个事件，节次通过
+    COURSE_SECTION_TIMES 作息时间表换算为具体时间；作息表中没有的节次不输出。
+    调课等需核实的异常课程不在索引中，也不会输出。
+    """
+    sections = settings.COURSE_SECTION_TIMES
+    term_start = date.fromisoformat(term.term_start)
+    events = []
+    missing: set[int] = set()
+    for week, days in term.index.items():
+        for weekday, day_periods in days.items():
+            # 节次 -> 课程 转换为 课程 -> 节次
+            course_periods: dict[int, list[int]] = {}
+            for period, course_ids in day_periods.items():
+                for idx in course_ids:
+                    course_periods.setdefault(idx, []).append(period)
+
+            day = date_of(term_start, week, weekday)
+            for idx, periods in course_periods.items():
+                course = term.courses[idx]
+                for first, last in _section_blocks(periods):
+                    if first not in sections or last not in sections:
+                        missing.update(p for p in (first, last) if p not in sections)
+                        continue
+                    events.append(
+                        Event(
+                            uid=make_uid(
+                                "course",
+                                term.term_start,
+                                course.name,
+                                course.teacher,
+                                str(week),
+                                str(weekday),
+                                str(first),
+                            ),
+                            summary=course.name,
+                            start=_at(day, sections[first][0]),
+                            end=_at(day, sections[last][1]),
+                            location=course.location,
+                            description=_course_description(course, week, first, last),
+                        )
+                    )
+    if missing:
+        logger.warning("作息时间表缺少节次 %s，相关课程未写入日历", sorted(missing))
+    events.sort(key=lambda e: (e.start, e.summary))
+    return events
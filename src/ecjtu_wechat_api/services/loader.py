@@ -0,0 +1,405 @@
+"""
+抓取并解析教务系统页面的公共流程
+
+依次提供：解析结果缓存、stale-while-revalidate、请求合并、页面未变化时
+跳过解析，以及教务系统不可用时从页面存储回退。load_* 函数按此流程加载
+课程表、成绩和考试安排，供各接口、批量查询及后台轮询共用。
+"""
+
+import asyncio
+import hashlib
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from datetime import date as date_type
+from typing import Any
+
+from pydantic import BaseModel
+
+from ecjtu_wechat_api.core.config import settings
+from ecjtu_wechat_api.core.exceptions import EducationSystemError, UpstreamBusyError
+from ecjtu_wechat_api.models.course import CourseSchedule
+from ecjtu_wechat_api.models.exam import ExamSchedule
+from ecjtu_wechat_api.models.score import StudentScoreInfo
+from ecjtu_wechat_api.services.parse_course import (
+    fetch_course_schedule,
+    parse_course_schedule,
+)
+from ecjtu_wechat_api.services.parse_exam import (
+    fetch_exam_schedule,
+    parse_exam_schedule,
+    stream_exam_schedule,
+)
+from ecjtu_wechat_api.services.parse_score import (
+    fetch_score_info,
+    parse_score_info,
+    stream_score_info,
+)
+from ecjtu_wechat_api.utils.cache import create_cache, response_cache
+from ecjtu_wechat_api.utils.executor import parse_pool
+from ecjtu_wechat_api.utils.http import NotModified, Validators, conditional
+from ecjtu_wechat_api.utils.logger import logger
+from ecjtu_wechat_api.utils.metrics import Counter, Histogram
+from ecjtu_wechat_api.utils.persistence import page_store
+from ecjtu_wechat_api.utils.singleflight import SingleFlight
+from ecjtu_wechat_api.utils.timing import annotate, record_stage, stage
+
+# 相同缓存键的并发请求共享一次抓取与解析
+_inflight = SingleFlight()
+
+# 后台刷新任务的强引用，避免任务在完成前被垃圾回收
+_background: set[asyncio.Task] = set()
+
+PAGE_FETCHES = Counter(
+    "ecjtu_page_fetches_total",
+    "抓取页面的次数，result 为 changed、unchanged（内容未变）或 not_modified（304）",
+    ("category", "result"),
+)
+
+CACHE_REQUESTS = Counter(
+    "ecjtu_cache_requests_total",
+    "读取解析结果缓存的次数，result 为 hit、stale（返回过期数据）或 miss",
+    ("category", "result"),
+)
+PARSE_DURATION = Histogram(
+    "ecjtu_parse_duration_seconds",
+    "解析页面的耗时（不含在解析队列中等待的时间）",
+    ("parser",),
+)
+
+type CacheKey = tuple[str, str, str | None]
+
+# 页面内容变化时的回调: (缓存键, 上一次的解析结果, 新的解析结果)
+type ChangeListener = Callable[[CacheKey, Any, Any], None]
+
+_listeners: list[ChangeListener] = []
+
+
+@dataclass(frozen=True)
+class Fingerprint:
+    """上一次抓取的页面指纹：内容哈希、条件请求校验信息及对应的解析结果。"""
+
+    digest: str | None
+    validators: Validators
+    value: Any
+
+
+# 各缓存键最近一次抓取的页面指纹，保留时间与过期缓存相同
+page_fingerprints = create_cache()
+
+# 各类别对应的模型，用于还原页面存储中的解析结果
+_MODELS: dict[str, type[BaseModel]] = {
+    "courses": CourseSchedule,
+    "scores": StudentScoreInfo,
+    "exams": ExamSchedule,
+}
+
+
+def _mark_stale(value: Any, age: float) -> Any:
+    """为过期数据填写 stale 标记及数据年龄，不修改缓存中的原对象。"""
+    update = {"stale": True, "age": round(age, 1)}
+    if isinstance(value, BaseModel):
+        if "stale" in type(value).model_fields:
+            return value.model_copy(update=update)
+        return value
+    if isinstance(value, dict):
+        return {**value, **update}
+    return value
+
+
+def _mark_changed(value: Any, changed: bool) -> Any:
+    """为解析结果填写 changed 标记，不修改原对象。"""
+    if isinstance(value, BaseModel) and "changed" in type(value).model_fields:
+        return value.model_copy(update={"changed": changed})
+    return value
+
+
+def _digest(html_content: str | None) -> str | None:
+    if not html_content:
+        return None
+    return hashlib.blake2b(html_content.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _timed_parse[T](parse: Callable[[str], T], html_content: str) -> tuple[T, float]:
+    """在工作池中执行解析并返回 (结果, 耗时)，耗时不含排队时间。"""
+    start = time.perf_counter()
+    return parse(html_content), time.perf_counter() - start
+
+
+def on_change(listener: ChangeListener) -> ChangeListener:
+    """
+    注册页面内容变化的回调（可用作装饰器），供通知等下游功能使用。
+
+    仅当存在上一次抓取的记录且内容发生变化时调用；回调在事件循环中同步执行，
+    耗时操作应自行创建任务。
+    """
+    _listeners.append(listener)
+    return listener
+
+
+def _notify_change(key: CacheKey, previous: Any, current: Any) -> None:
+    for listener in list(_listeners):
+        try:
+            listener(key, previous, current)
+        except Exception as e:
+            logger.warning("页面变化回调执行失败: %s weiXinID=%s %s, %s", *key, e)
+
+
+def _count_cache(key: CacheKey, result: str) -> None:
+    CACHE_REQUESTS.inc(category=key[0], result=result)
+    annotate("cache", result)
+
+
+async def load_from_store(key: CacheKey) -> Any | None:
+    """从页面存储读取最近一次成功解析的结果，并标记为过期数据。"""
+    if not settings.STORE_ENABLED:
+        return None
+    page = await page_store.alatest(*key)
+    if page is None or page.data is None:
+        return None
+    model = _MODELS.get(key[0])
+    data = model.model_validate(page.data) if model else page.data
+    return _mark_stale(data, time.time() - page.fetched_at)
+
+
+def _refresh_in_background(key: CacheKey, load: Callable[[], Awaitable[Any]]) -> None:
+    """在后台刷新过期的缓存条目，与前台请求共享同一个 single-flight。"""
+
+    async def _refresh() -> None:
+        try:
+            await _inflight.do(key, load)
+        except Exception as e:
+            logger.warning("后台刷新失败: %s weiXinID=%s %s, %s", *key, e)
+
+    task = asyncio.ensure_future(_refresh())
+    _background.add(task)
+    task.add_done_callback(_background.discard)
+
+
+async def fetch_and_parse[T](
+    key: CacheKey,
+    fetch: Callable[[], Awaitable[str]],
+    parse: Callable[[str], T],
+    ttl: Callable[[T], float],
+    stream: Callable[[bool], Awaitable[tuple[str | None, T]]] | None = None,
+    refresh: bool = False,
+) -> T:
+    """
+    优先从缓存读取解析结果，未命中时抓取页面、解析并写入缓存。
+
+    相同 key 的并发调用只会请求一次教务系统并解析一次，所有调用者得到
+    同一个结果或同一个异常。
+
+    重新抓取时若教务系统返回 304 或页面内容哈希与上一次相同，直接复用上一次
+    的解析结果，跳过解析与模型校验，并将结果标记为 changed=False。
+
+    缓存已过期但仍在 CACHE_STALE_TTL 保留期内时，立即返回旧数据（stale=True）
+    并在后台刷新；教务系统请求失败或等待上游限流许可超时时，依次回退到过期
+    缓存和页面存储中最近一次的结果。
+
+    Args:
+        key: (类别, weiXinID, 学期或日期)，如 ("scores", weiXinID, term)，
+            同时用作缓存键和持久化存储的索引
+        fetch: 抓取原始 HTML 的协程函数
+        parse: 将 HTML 解析为模型的函数
+        ttl: 根据解析结果计算缓存有效期（秒）的函数
+        stream: 可选的流式抓取并解析函数，参数表示是否需要保留原始 HTML，
+            返回 (HTML 或 None, 解析结果)；开启 STREAM_PARSE_ENABLED 时代替
+            fetch + parse
+        refresh: 为 True 时忽略缓存强制重新抓取（如后台轮询），结果仍写入缓存
+
+    Returns:
+        解析后的模型
+
+    Raises:
+        EducationSystemError: 请求教务系统失败且没有可回退的数据时抛出。
+        UpstreamBusyError: 等待上游限流许可超时且没有可回退的数据时抛出。
+        ParseError: 解析失败时抛出。
+        ServiceBusyError: 解析队列已满时抛出。
+    """
+
+    async def _load() -> T:
+        previous: Fingerprint | None = page_fingerprints.get(key)
+        validators = (
+            Validators(previous.validators.etag, previous.validators.last_modified)
+            if previous
+            else Validators()
+        )
+        digest = None
+        try:
+            with conditional(validators):
+                if stream is not None and settings.STREAM_PARSE_ENABLED:
+                    # 边下载边解析，只有需要写入页面存储时才返回原始 HTML
+                    with stage("stream"):
+                        html_content, parsed_data = await stream(
+                            settings.STORE_ENABLED and settings.STORE_SAVE_HTML
+                        )
+                    # 流式解析无法提前跳过，只能比较解析结果判断是否变化
+                    unchanged = previous is not None and previous.value == parsed_data
+                    result = "unchanged" if unchanged else "changed"
+                else:
+                    html_content = await fetch()
+                    digest = _digest(html_content)
+                    if digest and previous is not None and previous.digest == digest:
+                        # 页面内容与上一次完全相同，直接复用上一次的解析结果
+                        parsed_data, result = previous.value, "unchanged"
+                    else:
+                        # 解析在工作池中执行，不阻塞事件循环
+                        parsed_data, elapsed = await parse_pool.run(
+                            _timed_parse, parse, html_content
+                        )
+                        PARSE_DURATION.observe(elapsed, parser=key[0])
+                        record_stage("parse", elapsed)
+                        result = "changed"
+        except NotModified:
+            assert previous is not None
+            html_content, digest = None, previous.digest
+            parsed_data, result = previous.value, "not_modified"
+        PAGE_FETCHES.inc(category=key[0], result=result)
+
+        page_fingerprints.set(
+            key,
+            Fingerprint(digest, validators, parsed_data),
+            settings.CACHE_STALE_TTL,
+        )
+        if previous is not None:
+            changed = result == "changed"
+            if changed:
+                _notify_change(key, previous.value, parsed_data)
+            parsed_data = _mark_changed(parsed_data, changed)
+
+        response_cache.set(key, parsed_data, ttl(parsed_data), settings.CACHE_STALE_TTL)
+        if settings.STORE_ENABLED and html_content is not None:
+            page_store.save(*key, html_content, parsed_data)
+        return parsed_data
+
+    entry = response_cache.get_entry(key)
+    if entry is not None and not refresh:
+        if entry.fresh:
+            logger.debug("缓存命中: %s weiXinID=%s %s", *key)
+            _count_cache(key, "hit")
+            return entry.value
+        if settings.SWR_ENABLED:
+            logger.debug("返回过期缓存并后台刷新: %s weiXinID=%s %s", *key)
+            _count_cache(key, "stale")
+            _refresh_in_background(key, _load)
+            return _mark_stale(entry.value, entry.age)
+    if not refresh:
+        _count_cache(key, "miss")
+
+    try:
+        return await _inflight.do(key, _load)
+    except (EducationSystemError, UpstreamBusyError):
+        if entry is not None:
+            fallback = _mark_stale(entry.value, entry.age)
+        else:
+            fallback = await load_from_store(key)
+        if fallback is None:
+            raise
+        logger.warning("教务系统不可用，返回历史数据: %s weiXinID=%s %s", *key)
+        return fallback
+
+
+def course_ttl(date: str) -> float:
+    """
+    课程表缓存有效期：已经过去的日期使用长 TTL，今天及以后使用短 TTL。
+    """
+    try:
+        is_past = date_type.fromisoformat(date) < date_type.today()
+    except ValueError:
+        is_past = False
+    return settings.CACHE_TTL_COURSES_PAST if is_past else settings.CACHE_TTL_COURSES
+
+
+def is_past_term(term: str | None, available_terms: list[Any]) -> bool:
+    """
+    判断查询的学期是否为历史学期。
+
+    未指定学期时查询的是当前学期；否则与可选学期列表中最新的学期比较。
+    """
+    if not term or not available_terms:
+        return False
+    latest = max(t.name for t in available_terms)
+    return term < latest
+
+
+def term_ttl(
+    term: str | None, past_ttl: float, current_ttl: float
+) -> Callable[[Any], float]:
+    """
+    构造按学期区分的 TTL 计算函数，供成绩和考试安排接口使用。
+
+    Args:
+        term: 查询的学期，None 表示当前学期
+        past_ttl: 历史学期的有效期（秒）
+        current_ttl: 当前学期的有效期（秒）
+    """
+
+    def _ttl(parsed_data: Any) -> float:
+        if term and is_past_term(term, parsed_data.available_terms):
+            return past_ttl
+        return current_ttl
+
+    return _ttl
+
+
+async def load_course_schedule(
+    weiXinID: str, date: str, refresh: bool = False
+) -> CourseSchedule:
+    """
+    抓取并解析指定日期的课程表（带缓存）。
+
+    Args:
+        weiXinID: 微信用户ID
+        date: 日期，如 '2026-01-05'
+        refresh: 为 True 时忽略缓存强制重新抓取
+    """
+    return await fetch_and_parse(
+        ("courses", weiXinID, date),
+        fetch=lambda: fetch_course_schedule(weiXinID, date),
+        parse=parse_course_schedule,
+        ttl=lambda _: course_ttl(date),
+        refresh=refresh,
+    )
+
+
+async def load_score_info(
+    weiXinID: str, term: str | None, refresh: bool = False
+) -> StudentScoreInfo:
+    """
+    抓取并解析指定学期的成绩（带缓存）。
+
+    Args:
+        weiXinID: 微信用户ID
+        term: 学期，如 '2025.1'，None 表示当前学期
+        refresh: 为 True 时忽略缓存强制重新抓取
+    """
+    return await fetch_and_parse(
+        ("scores", weiXinID, term),
+        fetch=lambda: fetch_score_info(weiXinID, term),
+        parse=parse_score_info,
+        ttl=term_ttl(term, settings.CACHE_TTL_SCORES_PAST, settings.CACHE_TTL_SCORES),
+        stream=lambda keep_html: stream_score_info(weiXinID, term, keep_html),
+        refresh=refresh,
+    )
+
+
+async def load_exam_schedule(
+    weiXinID: str, term: str | None, refresh: bool = False
+) -> ExamSchedule:
+    """
+    抓取并解析指定学期的考试安排（带缓存）。
+
+    Args:
+        weiXinID: 微信用户ID
+        term: 学期，如 '2025.1'，None 表示当前学期
+        refresh: 为 True 时忽略缓存强制重新抓取
+    """
+    return await fetch_and_parse(
+        ("exams", weiXinID, term),
+        fetch=lambda: fetch_exam_schedule(weiXinID, term),
+        parse=parse_exam_schedule,
+        ttl=term_ttl(term, settings.CACHE_TTL_EXAMS_PAST, settings.CACHE_TTL_EXAMS),
+        stream=lambda keep_html: stream_exam_schedule(weiXinID, term, keep_html),
+        refresh=refresh,
+    )
@@ -0,0 +1,463 @@
+"""
+成绩/考试安排变化检测与推送
+
+后台轮询器按 POLL_RATE 的节奏重新抓取已订阅用户的成绩和考试安排。抓取流程
+（loader）发现页面内容变化时通过 on_change 回调通知本模块，与上一次的结果
+比较出新增、删除或修改的条目，生成 ChangeEvent 推送到事件总线（供 SSE 连接
+消费）和 Webhook。一个受控的轮询器即可代替大量客户端轮询。
+"""
+
+import asyncio
+import contextlib
+import ipaddress
+import socket
+import time
+from collections import deque
+from collections.abc import Callable, Hashable
+from datetime import datetime
+from typing import Any
+
+import httpx
+from pydantic import BaseModel
+
+from ecjtu_wechat_api.core.config import settings
+from ecjtu_wechat_api.core.exceptions import (
+    ECJTUAPIError,
+    InvalidParameterError,
+    NotFoundError,
+)
+from ecjtu_wechat_api.models.exam import ExamItem, ExamSchedule
+from ecjtu_wechat_api.models.notification import (
+    ChangeEvent,
+    ItemUpdate,
+    NotificationKind,
+    Subscription,
+)
+from ecjtu_wechat_api.models.score import ScoreItem, StudentScoreInfo
+from ecjtu_wechat_api.services.loader import (
+    CacheKey,
+    load_exam_schedule,
+    load_from_store,
+    load_score_info,
+    on_change,
+    page_fingerprints,
+)
+from ecjtu_wechat_api.utils.logger import logger
+from ecjtu_wechat_api.utils.metrics import Counter, Gauge
+from ecjtu_wechat_api.utils.persistence import page_store
+
+POLL_RUNS = Counter("ecjtu_poll_runs_total", "后台轮询的抓取次数", ("kind", "result"))
+POLL_SUBSCRIPTIONS = Gauge("ecjtu_poll_subscriptions", "当前的订阅数")
+NOTIFY_EVENTS = Counter("ecjtu_notify_events_total", "生成的变化事件数", ("kind",))
+NOTIFY_WEBHOOK_FAILURES = Counter(
+    "ecjtu_notify_webhook_failures_total", "Webhook 推送失败次数"
+)
+
+
+def _score_key(item: ScoreItem) -> Hashable:
+    return item.course_code or item.course_name
+
+
+def _exam_key(item: ExamItem) -> Hashable:
+    return (item.course_name, item.class_name)
+
+
+# 各数据类型的条目去重键
+ITEM_KEYS: dict[str, Callable[[Any], Hashable]] = {
+    "scores": _score_key,
+    "exams": _exam_key,
+}
+
+
+def _items(kind: str, data: StudentScoreInfo | ExamSchedule) -> list[Any]:
+    return data.scores if kind == "scores" else data.exams
+
+
+# 推送 Webhook 专用的客户端，不与访问教务系统的共享客户端混用
+_webhook_client: httpx.AsyncClient | None = None
+
+
+def get_webhook_client() -> httpx.AsyncClient:
+    """获取推送 Webhook 的 HTTP 客户端（惰性创建，不跟随重定向）。"""
+    global _webhook_client
+    if _webhook_client is None or _webhook_client.is_closed:
+        _webhook_client = httpx.AsyncClient(
+            timeout=settings.NOTIFY_WEBHOOK_TIMEOUT, follow_redirects=False
+        )
+    return _webhook_client
+
+
+async def close_webhook_client() -> None:
+    """关闭推送 Webhook 的 HTTP 客户端。"""
+    global _webhook_client
+    if _webhook_client is not None:
+        await _webhook_client.aclose()
+        _webhook_client = None
+
+
+async def check_webhook_url(url: str) -> None:
+    """
+    校验订阅的 Webhook 地址，防止借推送访问内部服务。
+
+    只接受 http(s) 地址，且主机解析出的所有地址都必须是公网地址；
+    NOTIFY_WEBHOOK_ALLOWLIST 中的主机不受此限制。
+
+    Raises:
+        InvalidParameterError: 地址不合法、无法解析或指向非公网地址时抛出。
+    """
+    try:
+        parsed = httpx.URL(url)
+    except httpx.InvalidURL as e:
+        raise InvalidParameterError("Webhook 地址不合法") from e
+    if parsed.scheme not in ("http", "https") or not parsed.host:
+        raise InvalidParameterError("Webhook 地址必须以 http:// 或 https:// 开头")
+    host = parsed.host
+    if host in settings.NOTIFY_WEBHOOK_ALLOWLIST:
+        return
+    port = parsed.port or (443 if parsed.scheme == "https" else 80)
+    try:
+        infos = await asyncio.get_running_loop().getaddrinfo(
+            host, port, type=socket.SOCK_STREAM
+        )
+    except OSError as e:
+        raise InvalidParameterError(
+            "无法解析 Webhook 地址的主机", details={"host": host}
+        ) from e
+    for *_, sockaddr in infos:
+        # IPv6 链路本地地址可能带有 %网卡 后缀
+        address = ipaddress.ip_address(str(sockaddr[0]).split("%")[0])
+        if isinstance(address, ipaddress.IPv6Address) and address.ipv4_mapped:
+            address = address.ipv4_mapped
+        if not address.is_global or address.is_multicast:
+            raise InvalidParameterError(
+                "Webhook 地址不能指向内网或本机", details={"host": host}
+            )
+
+
+def diff_items[T: BaseModel](
+    old: list[T], new: list[T], key: Callable[[T], Hashable]
+) -> tuple[list[T], list[T], list[tuple[T, T]]]:
+    """
+    比较两次抓取的条目列表。
+
+    Args:
+        old: 上一次的条目
+        new: 本次的条目
+        key: 条目的唯一键，如课程代码
+
+    Returns:
+        (新增条目, 删除条目, [(变化前, 变化后)])
+    """
+    old_map = {key(item): item for item in old}
+    new_map = {key(item): item for item in new}
+    added = [item for k, item in new_map.items() if k not in old_map]
+    removed = [item for k, item in old_map.items() if k not in new_map]
+    updated = [
+        (old_map[k], item)
+        for k, item in new_map.items()
+        if k in old_map and old_map[k] != item
+    ]
+    return added, removed, updated
+
+
+class EventBroker:
+    """
+    进程内事件总线：保存最近的事件，并分发给按 weiXinID 订阅的监听队列。
+
+    监听队列已满时丢弃最旧的事件，慢消费者不会阻塞发布方。
+
+    事件序号取当前时间的微秒数（并保证单调递增），服务重启后新事件的序号
+    仍大于重启前客户端收到的 Last-Event-ID，不会被当作已发送而跳过。
+    """
+
+    def __init__(self, history_size: int, queue_size: int):
+        self.queue_size = queue_size
+        self._history: deque[ChangeEvent] = deque(maxlen=history_size)
+        self._listeners: dict[asyncio.Queue, str] = {}
+        self._last_id = 0
+
+    def next_id(self) -> int:
+        self._last_id = max(self._last_id + 1, time.time_ns() // 1000)
+        return self._last_id
+
+    def is_future_id(self, event_id: int) -> bool:
+        """序号大于目前可能发出的任何序号（如系统时钟回拨），客户端应从头接收。"""
+        return event_id > max(self._last_id, time.time_ns() // 1000)
+
+    def publish(self, event: ChangeEvent) -> None:
+        self._history.append(event)
+        for queue, weixin_id in self._listeners.items():
+            if weixin_id != event.weixin_id:
+                continue
+            if queue.full():
+                queue.get_nowait()
+            queue.put_nowait(event)
+
+    def subscribe(self, weixin_id: str) -> asyncio.Queue:
+        """注册只接收该用户事件的监听队列。"""
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        self._listeners[queue] = weixin_id
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue) -> None:
+        self._listeners.pop(queue, None)
+
+    def history(self, weixin_id: str, after: int = 0) -> list[ChangeEvent]:
+        """最近保留的该用户事件中，序号大于 after 的事件。"""
+        return [
+            event
+            for event in self._history
+            if event.id > after and event.weixin_id == weixin_id
+        ]
+
+
+async def _load(kind: str, weixin_id: str, term: str | None) -> Any:
+    """忽略缓存重新抓取成绩或考试安排，结果同时刷新接口缓存。"""
+    if kind == "scores":
+        return await load_score_info(weixin_id, term, refresh=True)
+    return await load_exam_schedule(weixin_id, term, refresh=True)
+
+
+class ChangePoller:
+    """
+    按固定节奏轮询订阅用户的数据，检测变化并推送事件。
+
+    变化由抓取流程通过 on_change 回调 detect 发现，因此接口请求刷新到的
+    变化同样会推送；轮询只负责按节奏触发重新抓取。开启 STORE_ENABLED 时
+    订阅同时保存在页面存储中，服务重启后由 restore 恢复。
+    """
+
+    def __init__(self, broker: EventBroker):
+        self.broker = broker
+        self._subscriptions: dict[str, Subscription] = {}
+        self._task: asyncio.Task | None = None
+        # 进行中的 Webhook 推送任务的强引用，避免任务在完成前被垃圾回收
+        self._deliveries: set[asyncio.Task] = set()
+
+    # ---- 订阅管理 ----
+
+    async def subscribe(
+        self,
+        weixin_id: str,
+        kinds: list[NotificationKind],
+        term: str | None = None,
+        webhook_url: str | None = None,
+    ) -> Subscription:
+        """
+        新增或更新订阅。
+
+        Raises:
+            InvalidParameterError: Webhook 地址不合法或订阅数已达上限时抛出。
+        """
+        if webhook_url:
+            await check_webhook_url(webhook_url)
+        if (
+            weixin_id not in self._subscriptions
+            and len(self._subscriptions) >= settings.NOTIFY_MAX_SUBSCRIPTIONS
+        ):
+            raise InvalidParameterError(
+                "订阅数已达上限", details={"max": settings.NOTIFY_MAX_SUBSCRIPTIONS}
+            )
+        subscription = Subscription(
+            weixin_id=weixin_id,
+            kinds=sorted(set(kinds)),
+            term=term,
+            webhook_url=webhook_url,
+            created_at=datetime.now().isoformat(timespec="seconds"),
+        )
+        if settings.STORE_ENABLED:
+            await page_store.aput_subscription(weixin_id, subscription)
+        self._subscriptions[weixin_id] = subscription
+        POLL_SUBSCRIPTIONS.set(len(self._subscriptions))
+        return subscription
+
+    def get(self, weixin_id: str) -> Subscription:
+        """
+        Raises:
+            NotFoundError: 未订阅时抛出。
+        """
+        subscription = self._subscriptions.get(weixin_id)
+        if subscription is None:
+            raise NotFoundError("该用户没有订阅变化通知")
+        return subscription
+
+    async def unsubscribe(self, weixin_id: str) -> Subscription:
+        """
+        取消订阅。
+
+        Raises:
+            NotFoundError: 未订阅时抛出。
+        """
+        subscription = self.get(weixin_id)
+        if settings.STORE_ENABLED:
+            await page_store.adelete_subscription(weixin_id)
+        self._subscriptions.pop(weixin_id, None)
+        POLL_SUBSCRIPTIONS.set(len(self._subscriptions))
+        return subscription
+
+    async def restore(self) -> int:
+        """
+        从页面存储恢复服务重启前的订阅（由应用 lifespan 调用），返回恢复的订阅数。
+
+        未开启 STORE_ENABLED 时订阅只保存在内存中，不做任何操作。
+        """
+        if not settings.STORE_ENABLED:
+            return 0
+        stored = await page_store.asubscriptions()
+        for data in stored:
+            subscription = Subscription.model_validate(data)
+            self._subscriptions.setdefault(subscription.weixin_id, subscription)
+        POLL_SUBSCRIPTIONS.set(len(self._subscriptions))
+        return len(stored)
+
+    # ---- 轮询 ----
+
+    def detect(self, key: CacheKey, previous: Any, current: Any) -> ChangeEvent | None:
+        """
+        比较订阅数据前后两次的结果，有变化时发布并返回事件
+        （注册为 loader 的 on_change 回调）。
+        """
+        kind, weixin_id, term = key
+        subscription = self._subscriptions.get(weixin_id)
+        if (
+            subscription is None
+            or kind not in subscription.kinds
+            or term != subscription.term
+        ):
+            return None
+        added, removed, updated = diff_items(
+            _items(kind, previous), _items(kind, current), ITEM_KEYS[kind]
+        )
+        if not (added or removed or updated):
+            return None
+        event = ChangeEvent(
+            id=self.broker.next_id(),
+            kind=kind,
+            weixin_id=weixin_id,
+            term=current.current_term,
+            detected_at=datetime.now().isoformat(timespec="seconds"),
+            added=[item.model_dump(mode="json") for item in added],
+            removed=[item.model_dump(mode="json") for item in removed],
+            updated=[
+                ItemUpdate(
+                    before=old.model_dump(mode="json"),
+                    after=new.model_dump(mode="json"),
+                )
+                for old, new in updated
+            ],
+        )
+        self.emit(event, subscription)
+        return event
+
+    async def check(self, subscription: Subscription, kind: str) -> None:
+        """重新抓取一次订阅数据，内容变化时由 detect 推送事件。"""
+        key = (kind, subscription.weixin_id, subscription.term)
+        # 抓取流程只在有上一次结果时回调；服务重启后的首次抓取以页面存储中
+        # 最近一次的结果为基准进行比较
+        baseline = None
+        if page_fingerprints.get(key) is None:
+            baseline = await load_from_store(key)
+        try:
+            data = await _load(kind, subscription.weixin_id, subscription.term)
+        except ECJTUAPIError as e:
+            POLL_RUNS.inc(kind=kind, result="error")
+            logger.warning("轮询失败: %s weiXinID=%s %s, %s", *key, e.message)
+            return
+        POLL_RUNS.inc(kind=kind, result="ok")
+        # 教务系统不可用时返回的过期数据不代表最新状态，不参与比较
+        if baseline is not None and not data.stale:
+            self.detect(key, baseline, data)
+
+    def emit(self, event: ChangeEvent, subscription: Subscription) -> None:
+        """将事件发布到事件总线，并在后台推送到全局及订阅的 Webhook。"""
+        NOTIFY_EVENTS.inc(kind=event.kind)
+        logger.info(
+            "检测到%s变化: weiXinID=%s, 新增 %d, 删除 %d, 修改 %d",
+            event.kind,
+            event.weixin_id,
+            len(event.added),
+            len(event.removed),
+            len(event.updated),
+        )
+        self.broker.publish(event)
+        # Webhook 地址 -> 是否需要校验；全局 Webhook 由运维配置，不做校验
+        targets: dict[str, bool] = {}
+        if subscription.webhook_url:
+            targets[subscription.webhook_url] = True
+        if settings.NOTIFY_WEBHOOK_URL:
+            targets[settings.NOTIFY_WEBHOOK_URL] = False
+        for url, verify in targets.items():
+            task = asyncio.ensure_future(self._post_webhook(url, event, verify))
+            self._deliveries.add(task)
+            task.add_done_callback(self._deliveries.discard)
+
+    async def drain(self) -> None:
+        """等待进行中的 Webhook 推送完成。"""
+        while self._deliveries:
+            await asyncio.gather(*self._deliveries, return_exceptions=True)
+
+    async def _post_webhook(self, url: str, event: ChangeEvent, verify: bool) -> None:
+        try:
+            # 推送前重新解析校验，防止订阅后主机改为解析到内网地址
+            if verify:
+                await check_webhook_url(url)
+            response = await get_webhook_client().post(
+                url,
+                content=event.model_dump_json(),
+                headers={"Content-Type": "application/json"},
+            )
+            response.raise_for_status()
+        except Exception as e:
+            NOTIFY_WEBHOOK_FAILURES.inc()
+            logger.warning("Webhook 推送失败: %s, %s", url, e)
+
+    async def poll_once(self) -> None:
+        """
+        对所有订阅执行一轮检查。
+
+        按 POLL_RATE 的速率依次发起抓取，同时进行的抓取不超过 POLL_CONCURRENCY。
+        """
+        semaphore = asyncio.Semaphore(settings.POLL_CONCURRENCY)
+        interval = 1 / settings.POLL_RATE if settings.POLL_RATE > 0 else 0
+
+        async def run(subscription: Subscription, kind: str) -> None:
+            async with semaphore:
+                await self.check(subscription, kind)
+
+        tasks = []
+        for subscription in list(self._subscriptions.values()):
+            for kind in subscription.kinds:
+                tasks.append(asyncio.ensure_future(run(subscription, kind)))
+                await asyncio.sleep(interval)
+        await asyncio.gather(*tasks)
+
+    async def _run(self) -> None:
+        while True:
+            started = time.monotonic()
+            try:
+                await self.poll_once()
+            except Exception as e:
+                logger.exception("后台轮询出错: %s", e)
+            elapsed = time.monotonic() - started
+            await asyncio.sleep(max(0.0, settings.POLL_INTERVAL - elapsed))
+
+    def start(self) -> None:
+        """启动后台轮询任务（由应用 lifespan 调用，重复调用无副作用）。"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.ensure_future(self._run())
+
+    async def stop(self) -> None:
+        """停止后台轮询任务，等待进行中的 Webhook 推送后关闭其客户端。"""
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+        await self.drain()
+        await close_webhook_client()
+
+
+# 全局事件总线与轮询器
+event_broker = EventBroker(settings.NOTIFY_HISTORY_SIZE, settings.NOTIFY_QUEUE_SIZE)
+change_poller = ChangePoller(event_broker)
+on_change(change_poller.detect)
@@ -5,14 +5,16 @@
 import json
 import re
 
-from bs4 import BeautifulSoup
-
 from ecjtu_wechat_api.core.config import settings
 from ecjtu_wechat_api.core.exceptions import ParseError
 from ecjtu_wechat_api.models.course import Course, CourseSchedule, DateInfo
-from ecjtu_wechat_api.utils.http import get_page
-from ecjtu_wechat_api.utils.logger import logger
-from ecjtu_wechat_api.utils.persistence import save_debug_data
+from ecjtu_wechat_api.utils.html import find_first, make_soup
+from ecjtu_wechat_api.utils.logger import SAMPLED, logger
+
+# 日期后的星期和周次，支持 "星期一（第19周）" 或 "星期一(19)"
+_WEEKDAY_RE = re.compile(r"([^（(]+)[（(]第?(\d+)周[）)]")
+# 课程名称和考核状态，如 "大学英语Ⅰ(考试)"
+_NAME_RE = re.compile(r"(.+?)[（(]([^（()）]+)[)）]$")
 
 
 async def fetch_course_schedule(weiXinID: str, date: str) -> str:
@@ -29,15 +31,169 @@ async def fetch_course_schedule(weiXinID: str, date: str) -> str:
     Raises:
         EducationSystemError: 请求失败时抛出。
     """
+    # 抓取相关模块按需导入，只使用解析函数的脚本不会加载 httpx 及页面存储
+    from ecjtu_wechat_api.utils.http import get_page
+
     params = {
         "weiXinID": weiXinID,
         "date": date,
     }
 
-    logger.info(f"正在请求教务系统课程表: weiXinID={weiXinID}, date={date}")
+    logger.info(
+        "正在请求教务系统课程表: weiXinID=%s, date=%s", weiXinID, date, extra=SAMPLED
+    )
     return await get_page(settings.COURSE_URL, params=params)
 
 
+def _parse_date_info(raw_date_str: str) -> DateInfo | None:
+    """
+    提取日期和周次信息。
+
+    原始片段:
+    <div class="center">
+        <p>
+            2026-01-05 星期一（第19周）
+        </p>
+    </div>
+    """
+    # 拆分日期 (2026-01-05) 和后续部分 (星期一（第19周）)
+    date, sep, rest = raw_date_str.partition(" ")
+    if not date:
+        return None
+    if not sep:
+        return DateInfo(date=date)
+    if match := _WEEKDAY_RE.search(rest):
+        return DateInfo(
+            date=date, day_of_week=match.group(1).strip(), week_info=match.group(2)
+        )
+    return DateInfo(date=date, day_of_week=rest.strip())
+
+
+def _field_value(line: str) -> str:
+    """取 "地点：进贤2-212" 形式文本行中冒号后的值，没有冒号时返回整行。"""
+    _, sep, value = line.replace("：", ":").partition(":")
+    return (value if sep else line).strip()
+
+
+def _parse_time(time_val: str, weeks: list[list[int]]) -> list[int] | None:
+    """
+    解析时间行的周次和节次，如 "19 3,4" 表示第19周的第3,4节。
+
+    周次支持 "1-18" (Range) 或 "1,3,5" (List)，解析结果追加到 weeks
+    （同一课程可能有多个时间行）。返回节次列表，无法解析时返回 None，
+    此前已解析出的周次保留。
+    """
+    parts = time_val.split(" ")
+    if len(parts) != 2:
+        return None
+    weeks_part, periods_part = parts
+    try:
+        for w_range in weeks_part.replace("，", ",").split(","):
+            if "-" in w_range:
+                w_start, w_end = w_range.split("-", 1)
+                weeks.append([int(w_start), int(w_end)])
+            elif w_range.strip():
+                weeks.append([int(w_range)])
+        return [int(p) for p in periods_part.replace("，", ",").split(",") if p.strip()]
+    except ValueError:
+        return None
+
+
+def _parse_course_item(item) -> Course | None:
+    """
+    提取一个课程条目 (<li>)，没有课程详情或课程名称时返回 None。
+
+    对条目的文本只遍历一次，按行首关键字分派到各字段。
+    """
+    # 原始片段:
+    # <li>
+    #     <p>
+    #         <span class="class_span">3-4节<br /> </span>
+    #         软件技术基础(实验)
+    #         <br />
+    #         时间：15 3,4
+    #         <br />
+    #         地点：机房402(进贤综合楼-402)
+    #         <br />
+    #         教师：李四
+    #         <br />
+    #     </p>
+    # </li>
+    p = find_first(item, "p")
+    if p is None:
+        return None
+
+    # 节次快捷标签 (如: "3-4节") 不属于课程信息
+    period_span = find_first(p, "span", "class_span")
+    period_label = period_span.get_text(strip=True) if period_span else None
+
+    name = status = time = location = teacher = ""
+    weeks: list[list[int]] = []
+    periods: list[int] = []
+    found_name = False
+    for line in item.stripped_strings:
+        if line == period_label:
+            continue
+        # 时间行示例: "时间：19 3,4" (表示第19周，第3,4节)
+        if line.startswith("时间"):
+            time = _field_value(line)
+            if (parsed := _parse_time(time, weeks)) is not None:
+                periods = parsed
+        # 地点行示例: "地点：进贤2-212"
+        elif line.startswith("地点"):
+            location = _field_value(line)
+        # 教师行示例: "教师：张三"
+        elif line.startswith("教师"):
+            teacher = _field_value(line)
+        # 第一行其他文本为课程名称和考核状态，示例: "大学英语Ⅰ(考试)"
+        elif not found_name:
+            found_name = True
+            if match := _NAME_RE.search(line):
+                name = match.group(1).strip()
+                status = match.group(2).strip()
+            else:
+                name = line
+
+    if not name:
+        return None
+    return Course(
+        name=name,
+        status=status,
+        time=time,
+        location=location,
+        teacher=teacher,
+        weeks=weeks,
+        periods=periods,
+    )
+
+
+def _parse_courses(soup) -> list[Course]:
+    """
+    遍历课程列表容器中的课程条目。
+
+    原始片段:
+    <div class="top">
+        <div class="calendar">
+            <ul class="rl_info">
+                <li>...</li>
+                <li>...</li>
+            </ul>
+        </div>
+    </div>
+    """
+    calendar_div = find_first(soup, "div", "calendar")
+    if calendar_div is None:
+        return []
+    ul_list = find_first(calendar_div, "ul", "rl_info")
+    if ul_list is None:
+        return []
+    return [
+        course
+        for item in ul_list.find_all("li")
+        if (course := _parse_course_item(item)) is not None
+    ]
+
+
 def parse_course_schedule(html_content: str) -> CourseSchedule:
     """
     解析课程表 HTML。
@@ -49,169 +205,41 @@ def parse_course_schedule(html_content: str) -> CourseSchedule:
         raise ParseError("HTML 内容为空，无法解析")
 
     try:
-        soup = BeautifulSoup(html_content, "html.parser")
+        soup = make_soup(html_content)
 
         # 1. 提取日期和周次信息
-        # 原始片段:
-		# <div class="center">
-		# 	<p>
-		# 		2026-01-05 星期一（第19周）
-		# 	</p>
-		# </div>
-        date_div = soup.find("div", class_="center")
-        date_info = {"date": None, "day_of_week": None, "week_info": None}
-
-        if date_div and (p_tag := date_div.find("p")):
-            raw_date_str = p_tag.get_text(strip=True)
-            # 拆分日期 (2026-01-05) 和后续部分 (星期一（第19周）)
-            parts = raw_date_str.split(" ", 1)
-            if len(parts) >= 1:
-                date_info["date"] = parts[0]
-
-            if len(parts) >= 2:
-                rest = parts[1]
-                # 使用正则匹配星期和周次，支持 "星期一（第19周）" 或 "星期一(19)"
-                match = re.search(r"([^（(]+)[（(]第?(\d+)周[）)]", rest)
-                if match:
-                    date_info["day_of_week"] = match.group(1).strip()
-                    date_info["week_info"] = match.group(2)
-                else:
-                    date_info["day_of_week"] = rest.strip()
-
-        # 2. 遍历课程列表容器
-        # 原始片段:
-		# <div class="top">
-		# 	<div class="calendar">
-		# 		<ul class="rl_info">
-		# 				<li>
-		# 					<p>
-		# 						<span class="class_span">1-2节<br /> </span>
-		# 						C语言程序设计(上课)
-		# 						<br />
-		# 						时间：4-17 1,2
-		# 						<br />
-		# 						地点：进贤1-201
-		# 						<br />
-		# 						教师：张三
-		# 						<br />
-		# 					</p>
-		# 				</li>
-		# 				<li>
-		# 					<p>
-		# 						<span class="class_span">3-4节<br /> </span>
-		# 						软件技术基础(实验)
-		# 						<br />
-		# 						时间：15 3,4
-		# 						<br />
-		# 						地点：机房402(进贤综合楼-402)
-		# 						<br />
-		# 						教师：李四
-		# 						<br />
-		# 					</p>
-		# 				</li>
-		# 		</ul>
-		# 	</div>
-		# </div>
-        courses = []
-        calendar_div = soup.find("div", class_="calendar")
-        if calendar_div and (ul_list := calendar_div.find("ul", class_="rl_info")):
-            for item in ul_list.find_all("li"):
-                if not (p := item.find("p")):
-                    continue
-
-                course_info = {
-                    "name": "",
-                    "status": "",
-                    "time": "",
-                    "location": "",
-                    "teacher": "",
-                    "weeks": [],
-                    "periods": [],
-                }
-
-                def clean_val(line):
-                    return line.replace("：", ":").split(":", 1)[-1].strip()
-
-                # 获取所有文本行并清理空白
-                lines = [line.strip() for line in item.stripped_strings if line.strip()]
-                # 提取节次快捷标签 (如: "3-4节")
-                period_span = p.find("span", class_="class_span")
-                period_label = period_span.get_text(strip=True) if period_span else ""
-                lines = [line for line in lines if line != period_label]
-
-                found_name = False
-                for line in lines:
-                    # 2.1 提取时间并解析周次和节次
-                    # 原始行示例: "时间：19 3,4" (表示第19周，第3,4节)
-                    if line.startswith(("时间", "时间:")):
-                        time_val = clean_val(line)
-                        course_info["time"] = time_val
-                        try:
-                            t_parts = time_val.split(" ")
-                            if len(t_parts) == 2:
-                                # 解析周次范围，支持 "1-18" (Range) 或 "1,3,5" (List)
-                                weeks_part = t_parts[0].replace("，", ",")
-                                for w_range in weeks_part.split(","):
-                                    if "-" in w_range:
-                                        w_start, w_end = w_range.split("-", 1)
-                                        course_info["weeks"].append(
-                                            [int(w_start), int(w_end)]
-                                        )
-                                    elif w_range.strip():
-                                        course_info["weeks"].append([int(w_range)])
-
-                                # 解析具体节次 (如: "3,4")
-                                periods_part = t_parts[1].replace("，", ",")
-                                course_info["periods"] = [
-                                    int(p_p)
-                                    for p_p in periods_part.split(",")
-                                    if p_p.strip()
-                                ]
-                        except (ValueError, IndexError):
-                            pass
-                    # 2.2 提取地点 (原始行示例: "地点：进贤2-212")
-                    elif line.startswith(("地点", "地点:")):
-                        course_info["location"] = clean_val(line)
-                    # 2.3 提取教师 (原始行示例: "教师：张三")
-                    elif line.startswith(("教师", "教师:")):
-                        course_info["teacher"] = clean_val(line)
-                    # 2.4 提取课程名称和考核状态
-                    # 原始行示例: "大学英语Ⅰ(考试)"
-                    elif not found_name:
-                        match = re.search(r"(.+?)[（(]([^（()）]+)[)）]$", line)
-                        if match:
-                            course_info["name"] = match.group(1).strip()
-                            course_info["status"] = match.group(2).strip()
-                        else:
-                            course_info["name"] = line
-                        found_name = True
-
-                if course_info["name"]:
-                    courses.append(course_info)
-
-        return CourseSchedule(
-            date_info=DateInfo(**date_info) if date_info["date"] else None,
-            courses=[Course(**c) for c in courses],
-        )
+        date_info = None
+        date_div = find_first(soup, "div", "center")
+        if date_div is not None and (p_tag := find_first(date_div, "p")) is not None:
+            date_info = _parse_date_info(p_tag.get_text(strip=True))
+
+        # 2. 提取课程列表
+        return CourseSchedule(date_info=date_info, courses=_parse_courses(soup))
     except Exception as e:
-        logger.error(f"解析课程表 HTML 出错: {e}")
+        logger.error("解析课程表 HTML 出错: %s", e)
         raise ParseError(f"课程表解析失败: {str(e)}") from e
 
 
 if __name__ == "__main__":
     import asyncio
 
+    from ecjtu_wechat_api.utils.persistence import page_store
+
     async def main():
         # 本地调试运行逻辑
         target_date = "2026-01-05"
-        logger.info(f"正在从教务系统抓取 {target_date} 的课程表...")
+        logger.info("正在从教务系统抓取 %s 的课程表...", target_date)
         try:
             html_content = await fetch_course_schedule(settings.WEIXIN_ID, target_date)
             parsed_data = parse_course_schedule(html_content)
-            save_debug_data("courses", target_date, html_content, parsed_data)
+            page_store.save(
+                "courses", settings.WEIXIN_ID, target_date, html_content, parsed_data
+            )
             logger.info("解析成功，结果已保存。")
             print(json.dumps(parsed_data.model_dump(), indent=4, ensure_ascii=False))
         except Exception as e:
-            logger.error(f"运行失败: {e}")
+            logger.error("运行失败: %s", e)
+        finally:
+            page_store.close()
 
     asyncio.run(main())
@@ -4,16 +4,29 @@
 
 import json
 import re
+from collections.abc import AsyncGenerator
 from contextlib import suppress
-
-from bs4 import BeautifulSoup
+from datetime import date, datetime, time
 
 from ecjtu_wechat_api.core.config import settings
-from ecjtu_wechat_api.core.exceptions import ParseError
+from ecjtu_wechat_api.core.exceptions import ECJTUAPIError, ParseError
 from ecjtu_wechat_api.models.exam import ExamItem, ExamSchedule, ExamTermItem
-from ecjtu_wechat_api.utils.http import get_page
-from ecjtu_wechat_api.utils.logger import logger
-from ecjtu_wechat_api.utils.persistence import save_debug_data
+from ecjtu_wechat_api.utils.html import make_soup
+from ecjtu_wechat_api.utils.html_stream import (
+    IrregularMarkup,
+    Node,
+    StreamingHTMLParser,
+)
+from ecjtu_wechat_api.utils.logger import SAMPLED, logger
+
+# 考试时间文本，如 "2026年01月08日(星期四)14:00-16:00"
+_EXAM_TIME_RE = re.compile(
+    r"(?P<date>(?P<year>\d{4})年(?P<month>\d{2})月(?P<day>\d{2})日)"
+    r"\((?P<weekday>.*?)\)"
+    r"(?P<range>(?P<start>\d{2}:\d{2})-(?P<end>\d{2}:\d{2}))"
+)
+# 考试时间文本中的日期，用于时间段无法识别时单独提取日期
+_EXAM_DATE_RE = re.compile(r"(?P<year>\d{4})年(?P<month>\d{2})月(?P<day>\d{2})日")
 
 
 async def fetch_exam_schedule(weiXinID: str, term: str | None = None) -> str:
@@ -30,6 +43,9 @@ async def fetch_exam_schedule(weiXinID: str, term: str | None = None) -> str:
     Raises:
         EducationSystemError: 请求失败时抛出。
     """
+    # 抓取相关模块按需导入，只使用解析函数的脚本不会加载 httpx 及页面存储
+    from ecjtu_wechat_api.utils.http import get_page
+
     params = {
         "weiXinID": weiXinID,
     }
@@ -37,11 +53,172 @@ async def fetch_exam_schedule(weiXinID: str, term: str | None = None) -> str:
         params["term"] = term
 
     logger.info(
-        f"正在请求教务系统考试安排: weiXinID={weiXinID}, term={term or 'current'}"
+        "正在请求教务系统考试安排: weiXinID=%s, term=%s",
+        weiXinID,
+        term or "current",
+        extra=SAMPLED,
     )
     return await get_page(settings.EXAM_URL, params=params)
 
 
+def _parse_header(right_div) -> tuple[str, str]:
+    """提取学生姓名和当前查询学期。"""
+    spans = right_div.find_all("span")
+    if len(spans) >= 2:
+        return spans[0].get_text(strip=True), spans[1].get_text(strip=True)
+    return "", ""
+
+
+def _parse_terms(term_ul) -> list[ExamTermItem]:
+    """提取下拉菜单中的可选学期列表。"""
+    available_terms = []
+    for li in term_ul.find_all("li"):
+        a = li.find("a")
+        if a:
+            available_terms.append(
+                ExamTermItem(name=a.get_text(strip=True), url=a.get("href", ""))
+            )
+    return available_terms
+
+
+def _parse_exam_count(words_div) -> int:
+    """提取考试汇总数量。"""
+    if mark := words_div.find("mark"):
+        with suppress(ValueError):
+            return int(mark.get_text(strip=True))
+    return 0
+
+
+def _to_date(match: re.Match) -> date | None:
+    """由正则匹配到的年、月、日构造日期，日期不合法时返回 None。"""
+    try:
+        return date(int(match["year"]), int(match["month"]), int(match["day"]))
+    except ValueError:
+        return None
+
+
+def _to_datetime(day: date, hhmm: str) -> datetime | None:
+    """由日期和 "14:00" 形式的时间构造带时区的时间，时间不合法时返回 None。"""
+    try:
+        clock = time(int(hhmm[:2]), int(hhmm[3:]), tzinfo=settings.TIMEZONE)
+    except ValueError:
+        return None
+    return datetime.combine(day, clock)
+
+
+def _parse_exam_row(row) -> ExamItem | None:
+    """
+    提取一行考试安排 (<div class="row">)，不是考试安排行时返回 None。
+
+    row 可以是 BeautifulSoup 的 Tag，也可以是增量解析得到的 Node。
+    原始片段包含考试周次、时间（含红色备注 div）、地点、性质、班级、人数等。
+    """
+    text_div = row.find("div", class_="text")
+    if not text_div:
+        return None
+
+    # 1. 提取课程名称（来自 course div 中的 mark 标签）
+    # 原始片段: <div class="course"><mark>C语言程序设计</mark></div>
+    course_name = ""
+    course_div = row.find("div", class_="course")
+    if course_div and (mark := course_div.find("mark")):
+        course_name = mark.get_text(strip=True)
+
+    if not course_name:
+        return None
+
+    # 2. 提取各个字段（u 标签内为数据，span 标签内为数据）
+    # HTML 结构固定: 考试周次<u> 考试时间<u> 考试地点<u> 课程性质<span> ...
+    week = ""
+    location = ""
+    course_type = ""
+    class_name = ""
+    exam_count_num_str = ""
+    exam_date = ""
+    day_of_week = ""
+    time_range = ""
+    time_start = ""
+    time_end = ""
+    exam_day = None
+    starts_at = None
+    ends_at = None
+    note = ""
+
+    # 查找所有 u 和 span 标签，按顺序提取
+    u_tags = text_div.find_all("u")
+    span_tags = text_div.find_all("span")
+
+    # u_tags[0]: 考试周次, u_tags[1]: 考试时间, u_tags[2]: 考试地点
+    if len(u_tags) >= 1:
+        week = u_tags[0].get_text(strip=True)
+    if len(u_tags) >= 2:
+        time_u = u_tags[1]
+        # 提取红色提示文字（备注）
+        note_div = time_u.find("div")
+        if note_div:
+            note = note_div.get_text(strip=True)
+        # 提取纯文本时间部分（去除 div 标签）
+        time_parts = []
+        for content in time_u.contents:
+            if hasattr(content, "name") and content.name == "div":
+                continue
+            text_content = (
+                content.get_text(strip=True)
+                if hasattr(content, "get_text")
+                else str(content).strip()
+            )
+            if text_content:
+                time_parts.append(text_content)
+        time_text = "".join(time_parts)
+        # 使用预编译的正则拆分时间文本
+        # 模式: 2026年01月08日(星期四)14:00-16:00
+        if time_match := _EXAM_TIME_RE.search(time_text):
+            exam_date = time_match.group("date")
+            day_of_week = time_match.group("weekday")
+            time_range = time_match.group("range")
+            time_start = time_match.group("start")
+            time_end = time_match.group("end")
+            exam_day = _to_date(time_match)
+            if exam_day is not None:
+                starts_at = _to_datetime(exam_day, time_start)
+                ends_at = _to_datetime(exam_day, time_end)
+        else:
+            exam_date = time_text
+            if date_match := _EXAM_DATE_RE.search(time_text):
+                exam_day = _to_date(date_match)
+    if len(u_tags) >= 3:
+        location = u_tags[2].get_text(strip=True)
+
+    # span_tags[0]: 课程性质, span_tags[1]: 班级名称, span_tags[2]: 考试人数
+    if len(span_tags) >= 1:
+        course_type = span_tags[0].get_text(strip=True)
+    if len(span_tags) >= 2:
+        class_name = span_tags[1].get_text(strip=True)
+    if len(span_tags) >= 3:
+        exam_count_num_str = span_tags[2].get_text(strip=True)
+    exam_count_num = 0
+    with suppress(ValueError):
+        exam_count_num = int(exam_count_num_str)
+
+    return ExamItem(
+        course_name=course_name,
+        week=week,
+        exam_date=exam_date,
+        day_of_week=day_of_week,
+        time_range=time_range,
+        time_start=time_start,
+        time_end=time_end,
+        exam_day=exam_day,
+        starts_at=starts_at,
+        ends_at=ends_at,
+        location=location,
+        course_type=course_type,
+        class_name=class_name,
+        exam_count_num=exam_count_num,
+        note=note,
+    )
+
+
 def parse_exam_schedule(html_content: str) -> ExamSchedule:
     """
     解析考试安排页面 HTML。
@@ -53,142 +230,28 @@ def parse_exam_schedule(html_content: str) -> ExamSchedule:
         raise ParseError("HTML 内容为空，无法解析")
 
     try:
-        soup = BeautifulSoup(html_content, "html.parser")
+        soup = make_soup(html_content)
 
         # 1. 提取学生姓名和当前查询学期
-        right_div = soup.find("div", class_="right")
-        student_name = ""
-        current_term = ""
-        if right_div:
-            spans = right_div.find_all("span")
-            if len(spans) >= 2:
-                student_name = spans[0].get_text(strip=True)
-                current_term = spans[1].get_text(strip=True)
+        student_name, current_term = "", ""
+        if right_div := soup.find("div", class_="right"):
+            student_name, current_term = _parse_header(right_div)
 
         # 2. 提取下拉菜单中的可选学期列表
         available_terms = []
-        term_ul = soup.find("ul", class_="dropdown-menu")
-        if term_ul:
-            for li in term_ul.find_all("li"):
-                a = li.find("a")
-                if a:
-                    available_terms.append(
-                        ExamTermItem(name=a.get_text(strip=True), url=a.get("href", ""))
-                    )
+        if term_ul := soup.find("ul", class_="dropdown-menu"):
+            available_terms = _parse_terms(term_ul)
 
         # 3. 提取考试汇总数量
         exam_count = 0
-        words_div = soup.find("div", class_="words")
-        if words_div and (mark := words_div.find("mark")):
-            with suppress(ValueError):
-                exam_count = int(mark.get_text(strip=True))
+        if words_div := soup.find("div", class_="words"):
+            exam_count = _parse_exam_count(words_div)
 
         # 4. 遍历并提取具体考试安排 (<div class="row">)
-        # 原始片段包含考试周次、时间（含红色备注 div）、地点、性质、班级、人数等
         exams = []
         for row in soup.find_all("div", class_="row"):
-            text_div = row.find("div", class_="text")
-            if not text_div:
-                continue
-
-            # 4.1 提取课程名称（来自 course div 中的 mark 标签）
-            # 原始片段: <div class="course"><mark>C语言程序设计</mark></div>
-            course_name = ""
-            course_div = row.find("div", class_="course")
-            if course_div and (mark := course_div.find("mark")):
-                course_name = mark.get_text(strip=True)
-
-            if not course_name:
-                continue
-
-            # 4.2 提取各个字段（u 标签内为数据，span 标签内为数据）
-            # HTML 结构固定: 考试周次<u> 考试时间<u> 考试地点<u> 课程性质<span> ...
-            week = ""
-            location = ""
-            course_type = ""
-            class_name = ""
-            exam_count_num_str = ""
-            exam_date = ""
-            day_of_week = ""
-            time_range = ""
-            time_start = ""
-            time_end = ""
-            note = ""
-
-            # 查找所有 u 和 span 标签，按顺序提取
-            u_tags = text_div.find_all("u")
-            span_tags = text_div.find_all("span")
-
-            # u_tags[0]: 考试周次, u_tags[1]: 考试时间, u_tags[2]: 考试地点
-            if len(u_tags) >= 1:
-                week = u_tags[0].get_text(strip=True)
-            if len(u_tags) >= 2:
-                time_u = u_tags[1]
-                # 提取红色提示文字（备注）
-                note_div = time_u.find("div")
-                if note_div:
-                    note = note_div.get_text(strip=True)
-                # 提取纯文本时间部分（去除 div 标签）
-                time_parts = []
-                for content in time_u.contents:
-                    if hasattr(content, "name") and content.name == "div":
-                        continue
-                    text_content = (
-                        content.get_text(strip=True)
-                        if hasattr(content, "get_text")
-                        else str(content).strip()
-                    )
-                    if text_content:
-                        time_parts.append(text_content)
-                time_text = "".join(time_parts)
-                # 使用正则拆分时间文本
-                # 模式: 2026年01月08日(星期四)14:00-16:00
-                time_pattern = (
-                    r"(\d{4}年\d{2}月\d{2}日)\((.*?)\)(\d{2}:\d{2}-\d{2}:\d{2})"
-                )
-                time_match = re.search(time_pattern, time_text)
-                if time_match:
-                    exam_date = time_match.group(1)
-                    day_of_week = time_match.group(2)
-                    time_range = time_match.group(3)
-                    # 拆分开始和结束时间
-                    if "-" in time_range:
-                        time_start, time_end = time_range.split("-", 1)
-                    else:
-                        time_start, time_end = "", ""
-                else:
-                    exam_date = time_text
-                    time_start, time_end = "", ""
-            if len(u_tags) >= 3:
-                location = u_tags[2].get_text(strip=True)
-
-            # span_tags[0]: 课程性质, span_tags[1]: 班级名称, span_tags[2]: 考试人数
-            if len(span_tags) >= 1:
-                course_type = span_tags[0].get_text(strip=True)
-            if len(span_tags) >= 2:
-                class_name = span_tags[1].get_text(strip=True)
-            if len(span_tags) >= 3:
-                exam_count_num_str = span_tags[2].get_text(strip=True)
-            exam_count_num = 0
-            with suppress(ValueError):
-                exam_count_num = int(exam_count_num_str)
-
-            exams.append(
-                ExamItem(
-                    course_name=course_name,
-                    week=week,
-                    exam_date=exam_date,
-                    day_of_week=day_of_week,
-                    time_range=time_range,
-                    time_start=time_start,
-                    time_end=time_end,
-                    location=location,
-                    course_type=course_type,
-                    class_name=class_name,
-                    exam_count_num=exam_count_num,
-                    note=note,
-                )
-            )
+            if item := _parse_exam_row(row):
+                exams.append(item)
 
         return ExamSchedule(
             student_name=student_name,
@@ -198,13 +261,134 @@ def parse_exam_schedule(html_content: str) -> ExamSchedule:
             exams=exams,
         )
     except Exception as e:
-        logger.error(f"解析考试安排 HTML 出错: {e}")
+        logger.error("解析考试安排 HTML 出错: %s", e)
         raise ParseError(f"考试安排解析失败: {str(e)}") from e
 
 
+class ExamStreamParser(StreamingHTMLParser):
+    """
+    考试安排页面的增量解析器，每行考试安排在其 </div> 到达时即被提取。
+
+    依次 feed 响应分块后调用 result()。结构规范的页面结果与 parse_exam_schedule
+    相同；结构不规范（标签未闭合、错位等）时 result() 抛出 IrregularMarkup，
+    需改用 parse_exam_schedule 解析。
+    """
+
+    _SECTIONS = (("div", "right"), ("ul", "dropdown-menu"), ("div", "words"))
+
+    def __init__(self):
+        super().__init__()
+        self._fed = False
+        self._seen: set[str] = set()
+        self.student_name = ""
+        self.current_term = ""
+        self.available_terms: list[ExamTermItem] = []
+        self.exam_count = 0
+        self.exams: list[ExamItem] = []
+
+    def feed(self, data: str) -> None:
+        self._fed = self._fed or bool(data)
+        super().feed(data)
+
+    def capture(self, tag: str, classes: list[str]) -> bool:
+        if tag == "div" and "row" in classes:
+            return True
+        # 与 soup.find 一致，页头各部分只取第一个
+        return any(
+            tag == t and cls in classes and cls not in self._seen
+            for t, cls in self._SECTIONS
+        )
+
+    def on_element(self, node: Node) -> None:
+        if node.tag == "div" and "row" in node.classes:
+            if item := _parse_exam_row(node):
+                self.exams.append(item)
+            return
+        for _, cls in self._SECTIONS:
+            if cls in node.classes and cls not in self._seen:
+                self._seen.add(cls)
+                if cls == "right":
+                    self.student_name, self.current_term = _parse_header(node)
+                elif cls == "dropdown-menu":
+                    self.available_terms = _parse_terms(node)
+                else:
+                    self.exam_count = _parse_exam_count(node)
+                return
+
+    def result(self) -> ExamSchedule:
+        """结束解析并返回结果。"""
+        self.close()
+        if not self._fed:
+            raise ParseError("HTML 内容为空，无法解析")
+        if self.irregular:
+            raise IrregularMarkup("页面结构不规范")
+        return ExamSchedule(
+            student_name=self.student_name,
+            current_term=self.current_term,
+            available_terms=self.available_terms,
+            exam_count=self.exam_count,
+            exams=self.exams,
+        )
+
+
+async def stream_exam_schedule(
+    weiXinID: str, term: str | None = None, keep_html: bool = False
+) -> tuple[str | None, ExamSchedule]:
+    """
+    以流式方式获取并解析考试安排页面，边下载边提取考试安排行。
+
+    Args:
+        weiXinID: 微信用户的唯一标识符。
+        term: 查询的学期，如 "2025.1"。如果为 None，则获取当前学期。
+        keep_html: 是否同时返回原始 HTML（用于写入页面存储）。
+
+    Returns:
+        (原始 HTML 或 None, 解析结果)
+
+    Raises:
+        EducationSystemError: 请求失败时抛出。
+        ParseError: 解析失败时抛出。
+    """
+    from ecjtu_wechat_api.utils.executor import parse_pool
+    from ecjtu_wechat_api.utils.http import NotModified, stream_page
+
+    params = {"weiXinID": weiXinID}
+    if term:
+        params["term"] = term
+
+    logger.info(
+        "正在流式请求教务系统考试安排: weiXinID=%s, term=%s",
+        weiXinID,
+        term or "current",
+        extra=SAMPLED,
+    )
+    chunks: list[str] = []
+
+    async def download() -> AsyncGenerator[str, None]:
+        async for chunk in stream_page(settings.EXAM_URL, params=params):
+            # 结构不规范时需要用完整 HTML 重新解析，因此始终保留分块
+            chunks.append(chunk)
+            yield chunk
+
+    try:
+        # 增量解析在工作池中进行，不阻塞事件循环
+        result = await parse_pool.parse_stream(ExamStreamParser(), download())
+    except IrregularMarkup:
+        logger.info("考试安排页面结构不规范，改用完整解析: weiXinID=%s", weiXinID)
+        result = await parse_pool.run(parse_exam_schedule, "".join(chunks))
+    except (ECJTUAPIError, NotModified):
+        raise
+    except Exception as e:
+        logger.error("解析考试安排 HTML 出错: %s", e)
+        raise ParseError(f"考试安排解析失败: {str(e)}") from e
+    return ("".join(chunks) if keep_html else None), result
+
+
 if __name__ == "__main__":
     import asyncio
 
+    from ecjtu_wechat_api.utils.persistence import page_store
+
     async def main():
         # 本地调试运行逻辑
         logger.info("正在从教务系统抓取考试安排...")
@@ -212,15 +396,18 @@ if __name__ == "__main__":
             html_content = await fetch_exam_schedule(settings.WEIXIN_ID)
             parsed_data = parse_exam_schedule(html_content)
             # 保存到本地归档
-            save_debug_data(
+            page_store.save(
                 "exams",
-                f"{parsed_data.student_name}_{parsed_data.current_term}",
+                settings.WEIXIN_ID,
+                parsed_data.current_term,
                 html_content,
                 parsed_data,
             )
             logger.info("解析成功，结果已保存。")
             print(json.dumps(parsed_data.model_dump(), indent=4, ensure_ascii=False))
         except Exception as e:
-            logger.error(f"运行失败: {e}")
+            logger.error("运行失败: %s", e)
+        finally:
+            page_store.close()
 
     asyncio.run(main())
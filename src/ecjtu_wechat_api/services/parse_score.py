@@ -4,16 +4,29 @@
 
 import json
 import re
+from collections.abc import AsyncGenerator
 from contextlib import suppress
 
-from bs4 import BeautifulSoup
-
 from ecjtu_wechat_api.core.config import settings
-from ecjtu_wechat_api.core.exceptions import ParseError
+from ecjtu_wechat_api.core.exceptions import ECJTUAPIError, ParseError
 from ecjtu_wechat_api.models.score import ScoreItem, StudentScoreInfo, TermItem
-from ecjtu_wechat_api.utils.http import get_page
-from ecjtu_wechat_api.utils.logger import logger
-from ecjtu_wechat_api.utils.persistence import save_debug_data
+from ecjtu_wechat_api.utils.html import make_soup
+from ecjtu_wechat_api.utils.html_stream import (
+    IrregularMarkup,
+    Node,
+    StreamingHTMLParser,
+)
+from ecjtu_wechat_api.utils.logger import SAMPLED, logger
+
+# 课程信息文本（如 "【主修】【1500190200】军事技能(学分:1.0)"）中的学分
+_CREDIT_RE = re.compile(r"\(学分:([\d.]+)\)")
+# 修读类型、代码和名称: 匹配 【类型】【代码】名称
+_COURSE_RE = re.compile(r"【(.*?)】【(.*?)】(.*?)(?:\(|$)")
+
+# 成绩行内各字段所在的区域，遍历时按位记录当前元素位于哪些区域中
+_IN_TEXT = 1  # <div class="text">，课程信息与成绩
+_IN_GRADE = 2  # <div class="grade">，位于 text 内
+_IN_TYPE = 4  # <div class="type">，课程性质
 
 
 async def fetch_score_info(weiXinID: str, term: str | None = None) -> str:
@@ -30,16 +43,222 @@ async def fetch_score_info(weiXinID: str, term: str | None = None) -> str:
     Raises:
         EducationSystemError: 请求失败时抛出。
     """
+    # 抓取相关模块按需导入，只使用解析函数的脚本不会加载 httpx 及页面存储
+    from ecjtu_wechat_api.utils.http import get_page
+
     params = {
         "weiXinID": weiXinID,
     }
     if term:
         params["term"] = term
 
-    logger.info(f"正在请求教务系统成绩: weiXinID={weiXinID}, term={term or 'current'}")
+    logger.info(
+        "正在请求教务系统成绩: weiXinID=%s, term=%s",
+        weiXinID,
+        term or "current",
+        extra=SAMPLED,
+    )
     return await get_page(settings.SCORE_URL, params=params)
 
 
+def _parse_header(right_div) -> tuple[str, str]:
+    """
+    提取学生姓名和当前查询学期。
+
+    原始片段:
+    <div class="right">
+        姓名:
+        <span>张三</span>
+        <br />
+        当前学期:
+        <span>2025.1</span>
+    </div>
+    """
+    spans = right_div.find_all("span")
+    if len(spans) >= 2:
+        return spans[0].get_text(strip=True), spans[1].get_text(strip=True)
+    return "", ""
+
+
+def _parse_terms(term_ul) -> list[TermItem]:
+    """
+    提取下拉菜单中的可选学期列表。
+
+    原始片段:
+    <ul class="dropdown-menu dropdown-menu-left btn-block" role="menu"
+        aria-labelledby="dropwownmenu1">
+            <li>
+                <a
+                    href="/weixin/ScoreQuery?weiXinID=xxx&term=2025.1"
+                    role="menuitem">2025.1</a>
+            </li>
+    </ul>
+    """
+    available_terms = []
+    for li in term_ul.find_all("li"):
+        a = li.find("a")
+        if a:
+            available_terms.append(
+                TermItem(name=a.get_text(strip=True), url=a.get("href", ""))
+            )
+    return available_terms
+
+
+def _parse_score_count(words_div) -> int:
+    """
+    提取成绩汇总数量。
+
+    原始片段:
+    <div class="words">
+        您好！本学期当前你共有
+        <strong>13</strong>门考试成绩。
+    </div>
+    """
+    if strong := words_div.find("strong"):
+        with suppress(ValueError):
+            return int(strong.get_text(strip=True))
+    return 0
+
+
+def _classes(element) -> list[str]:
+    """元素的 class 列表（Tag 返回列表，Node 返回字符串）。"""
+    classes = element.get("class") or []
+    return classes.split() if isinstance(classes, str) else classes
+
+
+def _parse_course_text(
+    raw_course_text: str,
+) -> tuple[str, str | None, str | None, float]:
+    """
+    解析课程信息文本，返回 (课程名称, 课程代码, 修读类型, 学分)。
+
+    格式示例: "【主修】【1500190200】军事技能(学分:1.0)"
+    """
+    credit = 0.0
+    if credit_match := _CREDIT_RE.search(raw_course_text):
+        with suppress(ValueError):
+            credit = float(credit_match.group(1))
+
+    if name_match := _COURSE_RE.search(raw_course_text):
+        major, course_code, course_name = name_match.groups()
+        return course_name.strip(), course_code, major, credit
+    return raw_course_text, None, None, credit
+
+
+def _parse_score_row(row) -> ScoreItem | None:
+    """
+    提取一行课程成绩 (<div class="row">)，不是成绩行时返回 None。
+
+    row 可以是 BeautifulSoup 的 Tag，也可以是增量解析得到的 Node。
+    只遍历一次行内元素：课程信息和成绩取第一个 div.text 中的 span.course
+    和 div.grade 内的 span.score，课程性质取第一个 div.type 中的 mark。
+    """
+    # 原始片段:
+    # <div class="row ">
+    # 	<div class="col-xs-12">
+    # 		<div class="text">
+    # 			<span class="course">【主修】【1500190200】军事技能(学分:1.0)</span>
+    # 			<div class="grade">
+    # 				期末成绩:
+    # 				<span class="score">合格</span>
+    # 				<br />
+    # 				重考成绩:
+    # 				<span class="score"></span>
+    # 				<br />
+    # 				重修成绩:
+    # 				<span class="score"></span>
+    # 				<br />
+    # 				<span class="flag">主修</span>
+    # 			</div>
+    # 		</div>
+    # 		<div class="img">
+    # 			<img src="/weixin/imgs/myschedule/dian.png;jsessionid=xxx">
+    # 		</div>
+    # 		<div class="type">
+    # 			<span class="require"><mark>必修课</mark> </span>
+    # 		</div>
+    # 	</div>
+    # </div>
+    seen = 0  # 已经进入过的区域，每种区域只取第一个
+    course_span = None
+    # 页面通常按顺序排列: 0:期末, 1:重考, 2:重修
+    score_spans = []
+    mark = None
+
+    # 深度优先、按文档顺序遍历，栈中为 (元素, 所在区域)
+    stack = [(child, 0) for child in reversed(row.contents)]
+    while stack:
+        element, scope = stack.pop()
+        name = getattr(element, "name", None)
+        if name is None:  # 文本节点
+            continue
+        if name == "div":
+            classes = _classes(element)
+            # div.grade 须位于 div.text 内部，按进入该元素之前的区域判断
+            if "grade" in classes and scope & _IN_TEXT and not seen & _IN_GRADE:
+                seen |= _IN_GRADE
+                scope |= _IN_GRADE
+            if "text" in classes and not seen & _IN_TEXT:
+                seen |= _IN_TEXT
+                scope |= _IN_TEXT
+            if "type" in classes and not seen & _IN_TYPE:
+                seen |= _IN_TYPE
+                scope |= _IN_TYPE
+        elif name == "span" and scope & _IN_TEXT:
+            classes = _classes(element)
+            if "course" in classes and course_span is None:
+                course_span = element
+            if "score" in classes and scope & _IN_GRADE:
+                score_spans.append(element)
+        elif name == "mark" and scope & _IN_TYPE and mark is None:
+            mark = element
+        stack.extend((child, scope) for child in reversed(element.contents))
+
+    if not seen & _IN_TEXT or course_span is None:
+        return None
+
+    course_name, course_code, major, credit = _parse_course_text(
+        course_span.get_text(strip=True)
+    )
+    texts = [span.get_text(strip=True) for span in score_spans[:3]]
+    texts += [""] * (3 - len(texts))
+    return ScoreItem(
+        course_name=course_name,
+        course_code=course_code,
+        final_score=texts[0],
+        reexam_score=texts[1] or None,
+        retake_score=texts[2] or None,
+        course_type=mark.get_text(strip=True) if mark is not None else "",
+        credit=credit,
+        major=major,
+    )
+
+
+def _scan_document(soup):
+    """
+    一次遍历文档，返回页头各部分（各取第一个）及所有成绩行。
+
+    Returns:
+        (div.right, ul.dropdown-menu, div.words, [div.row])
+    """
+    right_div = term_ul = words_div = None
+    rows = []
+    for element in soup.descendants:
+        name = element.name
+        if name == "div":
+            classes = element.get("class") or ()
+            if "row" in classes:
+                rows.append(element)
+            if right_div is None and "right" in classes:
+                right_div = element
+            if words_div is None and "words" in classes:
+                words_div = element
+        elif name == "ul" and term_ul is None:
+            if "dropdown-menu" in (element.get("class") or ()):
+                term_ul = element
+    return right_div, term_ul, words_div, rows
+
+
 def parse_score_info(html_content: str) -> StudentScoreInfo:
     """
     解析成绩页面 HTML。
@@ -51,160 +270,27 @@ def parse_score_info(html_content: str) -> StudentScoreInfo:
         raise ParseError("HTML 内容为空，无法解析")
 
     try:
-        soup = BeautifulSoup(html_content, "html.parser")
+        soup = make_soup(html_content)
+
+        right_div, term_ul, words_div, rows = _scan_document(soup)
 
         # 1. 提取学生姓名和当前查询学期
-        # 原始片段:
-        # <div class="right">
-        #     姓名:
-        #     <span>张三</span>
-        #     <br />
-        #     当前学期:
-        #     <span>2025.1</span>
-        # </div>
-        right_div = soup.find("div", class_="right")
-        student_name = ""
-        current_term = ""
-        if right_div:
-            spans = right_div.find_all("span")
-            if len(spans) >= 2:
-                student_name = spans[0].get_text(strip=True)
-                current_term = spans[1].get_text(strip=True)
+        student_name, current_term = "", ""
+        if right_div is not None:
+            student_name, current_term = _parse_header(right_div)
 
         # 2. 提取下拉菜单中的可选学期列表
-        # 原始片段:
-        # <ul class="dropdown-menu dropdown-menu-left btn-block" role="menu"
-        # 	aria-labelledby="dropwownmenu1">
-        #         <li>
-        #             <a
-        #                 href="/weixin/ScoreQuery?weiXinID=xxx&term=2025.1"
-        #                 role="menuitem">2025.1</a>
-        #         </li>
-        # </ul>
         available_terms = []
-        term_ul = soup.find("ul", class_="dropdown-menu")
-        if term_ul:
-            for li in term_ul.find_all("li"):
-                a = li.find("a")
-                if a:
-                    available_terms.append(
-                        TermItem(name=a.get_text(strip=True), url=a.get("href", ""))
-                    )
+        if term_ul is not None:
+            available_terms = _parse_terms(term_ul)
 
         # 3. 提取成绩汇总数量
-        # 原始片段:
-        # <div class="words">
-        # 	您好！本学期当前你共有
-        # 	<strong>13</strong>门考试成绩。
-        # </div>
         score_count = 0
-        words_div = soup.find("div", class_="words")
-        if words_div and (strong := words_div.find("strong")):
-            with suppress(ValueError):
-                score_count = int(strong.get_text(strip=True))
-
-        # 4. 遍历并提取具体课程成绩 (<div class="row">)
-        # 原始片段:
-        # <div class="row ">
-        # 	<div class="col-xs-12">
-        # 		<div class="text">
-        # 			<span class="course">【主修】【1500190200】军事技能(学分:1.0)</span>
-        # 			<div class="grade">
-        # 				期末成绩:
-        # 				<span class="score">合格</span>
-        # 				<br />
-        # 				重考成绩:
-        # 				<span class="score"></span>
-        # 				<br />
-        # 				重修成绩:
-        # 				<span class="score"></span>
-        # 				<br />
-        # 				<span class="flag">主修</span>
-        # 			</div>
-        # 		</div>
-        # 		<div class="img">
-        # 			<img src="/weixin/imgs/myschedule/dian.png;jsessionid=xxx">
-        # 		</div>
-        # 		<div class="type">
-        # 			<span class="require"><mark>必修课</mark> </span>
-        # 		</div>
-        # 	</div>
-        # </div>
-        scores = []
-        for row in soup.find_all("div", class_="row"):
-            text_div = row.find("div", class_="text")
-            if not text_div:
-                continue
-
-            # 4.1 提取原始课程信息文本
-            # 格式示例: "【主修】【1500190200】军事技能(学分:1.0)"
-            course_span = text_div.find("span", class_="course")
-            if not course_span:
-                continue
-
-            raw_course_text = course_span.get_text(strip=True)
-            # 提取学分 (如: 1.0)
-            credit = 0.0
-            credit_match = re.search(r"\(学分:([\d.]+)\)", raw_course_text)
-            if credit_match:
-                with suppress(ValueError):
-                    credit = float(credit_match.group(1))
-
-            # 使用正则解析课程修读类型、代码和名称
-            # 模式解释: 匹配 【类型】【代码】名称
-            name_match = re.search(r"【(.*?)】【(.*?)】(.*?)(?:\(|$)", raw_course_text)
-            major = name_match.group(1) if name_match else None
-            course_code = name_match.group(2) if name_match else None
-            course_name = name_match.group(3).strip() if name_match else raw_course_text
-
-            # 4.2 提取各项具体成绩
-            # 原始片段:
-            # 			<div class="grade">
-            # 				期末成绩:
-            # 				<span class="score">合格</span>
-            # 				<br />
-            # 				重考成绩:
-            # 				<span class="score"></span>
-            # 				<br />
-            # 				重修成绩:
-            # 				<span class="score"></span>
-            # 				<br />
-            # 				<span class="flag">主修</span>
-            # 			</div>
-            grade_div = text_div.find("div", class_="grade")
-            final_score = ""
-            reexam_score = None
-            retake_score = None
-            if grade_div:
-                score_spans = grade_div.find_all("span", class_="score")
-                # 页面通常按顺序排列: 0:期末, 1:重考, 2:重修
-                if len(score_spans) >= 1:
-                    final_score = score_spans[0].get_text(strip=True)
-                if len(score_spans) >= 2:
-                    reexam_score = score_spans[1].get_text(strip=True) or None
-                if len(score_spans) >= 3:
-                    retake_score = score_spans[2].get_text(strip=True) or None
-
-            # 4.3 提取课程性质 (如: 必修课, 选修课)
-            # 原始片段:
-            # <div class="type"><span class="require"><mark>必修课</mark></span></div>
-            course_type = ""
-            type_div = row.find("div", class_="type")
-            if type_div and (mark := type_div.find("mark")):
-                course_type = mark.get_text(strip=True)
-
-            scores.append(
-                ScoreItem(
-                    course_name=course_name,
-                    course_code=course_code,
-                    final_score=final_score,
-                    reexam_score=reexam_score,
-                    retake_score=retake_score,
-                    course_type=course_type,
-                    credit=credit,
-                    major=major,
-                )
-            )
+        if words_div is not None:
+            score_count = _parse_score_count(words_div)
+
+        # 4. 提取具体课程成绩 (<div class="row">)
+        scores = [item for row in rows if (item := _parse_score_row(row))]
 
         return StudentScoreInfo(
             student_name=student_name,
@@ -214,13 +300,134 @@ def parse_score_info(html_content: str) -> StudentScoreInfo:
             scores=scores,
         )
     except Exception as e:
-        logger.error(f"解析成绩 HTML 出错: {e}")
+        logger.error("解析成绩 HTML 出错: %s", e)
         raise ParseError(f"成绩解析失败: {str(e)}") from e
 
 
+class ScoreStreamParser(StreamingHTMLParser):
+    """
+    成绩页面的增量解析器，每行成绩在其 </div> 到达时即被提取。
+
+    依次 feed 响应分块后调用 result()。结构规范的页面结果与 parse_score_info
+    相同；结构不规范（标签未闭合、错位等）时 result() 抛出 IrregularMarkup，
+    需改用 parse_score_info 解析。
+    """
+
+    _SECTIONS = (("div", "right"), ("ul", "dropdown-menu"), ("div", "words"))
+
+    def __init__(self):
+        super().__init__()
+        self._fed = False
+        self._seen: set[str] = set()
+        self.student_name = ""
+        self.current_term = ""
+        self.available_terms: list[TermItem] = []
+        self.score_count = 0
+        self.scores: list[ScoreItem] = []
+
+    def feed(self, data: str) -> None:
+        self._fed = self._fed or bool(data)
+        super().feed(data)
+
+    def capture(self, tag: str, classes: list[str]) -> bool:
+        if tag == "div" and "row" in classes:
+            return True
+        # 与 soup.find 一致，页头各部分只取第一个
+        return any(
+            tag == t and cls in classes and cls not in self._seen
+            for t, cls in self._SECTIONS
+        )
+
+    def on_element(self, node: Node) -> None:
+        if node.tag == "div" and "row" in node.classes:
+            if item := _parse_score_row(node):
+                self.scores.append(item)
+            return
+        for _, cls in self._SECTIONS:
+            if cls in node.classes and cls not in self._seen:
+                self._seen.add(cls)
+                if cls == "right":
+                    self.student_name, self.current_term = _parse_header(node)
+                elif cls == "dropdown-menu":
+                    self.available_terms = _parse_terms(node)
+                else:
+                    self.score_count = _parse_score_count(node)
+                return
+
+    def result(self) -> StudentScoreInfo:
+        """结束解析并返回结果。"""
+        self.close()
+        if not self._fed:
+            raise ParseError("HTML 内容为空，无法解析")
+        if self.irregular:
+            raise IrregularMarkup("页面结构不规范")
+        return StudentScoreInfo(
+            student_name=self.student_name,
+            current_term=self.current_term,
+            available_terms=self.available_terms,
+            score_count=self.score_count,
+            scores=self.scores,
+        )
+
+
+async def stream_score_info(
+    weiXinID: str, term: str | None = None, keep_html: bool = False
+) -> tuple[str | None, StudentScoreInfo]:
+    """
+    以流式方式获取并解析成绩页面，边下载边提取成绩行。
+
+    Args:
+        weiXinID: 微信用户的唯一标识符。
+        term: 查询的学期，如 "2025.1"。如果为 None，则获取当前学期。
+        keep_html: 是否同时返回原始 HTML（用于写入页面存储）。
+
+    Returns:
+        (原始 HTML 或 None, 解析结果)
+
+    Raises:
+        EducationSystemError: 请求失败时抛出。
+        ParseError: 解析失败时抛出。
+    """
+    from ecjtu_wechat_api.utils.executor import parse_pool
+    from ecjtu_wechat_api.utils.http import NotModified, stream_page
+
+    params = {"weiXinID": weiXinID}
+    if term:
+        params["term"] = term
+
+    logger.info(
+        "正在流式请求教务系统成绩: weiXinID=%s, term=%s",
+        weiXinID,
+        term or "current",
+        extra=SAMPLED,
+    )
+    chunks: list[str] = []
+
+    async def download() -> AsyncGenerator[str, None]:
+        async for chunk in stream_page(settings.SCORE_URL, params=params):
+            # 结构不规范时需要用完整 HTML 重新解析，因此始终保留分块
+            chunks.append(chunk)
+            yield chunk
+
+    try:
+        # 增量解析在工作池中进行，不阻塞事件循环
+        result = await parse_pool.parse_stream(ScoreStreamParser(), download())
+    except IrregularMarkup:
+        logger.info("成绩页面结构不规范，改用完整解析: weiXinID=%s", weiXinID)
+        result = await parse_pool.run(parse_score_info, "".join(chunks))
+    except (ECJTUAPIError, NotModified):
+        raise
+    except Exception as e:
+        logger.error("解析成绩 HTML 出错: %s", e)
+        raise ParseError(f"成绩解析失败: {str(e)}") from e
+    return ("".join(chunks) if keep_html else None), result
+
+
 if __name__ == "__main__":
     import asyncio
 
+    from ecjtu_wechat_api.utils.persistence import page_store
+
     async def main():
         # 本地调试运行逻辑
         logger.info("正在从教务系统抓取成绩...")
@@ -228,15 +435,18 @@ if __name__ == "__main__":
             html_content = await fetch_score_info(settings.WEIXIN_ID)
             parsed_data = parse_score_info(html_content)
             # 保存到本地归档
-            save_debug_data(
+            page_store.save(
                 "scores",
-                f"{parsed_data.student_name}_{parsed_data.current_term}",
+                settings.WEIXIN_ID,
+                parsed_data.current_term,
                 html_content,
                 parsed_data,
             )
             logger.info("解析成功，结果已保存。")
             print(json.dumps(parsed_data.model_dump(), indent=4, ensure_ascii=False))
         except Exception as e:
-            logger.error(f"运行失败: {e}")
+            logger.error("运行失败: %s", e)
+        finally:
+            page_store.close()
 
     asyncio.run(main())
@@ -0,0 +1,118 @@
+"""
+多学期成绩汇总与绩点计算
+"""
+
+from ecjtu_wechat_api.models.score import (
+    AllScoresInfo,
+    ScoreItem,
+    StudentScoreInfo,
+    TermScoreItem,
+    TermScoreSummary,
+)
+
+# 五级制成绩对应的绩点
+LEVEL_GRADE_POINTS = {
+    "优秀": 4.5,
+    "良好": 3.5,
+    "中等": 2.5,
+    "及格": 1.5,
+    "不及格": 0.0,
+}
+
+
+def grade_point(score: str | None) -> float | None:
+    """
+    将单个成绩换算为绩点。
+
+    百分制成绩按 (分数 - 50) / 10 计算，60 分以下为 0；五级制按
+    LEVEL_GRADE_POINTS 换算；合格/不合格等两级制成绩及空成绩不计入绩点，返回 None。
+    """
+    if not score:
+        return None
+    score = score.strip()
+    if score in LEVEL_GRADE_POINTS:
+        return LEVEL_GRADE_POINTS[score]
+    try:
+        value = float(score)
+    except ValueError:
+        return None
+    if value < 60:
+        return 0.0
+    return round((value - 50) / 10, 2)
+
+
+def best_grade_point(item: ScoreItem) -> float | None:
+    """取期末、重考、重修成绩中最高的绩点。"""
+    points = [
+        p
+        for p in (
+            grade_point(item.final_score),
+            grade_point(item.reexam_score),
+            grade_point(item.retake_score),
+        )
+        if p is not None
+    ]
+    return max(points) if points else None
+
+
+def weighted_gpa(items: list[ScoreItem]) -> float | None:
+    """按学分加权计算平均绩点，没有可计入绩点的课程时返回 None。"""
+    total_points = 0.0
+    total_credit = 0.0
+    for item in items:
+        point = best_grade_point(item)
+        if point is None or item.credit <= 0:
+            continue
+        total_points += point * item.credit
+        total_credit += item.credit
+    if not total_credit:
+        return None
+    return round(total_points / total_credit, 2)
+
+
+def _course_key(item: ScoreItem) -> str:
+    return item.course_code or item.course_name
+
+
+def merge_term_scores(
+    student_name: str, term_infos: list[tuple[str, StudentScoreInfo]]
+) -> AllScoresInfo:
+    """
+    合并多个学期的成绩。
+
+    各学期统计基于该学期页面的全部成绩；汇总列表按课程代码（无代码时按名称）
+    去重，同一课程出现在多个学期（如重修）时保留绩点最高的一条。
+
+    Args:
+        student_name: 学生姓名
+        term_infos: (学期名称, 该学期成绩) 列表，顺序即结果中的学期顺序
+    """
+    summaries = []
+    merged: dict[str, TermScoreItem] = {}
+    for term, info in term_infos:
+        summaries.append(
+            TermScoreSummary(
+                term=term,
+                score_count=len(info.scores),
+                total_credit=round(sum(s.credit for s in info.scores), 2),
+                gpa=weighted_gpa(info.scores),
+            )
+        )
+        for score in info.scores:
+            item = TermScoreItem(**score.model_dump(), term=term)
+            key = _course_key(item)
+            existing = merged.get(key)
+            if existing is None or (best_grade_point(item) or 0.0) > (
+                best_grade_point(existing) or 0.0
+            ):
+                merged[key] = item
+
+    scores = list(merged.values())
+    return AllScoresInfo(
+        student_name=student_name,
+        terms=summaries,
+        score_count=len(scores),
+        total_credit=round(sum(s.credit for s in scores), 2),
+        gpa=weighted_gpa(scores),
+        scores=scores,
+    )
@@ -0,0 +1,234 @@
+"""
+由每日课表组装周课表、区间课表，以及由采样日期推导整学期课表
+"""
+
+from datetime import date as date_type
+from datetime import timedelta
+
+from ecjtu_wechat_api.models.course import (
+    Course,
+    CourseSchedule,
+    CourseTimetable,
+    DateInfo,
+    TermTimetable,
+    TimetableCourse,
+)
+
+# 表示临时变动的课程状态，这类课程不能按周次推导，需抓取当天页面核实
+ANOMALOUS_STATUSES = ("调课", "停课", "补课")
+
+
+def course_identity(weekday: int, course: Course) -> tuple:
+    """
+    课程的去重键：同一星期几、同一课程、相同周次与节次安排视为同一条课程。
+    """
+    return (
+        weekday,
+        course.name,
+        course.status,
+        course.location,
+        course.teacher,
+        tuple(tuple(w) for w in course.weeks),
+        tuple(course.periods),
+    )
+
+
+def build_timetable(
+    days: list[tuple[date_type, CourseSchedule]],
+    start: date_type,
+    end: date_type,
+) -> CourseTimetable:
+    """
+    将多个日期的课表合并为按星期和节次索引的课表网格。
+
+    Args:
+        days: (日期, 当日课表) 列表，建议按日期升序排列
+        start: 查询范围起始日期
+        end: 查询范围结束日期
+
+    Returns:
+        CourseTimetable: 去重后的课程列表及 星期 -> 节次 -> 课程下标 网格
+    """
+    courses: list[TimetableCourse] = []
+    index: dict[tuple, int] = {}
+    grid: dict[int, dict[int, list[int]]] = {}
+
+    for day, schedule in days:
+        weekday = day.isoweekday()
+        for course in schedule.courses:
+            key = course_identity(weekday, course)
+            idx = index.get(key)
+            if idx is None:
+                idx = len(courses)
+                index[key] = idx
+                courses.append(
+                    TimetableCourse(**course.model_dump(), weekday=weekday, dates=[])
+                )
+                periods = grid.setdefault(weekday, {})
+                for period in course.periods:
+                    periods.setdefault(period, []).append(idx)
+            courses[idx].dates.append(day.isoformat())
+
+    return CourseTimetable(
+        start_date=start.isoformat(),
+        end_date=end.isoformat(),
+        courses=courses,
+        grid={wd: dict(sorted(p.items())) for wd, p in sorted(grid.items())},
+    )
+
+
+def term_start_from(date_info: DateInfo | None) -> date_type | None:
+    """
+    根据某一天的日期和教学周次推算第 1 周星期一的日期。
+
+    Returns:
+        第 1 周星期一；日期或周次缺失、格式不正确时返回 None。
+    """
+    if not date_info or not date_info.date or not date_info.week_info:
+        return None
+    try:
+        day = date_type.fromisoformat(date_info.date)
+        week = int(date_info.week_info)
+    except ValueError:
+        return None
+    return day - timedelta(days=day.weekday(), weeks=week - 1)
+
+
+def date_of(term_start: date_type, week: int, weekday: int) -> date_type:
+    """计算第 week 周星期 weekday（1-7）对应的日期。"""
+    return term_start + timedelta(weeks=week - 1, days=weekday - 1)
+
+
+def expand_weeks(weeks: list[list[int]]) -> list[int]:
+    """将 [[1, 4], [6]] 形式的周次范围展开为 [1, 2, 3, 4, 6]。"""
+    result: set[int] = set()
+    for w in weeks:
+        if not w:
+            continue
+        result.update(range(w[0], w[-1] + 1))
+    return sorted(result)
+
+
+def is_anomalous(course: Course) -> bool:
+    """判断课程是否为调课等临时变动，或缺少可推导的周次、节次信息。"""
+    return (
+        any(s in course.status for s in ANOMALOUS_STATUSES)
+        or not course.weeks
+        or not course.periods
+    )
+
+
+def next_sample_dates(
+    term_start: date_type,
+    samples: list[tuple[date_type, CourseSchedule]],
+    limit: int,
+) -> list[date_type]:
+    """
+    根据已抓取日期中课程的周次范围，选出下一轮需要抓取的日期。
+
+    对每个星期几，已抓取的周次及该星期几已知课程（含调课等异常课程）
+    的周次视为已覆盖；学期周数取已知课程的最大周次。每个星期几从未覆盖的
+    周次中选一个离已抓取周次最远的（如只在后半学期开设的课程所在周），
+    最多返回 limit 个日期。
+
+    Args:
+        term_start: 第 1 周星期一
+        samples: 已抓取的 (日期, 当日课表) 列表
+        limit: 本轮最多抓取的天数
+
+    Returns:
+        按日期排序的待抓取日期，全部周次均已覆盖时为空列表
+    """
+    sampled: dict[int, set[int]] = {}
+    covered: dict[int, set[int]] = {}
+    last_week = 1
+    for day, schedule in samples:
+        weekday = day.isoweekday()
+        week = (day - term_start).days // 7 + 1
+        sampled.setdefault(weekday, set()).add(week)
+        weeks = covered.setdefault(weekday, set())
+        weeks.add(week)
+        for course in schedule.courses:
+            weeks.update(expand_weeks(course.weeks))
+        last_week = max(last_week, week, *weeks)
+
+    result = []
+    for weekday in range(1, 8):
+        missing = [
+            w for w in range(1, last_week + 1) if w not in covered.get(weekday, ())
+        ]
+        if not missing:
+            continue
+        done = sampled.get(weekday) or {0}
+        week = max(missing, key=lambda w: (min(abs(w - d) for d in done), -w))
+        result.append(date_of(term_start, week, weekday))
+    return sorted(result)[: max(0, limit)]
+
+
+def expand_term_timetable(
+    term_start: date_type, samples: list[tuple[date_type, CourseSchedule]]
+) -> TermTimetable:
+    """
+    由采样日期的课表推导整学期课表索引。
+
+    每门常规课程按其 weeks 展开到所有教学周的同一星期几、同一节次；
+    调课等异常课程不参与推导，其涉及的 (周次, 星期几) 记入 anomalous_days，
+    查询这些日期时需要重新抓取教务系统页面核实。
+
+    索引只包含在采样日期中出现过的课程：若某门课程的所有上课周都未被
+    采样（例如与同一星期几的其他课程周次重叠、但恰好不在采样周），
+    它不会出现在索引中。采样日期由 next_sample_dates 按已知课程的周次
+    补充，也可通过 TIMETABLE_SAMPLE_WEEKS 固定增加采样周。
+
+    Args:
+        term_start: 第 1 周星期一
+        samples: (日期, 当日课表) 采样列表，通常每个星期几至少一天
+
+    Returns:
+        TermTimetable: 周次 -> 星期几 -> 节次 -> 课程 的索引
+    """
+    courses: list[Course] = []
+    seen: dict[tuple, int] = {}
+    index: dict[int, dict[int, dict[int, list[int]]]] = {}
+    anomalous: dict[int, set[int]] = {}
+
+    for day, schedule in samples:
+        weekday = day.isoweekday()
+        for course in schedule.courses:
+            if is_anomalous(course):
+                weeks = expand_weeks(course.weeks) or [(day - term_start).days // 7 + 1]
+                for week in weeks:
+                    anomalous.setdefault(week, set()).add(weekday)
+                continue
+
+            key = course_identity(weekday, course)
+            if key in seen:
+                continue
+            idx = seen[key] = len(courses)
+            courses.append(course)
+            for week in expand_weeks(course.weeks):
+                periods = index.setdefault(week, {}).setdefault(weekday, {})
+                for period in course.periods:
+                    periods.setdefault(period, []).append(idx)
+
+    return TermTimetable(
+        term_start=term_start.isoformat(),
+        sampled_dates=sorted({d.isoformat() for d, _ in samples}),
+        courses=courses,
+        index={
+            w: {wd: dict(sorted(p.items())) for wd, p in sorted(days.items())}
+            for w, days in sorted(index.items())
+        },
+        anomalous_days={w: sorted(wds) for w, wds in sorted(anomalous.items())},
+    )
+
+
+def schedule_from_index(term: TermTimetable, week: int, weekday: int) -> CourseSchedule:
+    """由整学期索引还原某一天的课表（不含需核实的异常课程）。"""
+    day_index = term.index.get(week, {}).get(weekday, {})
+    course_ids = sorted({i for ids in day_index.values() for i in ids})
+    day = date_of(date_type.fromisoformat(term.term_start), week, weekday)
+    return CourseSchedule(
+        date_info=DateInfo(date=day.isoformat(), week_info=str(week)),
+        courses=[term.courses[i] for i in course_ids],
+    )
@@ -0,0 +1,149 @@
+"""
+解析结果缓存
+
+缓存的是解析后的 Pydantic 模型，命中时无需再请求教务系统或解析 HTML。
+条目过期后仍会在 stale_ttl 时间内保留，用于 stale-while-revalidate。
+"""
+
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from collections.abc import Hashable
+from dataclasses import dataclass
+from typing import Any
+
+from ecjtu_wechat_api.core.config import settings
+from ecjtu_wechat_api.utils.logger import logger
+
+
+@dataclass(frozen=True)
+class CacheEntry:
+    """缓存条目及其新鲜度信息。"""
+
+    value: Any
+    # 写入时的时间戳（time.time()），用于计算数据年龄
+    stored_at: float
+    # 是否仍在有效期内；为 False 表示已过期但仍在 stale 保留期内
+    fresh: bool
+
+    @property
+    def age(self) -> float:
+        """数据写入缓存至今的秒数。"""
+        return max(0.0, time.time() - self.stored_at)
+
+
+class BaseCache(ABC):
+    """缓存后端抽象基类，新的后端（如 Redis）需实现以下方法。"""
+
+    @abstractmethod
+    def get_entry(self, key: Hashable) -> CacheEntry | None:
+        """读取缓存条目（包括已过期但仍在 stale 保留期内的条目）。"""
+
+    @abstractmethod
+    def set(self, key: Hashable, value: Any, ttl: float, stale_ttl: float = 0) -> None:
+        """
+        写入缓存值。
+
+        Args:
+            ttl: 有效期（秒），小于等于 0 时不缓存
+            stale_ttl: 过期后继续保留、可作为过期数据返回的时间（秒）
+        """
+
+    @abstractmethod
+    def delete(self, key: Hashable) -> None:
+        """删除指定缓存条目。"""
+
+    @abstractmethod
+    def clear(self) -> None:
+        """清空全部缓存。"""
+
+    def get(self, key: Hashable) -> Any | None:
+        """读取未过期的缓存值，不存在或已过期时返回 None。"""
+        entry = self.get_entry(key)
+        return entry.value if entry is not None and entry.fresh else None
+
+
+class NullCache(BaseCache):
+    """不缓存任何数据的后端，用于关闭缓存。"""
+
+    def get_entry(self, key: Hashable) -> CacheEntry | None:
+        return None
+
+    def set(self, key: Hashable, value: Any, ttl: float, stale_ttl: float = 0) -> None:
+        pass
+
+    def delete(self, key: Hashable) -> None:
+        pass
+
+    def clear(self) -> None:
+        pass
+
+
+class MemoryCache(BaseCache):
+    """
+    进程内 LRU 缓存，每个条目带独立的过期时间，总条目数有上限。
+    """
+
+    def __init__(self, max_size: int = 10000):
+        self.max_size = max_size
+        # key -> (过期时间, 保留截止时间, 写入时间戳, 值)，按最近使用顺序排列
+        self._data: OrderedDict[Hashable, tuple[float, float, float, Any]] = (
+            OrderedDict()
+        )
+
+    def get_entry(self, key: Hashable) -> CacheEntry | None:
+        item = self._data.get(key)
+        if item is None:
+            return None
+        expires_at, stale_until, stored_at, value = item
+        now = time.monotonic()
+        if stale_until <= now:
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return CacheEntry(value=value, stored_at=stored_at, fresh=expires_at > now)
+
+    def set(self, key: Hashable, value: Any, ttl: float, stale_ttl: float = 0) -> None:
+        if ttl <= 0 or self.max_size <= 0:
+            return
+        expires_at = time.monotonic() + ttl
+        self._data[key] = (
+            expires_at,
+            expires_at + max(stale_ttl, 0),
+            time.time(),
+            value,
+        )
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_size:
+            self._data.popitem(last=False)
+
+    def delete(self, key: Hashable) -> None:
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+def create_cache(backend: str | None = None) -> BaseCache:
+    """
+    根据配置创建缓存后端。
+
+    Args:
+        backend: 后端名称，为 None 时使用 CACHE_BACKEND 配置
+
+    Returns:
+        BaseCache: 缓存实例
+    """
+    backend = (backend or settings.CACHE_BACKEND).lower()
+    if backend == "memory":
+        return MemoryCache(max_size=settings.CACHE_MAX_SIZE)
+    if backend != "none":
+        logger.warning("未知的缓存后端: %s，已关闭缓存", backend)
+    return NullCache()
+
+
+# 全局解析结果缓存
+response_cache = create_cache()
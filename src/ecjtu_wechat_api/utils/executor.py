@@ -0,0 +1,170 @@
+"""
+HTML 解析工作池
+
+parse_* 是同步的 CPU 密集型函数，直接在路由中调用会阻塞事件循环。
+这里将其提交到线程池或进程池执行，并通过有界队列实现背压。
+"""
+
+import asyncio
+from collections.abc import AsyncGenerator, Callable
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import aclosing
+from typing import Any
+
+from ecjtu_wechat_api.core.config import settings
+from ecjtu_wechat_api.core.exceptions import ServiceBusyError
+from ecjtu_wechat_api.utils.html_stream import StreamingHTMLParser
+from ecjtu_wechat_api.utils.logger import logger, setup_worker_logging
+from ecjtu_wechat_api.utils.metrics import Counter, Gauge
+
+PARSE_QUEUE_DEPTH = Gauge(
+    "ecjtu_parse_queue_depth", "等待解析工作池空闲 worker 的任务数"
+)
+PARSE_ACTIVE = Gauge("ecjtu_parse_active", "正在解析工作池中执行的任务数")
+PARSE_REJECTED = Counter("ecjtu_parse_rejected_total", "因解析队列已满而被拒绝的任务数")
+
+
+class ParsePool:
+    """
+    带有界等待队列的解析工作池。
+
+    同时执行的任务数不超过 workers，排队等待的任务数不超过 queue_size，
+    队列已满时立即抛出 ServiceBusyError（HTTP 503）而不是无限堆积。
+    """
+
+    def __init__(self, kind: str = "thread", workers: int = 4, queue_size: int = 64):
+        if kind not in ("thread", "process"):
+            raise ValueError(f"不支持的解析工作池类型: {kind}")
+        self.kind = kind
+        self.workers = workers
+        self.queue_size = queue_size
+        self._executor: Executor | None = None
+        self._semaphore: asyncio.Semaphore | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._waiting = 0
+
+    def start(self) -> None:
+        """创建底层执行器（重复调用无副作用）。"""
+        if self._executor is not None:
+            return
+        if self.kind == "process":
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers, initializer=setup_worker_logging
+            )
+        else:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.workers, thread_name_prefix="ecjtu-parse"
+            )
+        logger.info("解析工作池已启动: kind=%s, workers=%d", self.kind, self.workers)
+
+    def shutdown(self) -> None:
+        """关闭底层执行器，等待已提交的任务完成。"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        self._semaphore = None
+        self._loop = None
+
+    @property
+    def queue_depth(self) -> int:
+        """当前排队等待执行的任务数。"""
+        return self._waiting
+
+    async def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """
+        在工作池中执行 fn(*args) 并等待结果。
+
+        Raises:
+            ServiceBusyError: 排队任务数已达上限时抛出。
+        """
+        if self._executor is None:
+            self.start()
+        loop = asyncio.get_running_loop()
+        # Semaphore 绑定事件循环，循环变化时（如测试中）需要重新创建
+        if self._semaphore is None or self._loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.workers)
+            self._loop = loop
+        semaphore = self._semaphore
+
+        if semaphore.locked() and self._waiting >= self.queue_size:
+            PARSE_REJECTED.inc()
+            raise ServiceBusyError(
+                "服务繁忙，请稍后再试", details={"queue_depth": self._waiting}
+            )
+
+        self._waiting += 1
+        PARSE_QUEUE_DEPTH.set(self._waiting)
+        try:
+            await semaphore.acquire()
+        finally:
+            self._waiting -= 1
+            PARSE_QUEUE_DEPTH.set(self._waiting)
+
+        PARSE_ACTIVE.inc()
+        try:
+            return await loop.run_in_executor(self._executor, fn, *args)
+        finally:
+            PARSE_ACTIVE.dec()
+            semaphore.release()
+
+    async def parse_stream(
+        self, parser: StreamingHTMLParser, chunks: AsyncGenerator[str, None]
+    ) -> Any:
+        """
+        用增量解析器解析异步到达的 HTML 分块，返回 parser.result()。
+
+        线程池中，分块在下载的同时按顺序交给工作池解析（已到达的分块合并
+        提交），下载不等待解析，上游连接及限流配额在下载结束时即释放。
+        进程池无法在分块之间保留解析器状态，改为收齐全部分块后在进程中
+        一次解析。
+
+        Raises:
+            ServiceBusyError: 排队任务数已达上限时抛出。
+        """
+        if self.kind == "process":
+            async with aclosing(chunks):
+                text = "".join([chunk async for chunk in chunks])
+            return await self.run(_parse_text, parser, text)
+
+        pending: asyncio.Queue[str | None] = asyncio.Queue()
+
+        async def consume() -> Any:
+            done = False
+            while not done:
+                parts = [await pending.get()]
+                while not pending.empty():
+                    parts.append(pending.get_nowait())
+                if parts[-1] is None:
+                    parts.pop()
+                    done = True
+                if parts:
+                    await self.run(parser.feed, "".join(parts))
+            return await self.run(parser.result)
+
+        consumer = asyncio.create_task(consume())
+        try:
+            async with aclosing(chunks):
+                async for chunk in chunks:
+                    # 解析已失败时停止下载
+                    if consumer.done():
+                        break
+                    pending.put_nowait(chunk)
+            pending.put_nowait(None)
+        except BaseException:
+            consumer.cancel()
+            raise
+        return await consumer
+
+
+def _parse_text(parser: StreamingHTMLParser, text: str) -> Any:
+    """在工作进程中一次性解析完整 HTML。"""
+    parser.feed(text)
+    return parser.result()
+
+
+# 全局解析工作池
+parse_pool = ParsePool(
+    kind=settings.PARSE_EXECUTOR,
+    workers=settings.PARSE_WORKERS,
+    queue_size=settings.PARSE_QUEUE_SIZE,
+)
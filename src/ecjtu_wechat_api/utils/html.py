@@ -0,0 +1,80 @@
+"""
+HTML 解析后端
+
+所有 parse_* 函数通过 make_soup 构造 BeautifulSoup 文档树，具体使用的
+tree builder 由 HTML_PARSER 配置在启动时选定。
+"""
+
+from bs4 import BeautifulSoup, FeatureNotFound, Tag
+
+from ecjtu_wechat_api.core.config import settings
+from ecjtu_wechat_api.utils.logger import logger
+
+# 默认后端，Python 标准库自带，无需额外依赖
+DEFAULT_PARSER = "html.parser"
+
+# 支持的解析后端：lxml 基于 libxml2，速度显著快于 html.parser
+SUPPORTED_PARSERS = ("html.parser", "lxml")
+
+_parser: str | None = None
+
+
+def _is_available(name: str) -> bool:
+    """检查指定后端的依赖是否已安装。"""
+    try:
+        BeautifulSoup("", name)
+    except FeatureNotFound:
+        return False
+    return True
+
+
+def set_parser_backend(name: str | None = None) -> str:
+    """
+    选择 HTML 解析后端，应在应用启动时调用。
+
+    未知的后端或缺少依赖时回退到 html.parser 并记录警告。
+
+    Args:
+        name: 后端名称，为 None 时使用 HTML_PARSER 配置
+
+    Returns:
+        str: 实际生效的后端名称
+    """
+    global _parser
+    name = (name or settings.HTML_PARSER).lower()
+    if name not in SUPPORTED_PARSERS:
+        logger.warning("不支持的 HTML 解析后端: %s，回退为 %s", name, DEFAULT_PARSER)
+        name = DEFAULT_PARSER
+    elif not _is_available(name):
+        logger.warning("HTML 解析后端 %s 未安装，回退为 %s", name, DEFAULT_PARSER)
+        name = DEFAULT_PARSER
+    _parser = name
+    return name
+
+
+def get_parser_backend() -> str:
+    """获取当前生效的解析后端名称，未显式选择时按配置惰性初始化。"""
+    if _parser is None:
+        return set_parser_backend()
+    return _parser
+
+
+def make_soup(html_content: str) -> BeautifulSoup:
+    """使用当前解析后端构造文档树。"""
+    return BeautifulSoup(html_content, get_parser_backend())
+
+
+def find_first(tag: Tag, name: str, class_: str | None = None) -> Tag | None:
+    """
+    按文档顺序查找第一个匹配的后代元素，等价于 tag.find(name, class_=...)
+    （class_ 为单个类名）。
+
+    直接遍历 descendants，省去 find 每次调用构造匹配规则的开销，适合在逐条目
+    的循环中查找近处的小元素。
+    """
+    for element in tag.descendants:
+        if element.name == name and (
+            class_ is None or class_ in (element.get("class") or ())
+        ):
+            return element
+    return None
@@ -0,0 +1,197 @@
+"""
+增量 HTML 解析
+
+基于标准库 HTMLParser，边接收响应分块边解析。只为需要的元素（如每一行成绩）
+构建轻量子树，元素结束后立即交给 on_element 处理并丢弃，峰值内存与页面总
+大小无关。Node 提供与 BeautifulSoup Tag 相同签名的 find / find_all /
+get_text / get，同一套字段提取逻辑可同时用于两种解析方式。
+"""
+
+from abc import ABC, abstractmethod
+from collections.abc import Iterator
+from html.parser import HTMLParser
+from typing import Any
+
+# 没有结束标签的空元素（与 BeautifulSoup 的 html.parser 后端一致）
+VOID_ELEMENTS = frozenset(
+    {
+        "area",
+        "base",
+        "br",
+        "col",
+        "embed",
+        "hr",
+        "img",
+        "input",
+        "keygen",
+        "link",
+        "menuitem",
+        "meta",
+        "param",
+        "source",
+        "track",
+        "wbr",
+        "basefont",
+        "bgsound",
+        "command",
+        "frame",
+        "image",
+        "isindex",
+        "nextid",
+        "spacer",
+    }
+)
+
+
+class IrregularMarkup(Exception):
+    """页面结构不规范，增量解析的结果可能与 BeautifulSoup 不同，应改用完整解析。"""
+
+
+class Node:
+    """轻量的元素节点，children 中为子节点或文本。"""
+
+    __slots__ = ("tag", "attrs", "classes", "children")
+
+    def __init__(self, tag: str, attrs: list[tuple[str, str | None]]):
+        self.tag = tag
+        self.attrs = {name: value or "" for name, value in attrs}
+        self.classes = self.attrs.get("class", "").split()
+        self.children: list[Node | str] = []
+
+    @property
+    def name(self) -> str:
+        return self.tag
+
+    @property
+    def contents(self) -> list["Node | str"]:
+        return self.children
+
+    def get(self, name: str, default: str | None = None) -> str | None:
+        return self.attrs.get(name, default)
+
+    def _descendants(self) -> Iterator["Node"]:
+        for child in self.children:
+            if isinstance(child, Node):
+                yield child
+                yield from child._descendants()
+
+    def find_all(self, tag: str, class_: str | None = None) -> list["Node"]:
+        """按文档顺序查找所有匹配的后代元素。"""
+        return [
+            node
+            for node in self._descendants()
+            if node.tag == tag and (class_ is None or class_ in node.classes)
+        ]
+
+    def find(self, tag: str, class_: str | None = None) -> "Node | None":
+        """查找第一个匹配的后代元素。"""
+        for node in self._descendants():
+            if node.tag == tag and (class_ is None or class_ in node.classes):
+                return node
+        return None
+
+    def _strings(self) -> Iterator[str]:
+        for child in self.children:
+            if isinstance(child, Node):
+                yield from child._strings()
+            else:
+                yield child
+
+    def get_text(self, strip: bool = False) -> str:
+        """拼接所有后代文本；strip 为 True 时逐段去除空白并忽略空段。"""
+        if not strip:
+            return "".join(self._strings())
+        return "".join(s.strip() for s in self._strings() if s.strip())
+
+
+class StreamingHTMLParser(HTMLParser, ABC):
+    """
+    增量解析器基类。
+
+    子类实现 capture 决定哪些元素需要构建子树（被捕获元素内部的同类元素
+    不会再单独捕获），在 on_element 中处理已结束的元素，并由 result 返回
+    解析结果。结构规范的页面与 BeautifulSoup 得到相同的树；遇到不规范的结构
+    时 irregular 置位，result 应抛出 IrregularMarkup 交由调用方改用完整解析。
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        # 当前打开的元素: (标签名, 节点)，未被捕获的元素节点为 None
+        self._stack: list[tuple[str, Node | None]] = []
+        self._root: int | None = None
+        # 遇到不规范的结构（结束标签不匹配、元素未闭合、被捕获元素嵌套）时置位，
+        # 此时结果可能与 BeautifulSoup 不同
+        self.irregular = False
+
+    @abstractmethod
+    def capture(self, tag: str, classes: list[str]) -> bool:
+        """判断元素是否需要构建子树。"""
+
+    @abstractmethod
+    def on_element(self, node: Node) -> None:
+        """处理一个已结束的被捕获元素。"""
+
+    @abstractmethod
+    def result(self) -> Any:
+        """结束解析并返回解析结果。"""
+
+    def handle_starttag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        if self._root is not None:
+            node = Node(tag, attrs)
+            if self.capture(tag, node.classes):
+                self.irregular = True
+            parent = self._stack[-1][1]
+            assert parent is not None
+            parent.children.append(node)
+            if tag not in VOID_ELEMENTS:
+                self._stack.append((tag, node))
+            return
+
+        if tag in VOID_ELEMENTS:
+            return
+        node = Node(tag, attrs)
+        if self.capture(tag, node.classes):
+            self._root = len(self._stack)
+            self._stack.append((tag, node))
+        else:
+            self._stack.append((tag, None))
+
+    def handle_startendtag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        self.handle_starttag(tag, attrs)
+        if tag not in VOID_ELEMENTS:
+            self.handle_endtag(tag)
+
+    def handle_endtag(self, tag: str) -> None:
+        # 与 BeautifulSoup 相同：关闭最近一个同名元素及其内部未闭合的元素，
+        # 找不到同名元素时忽略该结束标签
+        for i in range(len(self._stack) - 1, -1, -1):
+            if self._stack[i][0] == tag:
+                if i != len(self._stack) - 1:
+                    self.irregular = True
+                self._pop_to(i)
+                return
+        self.irregular = True
+
+    def handle_data(self, data: str) -> None:
+        if self._root is not None:
+            node = self._stack[-1][1]
+            assert node is not None
+            node.children.append(data)
+
+    def _pop_to(self, index: int) -> None:
+        root = None
+        if self._root is not None and index <= self._root:
+            root = self._stack[self._root][1]
+            self._root = None
+        del self._stack[index:]
+        if root is not None:
+            self.on_element(root)
+
+    def close(self) -> None:
+        """结束解析，未闭合的被捕获元素同样交给 on_element。"""
+        super().close()
+        if self._stack:
+            self.irregular = True
+        if self._root is not None:
+            self._pop_to(self._root)
+        self._stack.clear()
@@ -1,42 +1,358 @@
+import asyncio
+import time
+from collections.abc import AsyncIterator, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+
 import httpx
 
 from ecjtu_wechat_api.core.config import settings
 from ecjtu_wechat_api.core.exceptions import EducationSystemError
 from ecjtu_wechat_api.utils.logger import logger
+from ecjtu_wechat_api.utils.metrics import Histogram
+from ecjtu_wechat_api.utils.ratelimit import upstream_limiter
+from ecjtu_wechat_api.utils.resilience import (
+    UPSTREAM_HEDGE_WINS,
+    UPSTREAM_HEDGED,
+    UPSTREAM_RETRIES,
+    backoff_delay,
+    get_breaker,
+    hedge_delay,
+    observe_latency,
+)
+from ecjtu_wechat_api.utils.timing import stage
+
+UPSTREAM_DURATION = Histogram(
+    "ecjtu_upstream_request_duration_seconds",
+    "单次请求教务系统的耗时，status 为状态码或 error（网络错误）",
+    ("endpoint", "status"),
+)
+
+# 进程级共享的 HTTP 客户端，复用 keep-alive 连接以避免每次请求重新握手
+_client: httpx.AsyncClient | None = None
+
+
+@dataclass
+class Validators:
+    """条件请求的校验信息，来自上一次响应的 ETag / Last-Modified。"""
+
+    etag: str | None = None
+    last_modified: str | None = None
+
+    def headers(self) -> dict[str, str]:
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+    def update(self, response: httpx.Response) -> None:
+        self.etag = response.headers.get("ETag")
+        self.last_modified = response.headers.get("Last-Modified")
+
+
+class NotModified(Exception):
+    """条件请求命中：教务系统返回 304，页面自上次抓取以来没有变化。"""
+
+
+# 当前上下文中的条件请求校验信息，由 conditional() 设置
+_validators: ContextVar[Validators | None] = ContextVar("validators", default=None)
+
+
+@contextmanager
+def conditional(validators: Validators) -> Iterator[Validators]:
+    """
+    在上下文内发出的 get_page / stream_page 请求携带 If-None-Match /
+    If-Modified-Since 请求头；教务系统返回 304 时抛出 NotModified，
+    返回 200 时把响应中新的 ETag / Last-Modified 写回 validators。
+    """
+    token = _validators.set(validators)
+    try:
+        yield validators
+    finally:
+        _validators.reset(token)
+
+
+def _check_not_modified(response: httpx.Response) -> None:
+    """发出了条件请求且教务系统返回 304 时抛出 NotModified。"""
+    validators = _validators.get()
+    if response.status_code == 304 and validators and validators.headers():
+        raise NotModified()
+    if response.status_code == 200 and validators is not None:
+        validators.update(response)
 
 
-async def get_page(url: str, params: dict | None = None, timeout: int = 10) -> str:
+def _http2_available() -> bool:
+    """检查是否安装了 HTTP/2 所需的 h2 依赖。"""
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def _build_client() -> httpx.AsyncClient:
+    """根据全局配置构造带连接池的 AsyncClient。"""
+    http2 = settings.HTTP2_ENABLED
+    if http2 and not _http2_available():
+        logger.warning("已开启 HTTP2_ENABLED 但未安装 h2，回退为 HTTP/1.1")
+        http2 = False
+
+    limits = httpx.Limits(
+        max_connections=settings.HTTP_MAX_CONNECTIONS,
+        max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY,
+    )
+    return httpx.AsyncClient(
+        headers=settings.DEFAULT_HEADERS,
+        timeout=settings.HTTP_TIMEOUT,
+        limits=limits,
+        http2=http2,
+    )
+
+
+async def init_http_client() -> httpx.AsyncClient:
+    """
+    创建进程级共享的 HTTP 客户端（由应用 lifespan 在启动时调用）。
+
+    Returns:
+        httpx.AsyncClient: 共享客户端实例
+    """
+    return get_client()
+
+
+async def close_http_client() -> None:
+    """关闭共享 HTTP 客户端并释放连接池（由应用 lifespan 在关闭时调用）。"""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+def get_client() -> httpx.AsyncClient:
+    """
+    获取共享 HTTP 客户端。
+
+    未经 lifespan 初始化时（如脚本直接调用 fetch_* 函数）会惰性创建。
+    """
+    global _client
+    if _client is None or _client.is_closed:
+        _client = _build_client()
+    return _client
+
+
+def _overloaded(status_code: int) -> bool:
+    """5xx 与 429 说明教务系统出错或已过载：可以重试，并需要收缩并发。"""
+    return status_code >= 500 or status_code == 429
+
+
+def _status_error(response: httpx.Response, url: str) -> EducationSystemError:
+    logger.error("教务系统返回非 200 状态码: %s, URL: %s", response.status_code, url)
+    return EducationSystemError(
+        message=f"教务系统返回错误 (状态码: {response.status_code})",
+        status_code=response.status_code,
+    )
+
+
+async def _request(
+    url: str, params: dict | None, timeout: float, host: str
+) -> httpx.Response:
+    """在限流许可内发出单次请求，网络错误以 EducationSystemError 抛出。"""
+    client = get_client()
+    endpoint = httpx.URL(url).path
+    # 按主机限流：令牌桶限制速率，自适应并发上限根据延迟和错误率调整
+    async with upstream_limiter.slot(host) as permit:
+        start = time.monotonic()
+        try:
+            validators = _validators.get()
+            response = await client.get(
+                url,
+                params=params,
+                headers=validators.headers() if validators else None,
+                timeout=timeout,
+            )
+        except httpx.RequestError as e:
+            UPSTREAM_DURATION.observe(
+                time.monotonic() - start, endpoint=endpoint, status="error"
+            )
+            logger.error("请求教务系统出错: %s, URL: %s", e, url)
+            raise EducationSystemError(message=f"网络请求失败: {str(e)}") from e
+        permit.record(not _overloaded(response.status_code))
+    elapsed = time.monotonic() - start
+    UPSTREAM_DURATION.observe(
+        elapsed, endpoint=endpoint, status=str(response.status_code)
+    )
+    if not _overloaded(response.status_code):
+        observe_latency(host, elapsed)
+    return response
+
+
+async def _hedged_request(
+    url: str, params: dict | None, timeout: float, host: str
+) -> httpx.Response:
+    """
+    发出请求；开启对冲时，若原请求在最近延迟的 p95 内仍未返回，
+    再发出一个相同的请求，取最先成功的响应并取消另一个。
+    """
+    if not settings.HTTP_HEDGE_ENABLED:
+        return await _request(url, params, timeout, host)
+
+    primary = asyncio.ensure_future(_request(url, params, timeout, host))
+    pending = {primary}
+    try:
+        done, pending = await asyncio.wait(pending, timeout=hedge_delay(host))
+        if not done:
+            UPSTREAM_HEDGED.inc(host=host)
+            pending.add(asyncio.ensure_future(_request(url, params, timeout, host)))
+            done, pending = await asyncio.wait(
+                pending, return_when=asyncio.FIRST_COMPLETED
+            )
+        while True:
+            error = None
+            for task in done:
+                error = task.exception()
+                if error is None:
+                    if task is not primary:
+                        UPSTREAM_HEDGE_WINS.inc(host=host)
+                    return task.result()
+            # 先返回的请求失败，继续等待另一个
+            if not pending:
+                raise error
+            done, pending = await asyncio.wait(
+                pending, return_when=asyncio.FIRST_COMPLETED
+            )
+    finally:
+        # 取消落败的请求并等待其归还限流配额（取消不计为上游失败）
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+
+
+async def get_page(
+    url: str, params: dict | None = None, timeout: float | None = None
+) -> str:
     """
     异步获取网页内容。
 
+    网络错误、5xx 与 429 按 HTTP_RETRIES 以指数退避重试；
+    教务系统连续失败时熔断器打开，期间直接失败而不再等待超时。
+
     Args:
         url: 目标 URL
         params: 请求参数
-        timeout: 超时时间（秒）
+        timeout: 单次请求的超时时间（秒），为 None 时使用 HTTP_TIMEOUT 配置
 
     Returns:
         str: 网页 HTML 内容
 
     Raises:
         EducationSystemError: 请求失败或教务系统返回错误
+        NotModified: 在 conditional() 上下文中且页面未变化（304）
+        CircuitOpenError: 熔断期间拒绝请求（EducationSystemError 的子类）
+        UpstreamBusyError: 等待上游限流许可超时
+    """
+    # 计入当前请求的 upstream 阶段（含重试与退避等待）
+    with stage("upstream"):
+        return await _get_page(url, params, timeout)
+
+
+async def _get_page(url: str, params: dict | None, timeout: float | None) -> str:
+    host = httpx.URL(url).host
+    breaker = get_breaker(host)
+    timeout = timeout if timeout is not None else settings.HTTP_TIMEOUT
+
+    error: EducationSystemError | None = None
+    for attempt in range(max(0, settings.HTTP_RETRIES) + 1):
+        if attempt:
+            delay = backoff_delay(attempt - 1)
+            UPSTREAM_RETRIES.inc(host=host)
+            logger.warning("%.2f 秒后第 %d 次重试: %s", delay, attempt, url)
+            await asyncio.sleep(delay)
+        breaker.before_request()
+
+        try:
+            response = await _hedged_request(url, params, timeout, host)
+        except EducationSystemError as e:
+            breaker.record_failure()
+            error = e
+            continue
+        if _overloaded(response.status_code):
+            breaker.record_failure()
+            error = _status_error(response, url)
+            continue
+
+        breaker.record_success()
+        _check_not_modified(response)
+        if response.status_code != 200:
+            raise _status_error(response, url)
+        response.encoding = "utf-8"
+        return response.text
+
+    raise error
+
+
+async def stream_page(
+    url: str, params: dict | None = None, timeout: float | None = None
+) -> AsyncIterator[str]:
+    """
+    以流式方式获取网页内容，边下载边逐块返回解码后的文本。
+
+    与 get_page 共用限流器和熔断器；由于数据已经开始交给调用方，
+    流式请求不做重试与对冲。
+
+    Args:
+        url: 目标 URL
+        params: 请求参数
+        timeout: 超时时间（秒），为 None 时使用 HTTP_TIMEOUT 配置
+
+    Yields:
+        str: 按 UTF-8 解码的 HTML 片段
+
+    Raises:
+        EducationSystemError: 请求失败或教务系统返回错误
+        NotModified: 在 conditional() 上下文中且页面未变化（304）
+        UpstreamBusyError: 等待上游限流许可超时
     """
-    async with httpx.AsyncClient(
-        headers=settings.DEFAULT_HEADERS, timeout=timeout
-    ) as client:
+    host = httpx.URL(url).host
+    breaker = get_breaker(host)
+    breaker.before_request()
+    client = get_client()
+    validators = _validators.get()
+    endpoint = httpx.URL(url).path
+    status = "error"
+    async with upstream_limiter.slot(host) as permit:
+        start = time.monotonic()
         try:
-            response = await client.get(url, params=params)
-            response.encoding = "utf-8"
-
-            if response.status_code != 200:
-                logger.error(
-                    f"教务系统返回非 200 状态码: {response.status_code}, URL: {url}"
-                )
-                raise EducationSystemError(
-                    message=f"教务系统返回错误 (状态码: {response.status_code})",
-                    status_code=response.status_code,
-                )
-
-            return response.text
+            async with client.stream(
+                "GET",
+                url,
+                params=params,
+                headers=validators.headers() if validators else None,
+                timeout=timeout if timeout is not None else settings.HTTP_TIMEOUT,
+            ) as response:
+                status = str(response.status_code)
+                if _overloaded(response.status_code):
+                    permit.record(False)
+                    breaker.record_failure()
+                else:
+                    permit.record(True)
+                    breaker.record_success()
+                _check_not_modified(response)
+                if response.status_code != 200:
+                    raise _status_error(response, url)
+                response.encoding = "utf-8"
+                async for chunk in response.aiter_text():
+                    yield chunk
         except httpx.RequestError as e:
-            logger.error(f"请求教务系统出错: {e}, URL: {url}")
+            permit.record(False)
+            breaker.record_failure()
+            logger.error("请求教务系统出错: %s, URL: %s", e, url)
             raise EducationSystemError(message=f"网络请求失败: {str(e)}") from e
+        finally:
+            # 流式请求的耗时包含边下载边解析的时间
+            UPSTREAM_DURATION.observe(
+                time.monotonic() - start, endpoint=endpoint, status=status
+            )
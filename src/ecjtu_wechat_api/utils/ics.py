@@ -0,0 +1,161 @@
+"""
+iCalendar (RFC 5545) 导出
+
+将考试安排、课表等转换为日历订阅源。日历应用订阅后定期重新拉取，
+响应附带由内容计算的 ETag，内容未变化时返回 304，重复拉取几乎没有开销。
+"""
+
+import hashlib
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from datetime import UTC, date, datetime
+
+from fastapi import Request
+from fastapi.responses import Response, StreamingResponse
+
+PRODID = "-//ecjtu-wechat-api//CN"
+
+# 内容行按 75 个八位字节折行（RFC 5545 3.1）
+_LINE_LIMIT = 75
+
+
+@dataclass(frozen=True)
+class Event:
+    """日历中的一个事件。start/end 为 date 时表示全天事件。"""
+
+    uid: str
+    summary: str
+    start: datetime | date
+    end: datetime | date | None = None
+    location: str = ""
+    description: str = ""
+
+
+def make_uid(*parts: str) -> str:
+    """由事件的稳定标识（如学期、课程、班级）生成 UID，内容修改后 UID 不变。"""
+    digest = hashlib.blake2b("\x1f".join(parts).encode("utf-8"), digest_size=12)
+    return f"{digest.hexdigest()}@ecjtu-wechat-api"
+
+
+def escape_text(value: str) -> str:
+    """转义 TEXT 类型的属性值。"""
+    return (
+        value.replace("\\", "\\\\")
+        .replace(";", "\\;")
+        .replace(",", "\\,")
+        .replace("\r\n", "\\n")
+        .replace("\n", "\\n")
+    )
+
+
+def fold(line: str) -> str:
+    """按 UTF-8 字节数折行，续行以空格开头，不拆分多字节字符。"""
+    if len(line.encode("utf-8")) <= _LINE_LIMIT:
+        return line + "\r\n"
+    parts = []
+    current = ""
+    size = 0
+    limit = _LINE_LIMIT
+    for char in line:
+        width = len(char.encode("utf-8"))
+        if size + width > limit:
+            parts.append(current)
+            current, size = "", 0
+            # 续行开头的空格占一个字节
+            limit = _LINE_LIMIT - 1
+        current += char
+        size += width
+    parts.append(current)
+    return "\r\n ".join(parts) + "\r\n"
+
+
+def _format_time(value: datetime | date) -> str:
+    """带时区的时间统一转换为 UTC，date 输出为 VALUE=DATE 形式。"""
+    if isinstance(value, datetime):
+        return value.astimezone(UTC).strftime("%Y%m%dT%H%M%SZ")
+    return value.strftime("%Y%m%d")
+
+
+def _time_property(name: str, value: datetime | date) -> str:
+    if isinstance(value, datetime):
+        return f"{name}:{_format_time(value)}"
+    return f"{name};VALUE=DATE:{_format_time(value)}"
+
+
+def _event_lines(event: Event) -> Iterator[str]:
+    yield "BEGIN:VEVENT"
+    yield f"UID:{event.uid}"
+    # DTSTAMP 取事件开始时间而非生成时间，内容不变时输出保持不变
+    stamp = event.start
+    if not isinstance(stamp, datetime):
+        stamp = datetime(stamp.year, stamp.month, stamp.day, tzinfo=UTC)
+    yield f"DTSTAMP:{_format_time(stamp)}"
+    yield _time_property("DTSTART", event.start)
+    if event.end is not None:
+        yield _time_property("DTEND", event.end)
+    yield f"SUMMARY:{escape_text(event.summary)}"
+    if event.location:
+        yield f"LOCATION:{escape_text(event.location)}"
+    if event.description:
+        yield f"DESCRIPTION:{escape_text(event.description)}"
+    yield "END:VEVENT"
+
+
+def render_calendar(name: str, events: Iterable[Event]) -> Iterator[str]:
+    """逐行生成日历内容（每行已折行并以 CRLF 结尾）。"""
+    header = (
+        "BEGIN:VCALENDAR",
+        "VERSION:2.0",
+        f"PRODID:{PRODID}",
+        "CALSCALE:GREGORIAN",
+        "METHOD:PUBLISH",
+        f"X-WR-CALNAME:{escape_text(name)}",
+    )
+    for line in header:
+        yield fold(line)
+    for event in events:
+        for line in _event_lines(event):
+            yield fold(line)
+    yield fold("END:VCALENDAR")
+
+
+def calendar_etag(name: str, events: list[Event]) -> str:
+    """由日历内容计算强 ETag，无需先生成完整日历。"""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(name.encode("utf-8"))
+    for event in events:
+        digest.update(repr(event).encode("utf-8"))
+    return f'"{digest.hexdigest()}"'
+
+
+def calendar_response(
+    request: Request,
+    name: str,
+    events: list[Event],
+    max_age: float,
+    etag: str | None = None,
+) -> Response:
+    """
+    返回日历订阅源，请求的 If-None-Match 与当前内容一致时返回 304。
+
+    Args:
+        request: 当前请求
+        name: 日历名称（X-WR-CALNAME）
+        events: 日历事件
+        max_age: 客户端可直接复用响应的时间（秒），过期后携带 ETag 重新验证
+        etag: 预先计算（如随日历一起缓存）的 ETag，为 None 时由内容计算
+    """
+    etag = etag or calendar_etag(name, events)
+    headers = {"ETag": etag, "Cache-Control": f"private, max-age={int(max_age)}"}
+    # If-None-Match 使用弱比较（RFC 9110 13.1.2）
+    tags = {
+        tag.strip().removeprefix("W/")
+        for tag in request.headers.get("if-none-match", "").split(",")
+    }
+    if etag in tags or "*" in tags:
+        return Response(status_code=304, headers=headers)
+    return StreamingResponse(
+        render_calendar(name, events),
+        media_type="text/calendar; charset=utf-8",
+        headers=headers,
+    )
@@ -1,11 +1,195 @@
+"""
+日志配置
+
+日志记录经 QueueHandler 放入队列，由 QueueListener 的后台线程格式化并写出，
+请求处理中不会因写 stdout 阻塞事件循环。消息使用 %-格式的惰性参数，
+格式化推迟到后台线程，被级别或采样过滤的日志不会格式化。
+
+- LOG_FORMAT=json 时每行输出一个 JSON 对象；
+- 通过 extra=SAMPLED 标记的高频日志按 LOG_SAMPLE_RATE 采样；
+- 消息中的 weiXinID=... 替换为不可逆的短哈希（LOG_REDACT）。
+"""
+
+import atexit
+import hashlib
+import itertools
+import json
 import logging
+import queue
+import re
 import sys
+from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener
+from typing import TextIO
+
+from ecjtu_wechat_api.core.config import settings
+
+# 标记高频日志参与采样: logger.info("...", extra=SAMPLED)
+SAMPLED = {"sampled": True}
+
+_WEIXIN_ID_RE = re.compile(r"(weiXinID=)([^&\s,;'\")]+)")
+
+# LogRecord 的标准属性，其余属性视为通过 extra 传入的字段
+_RECORD_ATTRS = frozenset(logging.LogRecord("", 0, "", 0, "", None, None).__dict__) | {
+    "message",
+    "asctime",
+    "taskName",
+    "sampled",
+}
+
+
+def redact(weixin_id: str) -> str:
+    """将 weiXinID 替换为短哈希，同一用户的哈希相同。"""
+    digest = hashlib.blake2b(weixin_id.encode("utf-8"), digest_size=4).hexdigest()
+    return f"***{digest}"
+
+
+class RedactFilter(logging.Filter):
+    """替换消息中 weiXinID=... 的值（包括 httpx 等第三方库记录的 URL）。"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        message = record.getMessage()
+        if "weiXinID=" in message:
+            message = _WEIXIN_ID_RE.sub(
+                lambda m: m.group(1) + redact(m.group(2)), message
+            )
+        # 写回格式化后的消息，格式化器不必再次格式化
+        record.msg, record.args = message, None
+        return True
+
+
+class SamplingFilter(logging.Filter):
+    """
+    按消息模板对标记为 SAMPLED 的 INFO 及以下日志采样，每 1/rate 条保留一条。
+
+    按模板计数而非随机采样，同一类日志的输出间隔稳定。
+    """
+
+    def __init__(self, rate: float):
+        super().__init__()
+        # rate 大于 0.5（含大于 1 的误配置）时全部保留，小于等于 0 时全部丢弃
+        self.interval = max(1, round(1 / rate)) if rate > 0 else 0
+        self._counters: dict[str, itertools.count] = {}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > logging.INFO or not getattr(record, "sampled", False):
+            return True
+        if self.interval <= 1:
+            return self.interval == 1
+        counter = self._counters.setdefault(str(record.msg), itertools.count())
+        return next(counter) % self.interval == 0
+
+
+class JSONFormatter(logging.Formatter):
+    """每条日志输出为一行 JSON，extra 传入的字段一并输出。"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        data = {
+            "time": datetime.fromtimestamp(record.created)
+            .astimezone()
+            .isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRS:
+                data[key] = value
+        if record.exc_info:
+            data["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(data, ensure_ascii=False, default=str)
+
+
+class _DeferredQueueHandler(QueueHandler):
+    """
+    不在调用方线程格式化消息的 QueueHandler。
+
+    标准 QueueHandler.prepare 会先格式化消息（为了跨进程传递），队列只在
+    进程内使用，因此原样放入记录，由后台线程格式化。
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+def create_stream_handler(
+    stream: TextIO, fmt: str = "json", redact_ids: bool = True
+) -> logging.StreamHandler:
+    """
+    创建直接写入 stream 的日志处理器（在调用方线程格式化）。
+
+    Args:
+        stream: 输出流
+        fmt: json 或 text
+        redact_ids: 是否替换消息中的 weiXinID
+    """
+    output = logging.StreamHandler(stream)
+    if fmt == "json":
+        output.setFormatter(JSONFormatter())
+    else:
+        output.setFormatter(
+            logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+        )
+    if redact_ids:
+        output.addFilter(RedactFilter())
+    return output
+
+
+def create_handler(
+    stream: TextIO,
+    fmt: str = "json",
+    sample_rate: float = 1.0,
+    redact_ids: bool = True,
+) -> tuple[QueueHandler, QueueListener]:
+    """
+    创建写入 stream 的队列日志处理器及其后台监听器（需调用 listener.start()）。
+
+    Args:
+        stream: 输出流
+        fmt: json 或 text
+        sample_rate: 标记为 SAMPLED 的日志的采样比例
+        redact_ids: 是否替换消息中的 weiXinID
+    """
+    output = create_stream_handler(stream, fmt, redact_ids)
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    handler = _DeferredQueueHandler(log_queue)
+    # 采样在入队前进行，被丢弃的日志不会进入队列
+    handler.addFilter(SamplingFilter(sample_rate))
+    listener = QueueListener(log_queue, output, respect_handler_level=True)
+    return handler, listener
+
+
+def _setup() -> QueueListener:
+    handler, listener = create_handler(
+        sys.stdout,
+        fmt=settings.LOG_FORMAT,
+        sample_rate=settings.LOG_SAMPLE_RATE,
+        redact_ids=settings.LOG_REDACT,
+    )
+    logging.basicConfig(level=settings.LOG_LEVEL, handlers=[handler])
+    listener.start()
+    # 退出时停止监听线程，写出队列中剩余的日志
+    atexit.register(listener.stop)
+    return listener
+
+
+def setup_worker_logging() -> None:
+    """
+    在解析工作进程中重新配置根日志处理器。
+
+    fork 出的子进程继承了 QueueHandler，却没有继承 QueueListener 的后台线程，
+    写入队列的日志永远不会输出；子进程改为直接写 stdout。
+    """
+    output = create_stream_handler(
+        sys.stdout, fmt=settings.LOG_FORMAT, redact_ids=settings.LOG_REDACT
+    )
+    output.addFilter(SamplingFilter(settings.LOG_SAMPLE_RATE))
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+    root.addHandler(output)
+
 
-# 配置日志基础格式
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-    handlers=[logging.StreamHandler(sys.stdout)],
-)
+_listener = _setup()
 
 logger = logging.getLogger("ecjtu_wechat_api")
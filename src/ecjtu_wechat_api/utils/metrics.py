@@ -0,0 +1,192 @@
+"""
+进程内指标注册表
+
+提供 Counter、Gauge 与 Histogram 三种指标，支持可选的标签维度，
+并可按 Prometheus 文本格式导出（/metrics）。
+"""
+
+import bisect
+import math
+import threading
+from collections.abc import Iterable, Iterator
+
+# 默认的耗时分桶（秒），与 Prometheus 客户端库一致
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class _Metric:
+    """指标基类，按标签值元组保存各个时间序列的数值。"""
+
+    type_name = "untyped"
+
+    def __init__(
+        self,
+        name: str,
+        description: str,
+        labels: tuple[str, ...] = (),
+        registry: "Registry | None" = None,
+    ):
+        self.name = name
+        self.description = description
+        self.label_names = labels
+        self._values: dict[tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+        # 默认注册到全局注册表
+        (registry or REGISTRY).register(self)
+
+    def _key(self, labels: dict[str, str]) -> tuple[str, ...]:
+        return tuple(str(labels.get(name, "")) for name in self.label_names)
+
+    def value(self, **labels: str) -> float:
+        """读取指定标签组合的当前值。"""
+        return self._values.get(self._key(labels), 0.0)
+
+    def samples(self) -> Iterator[tuple[dict[str, str], float]]:
+        """遍历所有时间序列的 (标签, 数值)。"""
+        with self._lock:
+            items = list(self._values.items())
+        for key, val in items:
+            yield dict(zip(self.label_names, key, strict=True)), val
+
+
+class Counter(_Metric):
+    """只增不减的计数器。"""
+
+    type_name = "counter"
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+
+class Gauge(_Metric):
+    """可增可减的瞬时值。"""
+
+    type_name = "gauge"
+
+    def set(self, value: float, **labels: str) -> None:
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels: str) -> None:
+        self.inc(-amount, **labels)
+
+
+class Histogram(_Metric):
+    """
+    分桶统计观测值的分布（如耗时、响应大小），同时记录总和与次数。
+
+    每个时间序列保存各桶的（非累计）计数，导出时再累加为 le 形式。
+    """
+
+    type_name = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        description: str,
+        labels: tuple[str, ...] = (),
+        buckets: Iterable[float] = DEFAULT_BUCKETS,
+        registry: "Registry | None" = None,
+    ):
+        super().__init__(name, description, labels, registry)
+        self.buckets = tuple(sorted(buckets))
+        # 标签值 -> [各桶计数..., +Inf 桶计数, 总和]
+        self._series: dict[tuple[str, ...], list[float]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [0.0] * (len(self.buckets) + 2)
+            series[index] += 1
+            series[-1] += value
+
+    def count(self, **labels: str) -> float:
+        """指定标签组合的观测次数。"""
+        series = self._series.get(self._key(labels))
+        return sum(series[:-1]) if series else 0.0
+
+    def sum(self, **labels: str) -> float:
+        """指定标签组合的观测值总和。"""
+        series = self._series.get(self._key(labels))
+        return series[-1] if series else 0.0
+
+    def value(self, **labels: str) -> float:
+        return self.count(**labels)
+
+    def samples(self) -> Iterator[tuple[dict[str, str], float]]:
+        """遍历各时间序列的 _bucket / _sum / _count 样本，标签中 __name__ 为后缀。"""
+        with self._lock:
+            items = [(key, list(series)) for key, series in self._series.items()]
+        bounds = (*self.buckets, math.inf)
+        for key, series in items:
+            labels = dict(zip(self.label_names, key, strict=True))
+            cumulative = 0.0
+            for bound, count in zip(bounds, series[:-1], strict=True):
+                cumulative += count
+                le = "+Inf" if bound == math.inf else _format_value(bound)
+                yield {"__name__": "_bucket", **labels, "le": le}, cumulative
+            yield {"__name__": "_sum", **labels}, series[-1]
+            yield {"__name__": "_count", **labels}, cumulative
+
+
+class Registry:
+    """全局指标注册表。"""
+
+    def __init__(self):
+        self._metrics: dict[str, _Metric] = {}
+
+    def register(self, metric: _Metric) -> None:
+        if metric.name in self._metrics:
+            raise ValueError(f"指标重复注册: {metric.name}")
+        self._metrics[metric.name] = metric
+
+    def get(self, name: str) -> _Metric | None:
+        return self._metrics.get(name)
+
+    def __iter__(self) -> Iterator[_Metric]:
+        return iter(list(self._metrics.values()))
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if value == -math.inf:
+        return "-Inf"
+    if math.isnan(value):
+        return "NaN"
+    return repr(int(value)) if value == int(value) else repr(value)
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def render_prometheus(registry: Registry | None = None) -> str:
+    """按 Prometheus 文本格式（0.0.4）导出注册表中的全部指标。"""
+    lines = []
+    for metric in registry or REGISTRY:
+        help_text = metric.description.replace("\\", "\\\\").replace("\n", "\\n")
+        lines.append(f"# HELP {metric.name} {help_text}")
+        lines.append(f"# TYPE {metric.name} {metric.type_name}")
+        for labels, value in metric.samples():
+            name = metric.name + labels.pop("__name__", "")
+            label_text = ",".join(
+                f'{key}="{_escape_label(val)}"' for key, val in labels.items()
+            )
+            if label_text:
+                name = f"{name}{{{label_text}}}"
+            lines.append(f"{name} {_format_value(value)}")
+    return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
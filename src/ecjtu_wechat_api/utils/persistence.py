@@ -1,4 +1,22 @@
+"""
+抓取页面与解析结果的持久化存储
+
+所有页面保存在单个 SQLite 数据库中，原始 HTML 与解析结果 JSON 均经过 zlib
+压缩，按 (category, weixin_id, key, fetched_at) 建立索引。写入由后台线程批量
+提交，调用方（包括事件循环）只需入队，不会被磁盘 I/O 阻塞。变化通知的订阅
+也保存在同一个数据库中，服务重启后可以恢复。
+"""
+
+import asyncio
 import json
+import queue
+import sqlite3
+import threading
+import time
+import zlib
+from contextlib import closing
+from dataclasses import dataclass
+from pathlib import Path
 from typing import Any
 
 from pydantic import BaseModel
@@ -6,44 +24,325 @@ from pydantic import BaseModel
 from ecjtu_wechat_api.core.config import settings
 from ecjtu_wechat_api.utils.logger import logger
 
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS pages (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    category TEXT NOT NULL,
+    weixin_id TEXT NOT NULL,
+    key TEXT NOT NULL,
+    fetched_at REAL NOT NULL,
+    html BLOB,
+    data BLOB
+);
+CREATE INDEX IF NOT EXISTS idx_pages_lookup
+    ON pages (category, weixin_id, key, fetched_at);
+CREATE TABLE IF NOT EXISTS subscriptions (
+    weixin_id TEXT PRIMARY KEY,
+    data TEXT NOT NULL
+);
+"""
+
+# 写入队列中的结束标记
+_STOP = object()
+
+
+@dataclass(frozen=True)
+class StoredPage:
+    """存储中的一条页面记录。"""
+
+    category: str
+    weixin_id: str
+    key: str
+    fetched_at: float
+    html: str | None
+    data: Any | None
+
+
+def _compress(text: str | None) -> bytes | None:
+    if text is None:
+        return None
+    return zlib.compress(text.encode("utf-8"), settings.STORE_COMPRESS_LEVEL)
+
+
+def _decompress(blob: bytes | None) -> str | None:
+    if blob is None:
+        return None
+    return zlib.decompress(blob).decode("utf-8")
 
-def save_debug_data(
-    category: str,
-    name: str,
-    html_content: str | None = None,
-    parsed_data: Any | None = None,
-):
+
+def _dump_data(parsed_data: Any) -> str | None:
+    if parsed_data is None:
+        return None
+    if isinstance(parsed_data, BaseModel):
+        return parsed_data.model_dump_json()
+    return json.dumps(parsed_data, ensure_ascii=False, default=str)
+
+
+class PageStore:
     """
-    保存抓取的数据到本地用于调试。
+    基于 SQLite 的页面存储。
 
-    Args:
-        category: 类别目录名 (如 "scores", "courses")
-        name: 文件名标识
-        html_content: 原始 HTML 内容
-        parsed_data: 解析后的数据 (支持 BaseModel 或 dict)
+    save 只负责入队，由后台写线程批量写入；读取方法是同步的，
+    在事件循环中请使用对应的 a* 异步版本（在线程中执行）。
     """
-    out_dir = settings.DATA_DIR / category
-    out_dir.mkdir(parents=True, exist_ok=True)
 
-    # 保存原始 HTML
-    if html_content:
-        html_path = out_dir / f"{name}.html"
-        try:
-            with open(html_path, mode="w", encoding="utf-8") as f:
-                f.write(html_content)
-        except Exception as e:
-            logger.warning(f"无法保存调试 HTML: {e}")
-
-    # 保存结构化 JSON
-    if parsed_data:
-        json_path = out_dir / f"{name}.json"
+    def __init__(self, path: Path, batch_size: int = 100):
+        self.path = Path(path)
+        self.batch_size = batch_size
+        self._queue: queue.Queue = queue.Queue()
+        self._writer: threading.Thread | None = None
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._schema_ready = False
+        self._closed = False
+        # 各线程的读连接，由 close() 统一关闭
+        self._readers: list[sqlite3.Connection] = []
+
+    def _connect(self, check_same_thread: bool = True) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            self.path, timeout=30, check_same_thread=check_same_thread
+        )
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def _ensure_schema(self) -> None:
+        """创建数据库文件及表结构（只执行一次）。"""
+        with self._lock:
+            if self._schema_ready:
+                return
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with closing(self._connect()) as conn, conn:
+                conn.executescript(_SCHEMA)
+            self._schema_ready = True
+
+    def _reader(self) -> sqlite3.Connection:
+        """每个线程复用一个读连接；读取不会启动写线程。"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            self._ensure_schema()
+            # 读连接由 close() 在其他线程关闭
+            conn = self._local.conn = self._connect(check_same_thread=False)
+            with self._lock:
+                self._readers.append(conn)
+        return conn
+
+    def open(self) -> None:
+        """创建数据库并启动后台写线程（重复调用无副作用）。"""
+        if self._writer is not None:
+            return
+        self._ensure_schema()
+        self._closed = False
+        self._writer = threading.Thread(
+            target=self._write_loop, name="ecjtu-store-writer", daemon=True
+        )
+        self._writer.start()
+
+    def close(self) -> None:
+        """
+        等待队列中的记录全部写入后停止写线程，并关闭所有读连接。
+
+        关闭后 save 不再隐式启动写线程（记录被丢弃），需显式调用 open()；
+        读取仍可进行，新建的读连接在下次 close() 时关闭。
+        """
+        self._closed = True
+        if self._writer is not None:
+            self._queue.put(_STOP)
+            self._writer.join()
+            self._writer = None
+        with self._lock:
+            readers, self._readers = self._readers, []
+            # 丢弃各线程持有的已关闭连接
+            self._local = threading.local()
+        for conn in readers:
+            conn.close()
+
+    def _write_loop(self) -> None:
+        conn = self._connect()
         try:
-            data_to_save = (
-                parsed_data.model_dump()
-                if isinstance(parsed_data, BaseModel)
-                else parsed_data
+            while True:
+                batch = [self._queue.get()]
+                # 尽量合并已在队列中的记录，一个事务批量提交
+                while len(batch) < self.batch_size:
+                    try:
+                        batch.append(self._queue.get_nowait())
+                    except queue.Empty:
+                        break
+                stop = _STOP in batch
+                # 序列化与压缩在写线程中进行，避免占用调用方（事件循环）的 CPU 时间
+                rows = []
+                for item in batch:
+                    if item is _STOP:
+                        continue
+                    *meta, html, parsed_data = item
+                    try:
+                        data = _dump_data(parsed_data)
+                    except (TypeError, ValueError) as e:
+                        logger.warning("序列化解析结果失败: %s", e)
+                        data = None
+                    rows.append((*meta, _compress(html), _compress(data)))
+                if rows:
+                    try:
+                        with conn:
+                            conn.executemany(
+                                "INSERT INTO pages (category, weixin_id, key, "
+                                "fetched_at, html, data) VALUES (?, ?, ?, ?, ?, ?)",
+                                rows,
+                            )
+                    except sqlite3.Error as e:
+                        logger.warning("写入页面存储失败: %s", e)
+                if stop:
+                    return
+        finally:
+            conn.close()
+
+    def save(
+        self,
+        category: str,
+        weixin_id: str,
+        key: str | None,
+        html_content: str | None = None,
+        parsed_data: Any | None = None,
+        fetched_at: float | None = None,
+    ) -> None:
+        """
+        将一次抓取结果加入写入队列（非阻塞）。
+
+        Args:
+            category: 类别，如 "scores"、"courses"、"exams"
+            weixin_id: 微信用户 ID
+            key: 学期或日期，None 表示当前学期
+            html_content: 原始 HTML 内容
+            parsed_data: 解析后的数据 (支持 BaseModel 或 dict)
+            fetched_at: 抓取时间戳，默认为当前时间
+        """
+        if self._writer is None:
+            if self._closed:
+                logger.warning("页面存储已关闭，丢弃记录: %s %s", category, key)
+                return
+            self.open()
+        # parsed_data 在写线程中序列化，调用方不应在入队后修改它
+        self._queue.put(
+            (
+                category,
+                weixin_id,
+                key or "",
+                fetched_at if fetched_at is not None else time.time(),
+                html_content if settings.STORE_SAVE_HTML else None,
+                parsed_data,
+            )
+        )
+
+    def _row_to_page(self, row: tuple) -> StoredPage:
+        category, weixin_id, key, fetched_at, html, data = row
+        data_text = _decompress(data)
+        return StoredPage(
+            category=category,
+            weixin_id=weixin_id,
+            key=key,
+            fetched_at=fetched_at,
+            html=_decompress(html),
+            data=json.loads(data_text) if data_text is not None else None,
+        )
+
+    def latest(
+        self, category: str, weixin_id: str, key: str | None
+    ) -> StoredPage | None:
+        """读取指定页面最近一次的抓取记录。"""
+        row = (
+            self._reader()
+            .execute(
+                "SELECT category, weixin_id, key, fetched_at, html, data FROM pages "
+                "WHERE category = ? AND weixin_id = ? AND key = ? "
+                "ORDER BY fetched_at DESC LIMIT 1",
+                (category, weixin_id, key or ""),
+            )
+            .fetchone()
+        )
+        return self._row_to_page(row) if row else None
+
+    def find(
+        self,
+        category: str,
+        weixin_id: str | None = None,
+        key_prefix: str = "",
+        limit: int = 100,
+    ) -> list[StoredPage]:
+        """
+        按前缀查找记录，结果按抓取时间倒序排列。
+
+        Args:
+            category: 类别
+            weixin_id: 微信用户 ID，为 None 时不限用户
+            key_prefix: 学期或日期前缀，如 "2025" 或 "2026-01"
+            limit: 最多返回的记录数
+        """
+        sql = (
+            "SELECT category, weixin_id, key, fetched_at, html, data FROM pages "
+            "WHERE category = ? AND key >= ? AND key < ?"
+        )
+        # 使用范围条件代替 LIKE，可以命中索引
+        params: list[Any] = [category, key_prefix, key_prefix + "\uffff"]
+        if weixin_id is not None:
+            sql += " AND weixin_id = ?"
+            params.append(weixin_id)
+        sql += " ORDER BY fetched_at DESC LIMIT ?"
+        params.append(limit)
+        rows = self._reader().execute(sql, params).fetchall()
+        return [self._row_to_page(row) for row in rows]
+
+    async def alatest(
+        self, category: str, weixin_id: str, key: str | None
+    ) -> StoredPage | None:
+        """latest 的异步版本，在线程中执行查询。"""
+        return await asyncio.to_thread(self.latest, category, weixin_id, key)
+
+    async def afind(
+        self,
+        category: str,
+        weixin_id: str | None = None,
+        key_prefix: str = "",
+        limit: int = 100,
+    ) -> list[StoredPage]:
+        """find 的异步版本，在线程中执行查询。"""
+        return await asyncio.to_thread(
+            self.find, category, weixin_id, key_prefix, limit
+        )
+
+    # ---- 订阅 ----
+
+    def put_subscription(self, weixin_id: str, subscription: BaseModel) -> None:
+        """保存（或覆盖）用户的订阅；写入量很小，直接在调用线程中提交。"""
+        self._ensure_schema()
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO subscriptions (weixin_id, data) VALUES (?, ?)",
+                (weixin_id, subscription.model_dump_json()),
             )
-            with open(json_path, mode="w", encoding="utf-8") as f:
-                f.write(json.dumps(data_to_save, indent=4, ensure_ascii=False))
-        except Exception as e:
-            logger.warning(f"无法保存调试 JSON: {e}")
+
+    def delete_subscription(self, weixin_id: str) -> None:
+        """删除用户的订阅，不存在时无副作用。"""
+        self._ensure_schema()
+        with closing(self._connect()) as conn, conn:
+            conn.execute("DELETE FROM subscriptions WHERE weixin_id = ?", (weixin_id,))
+
+    def subscriptions(self) -> list[dict[str, Any]]:
+        """读取所有保存的订阅。"""
+        rows = self._reader().execute("SELECT data FROM subscriptions").fetchall()
+        return [json.loads(data) for (data,) in rows]
+
+    async def aput_subscription(self, weixin_id: str, subscription: BaseModel) -> None:
+        """put_subscription 的异步版本，在线程中执行。"""
+        await asyncio.to_thread(self.put_subscription, weixin_id, subscription)
+
+    async def adelete_subscription(self, weixin_id: str) -> None:
+        """delete_subscription 的异步版本，在线程中执行。"""
+        await asyncio.to_thread(self.delete_subscription, weixin_id)
+
+    async def asubscriptions(self) -> list[dict[str, Any]]:
+        """subscriptions 的异步版本，在线程中执行查询。"""
+        return await asyncio.to_thread(self.subscriptions)
+
+
+# 全局页面存储，STORE_ENABLED 关闭时不会被写入
+page_store = PageStore(settings.STORE_PATH)
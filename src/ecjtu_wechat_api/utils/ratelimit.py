@@ -0,0 +1,241 @@
+"""
+教务系统请求限流
+
+每个上游主机一个令牌桶（限制请求速率）和一个自适应并发限制器：
+并发上限按 AIMD（加性增、乘性减）调整，延迟或错误率升高时迅速收缩，
+恢复正常后缓慢回升，使高负载下吞吐平滑下降而不是雪崩。
+"""
+
+import asyncio
+import time
+from collections import deque
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
+from ecjtu_wechat_api.core.config import settings
+from ecjtu_wechat_api.core.exceptions import UpstreamBusyError
+from ecjtu_wechat_api.utils.logger import logger
+from ecjtu_wechat_api.utils.metrics import Gauge
+
+UPSTREAM_CONCURRENCY_LIMIT = Gauge(
+    "ecjtu_upstream_concurrency_limit", "当前的上游并发上限", ("host",)
+)
+UPSTREAM_IN_FLIGHT = Gauge(
+    "ecjtu_upstream_in_flight", "正在进行中的上游请求数", ("host",)
+)
+UPSTREAM_WAITING = Gauge(
+    "ecjtu_upstream_waiting", "等待上游并发配额的请求数", ("host",)
+)
+
+
+class TokenBucket:
+    """令牌桶：平均速率 rate 个/秒，最多积累 burst 个令牌。"""
+
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = burst
+        self._updated = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def try_acquire(self) -> bool:
+        """有令牌时取出一个并返回 True，令牌不足时立即返回 False。"""
+        if self.rate <= 0:
+            return True
+        self._refill()
+        if self._tokens >= 1:
+            self._tokens -= 1
+            return True
+        return False
+
+    async def acquire(self) -> None:
+        """取出一个令牌，令牌不足时等待。"""
+        while not self.try_acquire():
+            await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+class AdaptiveLimiter:
+    """
+    AIMD 自适应并发限制器。
+
+    - 请求成功且延迟不超过 latency_target：上限增加 1/limit（约每轮 +1）
+    - 请求失败或延迟超标：上限乘以 backoff_ratio，且 cooldown 秒内最多收缩一次
+    """
+
+    def __init__(
+        self,
+        initial: int,
+        min_limit: int,
+        max_limit: int,
+        latency_target: float,
+        backoff_ratio: float = 0.7,
+        cooldown: float = 1.0,
+    ):
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.latency_target = latency_target
+        self.backoff_ratio = backoff_ratio
+        self.cooldown = cooldown
+        self._limit = float(max(min_limit, min(initial, max_limit)))
+        self._in_flight = 0
+        self._waiters: deque[asyncio.Future] = deque()
+        self._last_decrease = 0.0
+
+    @property
+    def limit(self) -> int:
+        """当前并发上限（取整）。"""
+        return int(self._limit)
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    @property
+    def waiting(self) -> int:
+        return sum(1 for w in self._waiters if not w.done())
+
+    async def acquire(self) -> None:
+        """获取一个并发配额，达到上限时排队等待。"""
+        if self._in_flight < self.limit and not self.waiting:
+            self._in_flight += 1
+            return
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await waiter
+        except BaseException:
+            # 已被唤醒但随后被取消，把配额让给下一个等待者
+            if waiter.done() and not waiter.cancelled():
+                self._in_flight -= 1
+                self._wake()
+            raise
+
+    def release(self, latency: float, ok: bool | None) -> None:
+        """
+        归还配额并根据本次请求的延迟和结果调整并发上限。
+
+        ok 为 None 表示结果未知（如请求被取消），只归还配额，不调整上限。
+        """
+        self._in_flight -= 1
+        now = time.monotonic()
+        if ok is None:
+            pass
+        elif ok and latency <= self.latency_target:
+            self._limit = min(self.max_limit, self._limit + 1 / self._limit)
+        elif now - self._last_decrease >= self.cooldown:
+            self._limit = max(self.min_limit, self._limit * self.backoff_ratio)
+            self._last_decrease = now
+            logger.warning(
+                "上游延迟或错误升高，并发上限降至 %d (latency=%.2fs, ok=%s)",
+                self.limit,
+                latency,
+                ok,
+            )
+        self._wake()
+
+    def _wake(self) -> None:
+        while self._waiters and self._in_flight < self.limit:
+            waiter = self._waiters.popleft()
+            if waiter.done():
+                continue
+            self._in_flight += 1
+            waiter.set_result(None)
+
+
+class Permit:
+    """一次上游请求持有的配额，请求结束时通过 record 报告结果。"""
+
+    def __init__(self):
+        self.started = time.monotonic()
+        self.ok: bool | None = None
+
+    def record(self, ok: bool) -> None:
+        """报告请求结果：ok 为 False 表示超时、连接错误或 5xx/429。"""
+        self.ok = ok
+
+
+class UpstreamLimiter:
+    """按主机划分的令牌桶 + 自适应并发限制器。"""
+
+    def __init__(self):
+        self._buckets: dict[str, TokenBucket] = {}
+        self._limiters: dict[str, AdaptiveLimiter] = {}
+
+    def _get(self, host: str) -> tuple[TokenBucket, AdaptiveLimiter]:
+        if host not in self._limiters:
+            self._buckets[host] = TokenBucket(
+                settings.UPSTREAM_RATE, settings.UPSTREAM_BURST
+            )
+            self._limiters[host] = AdaptiveLimiter(
+                initial=settings.UPSTREAM_INITIAL_CONCURRENCY,
+                min_limit=settings.UPSTREAM_MIN_CONCURRENCY,
+                max_limit=settings.UPSTREAM_MAX_CONCURRENCY,
+                latency_target=settings.UPSTREAM_LATENCY_TARGET,
+            )
+        return self._buckets[host], self._limiters[host]
+
+    def _publish(self, host: str, limiter: AdaptiveLimiter) -> None:
+        UPSTREAM_CONCURRENCY_LIMIT.set(limiter.limit, host=host)
+        UPSTREAM_IN_FLIGHT.set(limiter.in_flight, host=host)
+        UPSTREAM_WAITING.set(limiter.waiting, host=host)
+
+    @asynccontextmanager
+    async def slot(self, host: str) -> AsyncIterator[Permit]:
+        """
+        获取向 host 发送一次请求的许可。
+
+        Raises:
+            UpstreamBusyError: 在 UPSTREAM_ACQUIRE_TIMEOUT 秒内未获得许可时抛出。
+        """
+        bucket, limiter = self._get(host)
+
+        async def _acquire() -> None:
+            await bucket.acquire()
+            self._publish(host, limiter)
+            await limiter.acquire()
+
+        try:
+            await asyncio.wait_for(_acquire(), settings.UPSTREAM_ACQUIRE_TIMEOUT)
+        except TimeoutError as e:
+            self._publish(host, limiter)
+            raise UpstreamBusyError(
+                "教务系统请求排队超时，请稍后再试",
+                details={"host": host, "limit": limiter.limit},
+            ) from e
+        self._publish(host, limiter)
+
+        permit = Permit()
+        try:
+            yield permit
+        except asyncio.CancelledError:
+            # 客户端断开、批量任务或落败的对冲请求被取消，不能说明上游的状态，
+            # 未报告结果时只归还配额
+            raise
+        except BaseException:
+            if permit.ok is None:
+                permit.ok = False
+            raise
+        finally:
+            limiter.release(time.monotonic() - permit.started, permit.ok)
+            self._publish(host, limiter)
+
+    def snapshot(self) -> dict[str, dict[str, float]]:
+        """各主机当前的限流状态。"""
+        return {
+            host: {
+                "concurrency_limit": limiter.limit,
+                "in_flight": limiter.in_flight,
+                "waiting": limiter.waiting,
+                "rate": self._buckets[host].rate,
+                "burst": self._buckets[host].burst,
+            }
+            for host, limiter in self._limiters.items()
+        }
+
+
+# 全局上游限流器
+upstream_limiter = UpstreamLimiter()
@@ -0,0 +1,183 @@
+"""
+访问教务系统的容错机制
+
+- 带随机抖动的指数退避重试间隔
+- 按主机统计最近请求延迟，用于计算对冲请求的触发时机（p95）
+- 按主机的熔断器：连续失败达到阈值后在一段时间内直接拒绝请求
+"""
+
+import random
+import threading
+import time
+from collections import deque
+
+from ecjtu_wechat_api.core.config import settings
+from ecjtu_wechat_api.core.exceptions import CircuitOpenError
+from ecjtu_wechat_api.utils.logger import logger
+from ecjtu_wechat_api.utils.metrics import Counter, Gauge
+
+UPSTREAM_RETRIES = Counter(
+    "ecjtu_upstream_retries_total", "上游请求重试次数", ("host",)
+)
+UPSTREAM_HEDGED = Counter(
+    "ecjtu_upstream_hedged_total", "发出的对冲请求次数", ("host",)
+)
+UPSTREAM_HEDGE_WINS = Counter(
+    "ecjtu_upstream_hedge_wins_total", "对冲请求先于原请求返回的次数", ("host",)
+)
+CIRCUIT_STATE = Gauge(
+    "ecjtu_circuit_state", "熔断器状态（0 关闭，1 半开，2 打开）", ("host",)
+)
+CIRCUIT_REJECTED = Counter(
+    "ecjtu_circuit_rejected_total", "熔断期间被直接拒绝的请求数", ("host",)
+)
+
+
+def backoff_delay(attempt: int) -> float:
+    """
+    第 attempt 次重试（从 0 开始）前的等待时间。
+
+    使用 full jitter：在 [0, min(上限, 基数 * 2^attempt)] 内均匀随机，
+    避免大量请求在同一时刻集中重试。
+    """
+    cap = min(settings.HTTP_RETRY_BACKOFF_MAX, settings.HTTP_RETRY_BACKOFF * 2**attempt)
+    return random.uniform(0, cap)
+
+
+class LatencyWindow:
+    """保存最近 size 次请求延迟的滑动窗口。"""
+
+    def __init__(self, size: int = 256):
+        self._samples: deque[float] = deque(maxlen=size)
+        self._lock = threading.Lock()
+
+    def observe(self, latency: float) -> None:
+        with self._lock:
+            self._samples.append(latency)
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def quantile(self, q: float) -> float | None:
+        """窗口内延迟的 q 分位数，没有样本时返回 None。"""
+        with self._lock:
+            samples = sorted(self._samples)
+        if not samples:
+            return None
+        return samples[min(len(samples) - 1, int(q * len(samples)))]
+
+
+_latencies: dict[str, LatencyWindow] = {}
+
+
+def observe_latency(host: str, latency: float) -> None:
+    """记录一次成功请求的延迟。"""
+    _latencies.setdefault(host, LatencyWindow()).observe(latency)
+
+
+def hedge_delay(host: str) -> float:
+    """
+    发出对冲请求前的等待时间：样本足够时取最近延迟的 p95，
+    否则使用 HTTP_HEDGE_DELAY；结果不低于 HTTP_HEDGE_MIN_DELAY。
+    """
+    window = _latencies.get(host)
+    delay = settings.HTTP_HEDGE_DELAY
+    if window is not None and len(window) >= settings.HTTP_HEDGE_MIN_SAMPLES:
+        delay = window.quantile(0.95) or delay
+    return max(settings.HTTP_HEDGE_MIN_DELAY, delay)
+
+
+class CircuitBreaker:
+    """
+    单个主机的熔断器。
+
+    - 关闭：正常放行，连续失败 failure_threshold 次后打开
+    - 打开：直接拒绝请求，reset_timeout 秒后进入半开
+    - 半开：每 reset_timeout 秒放行一个探测请求，成功则关闭，失败则重新打开
+    """
+
+    CLOSED = 0
+    HALF_OPEN = 1
+    OPEN = 2
+
+    def __init__(self, host: str, failure_threshold: int, reset_timeout: float):
+        self.host = host
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._lock = threading.Lock()
+
+    def _set_state(self, state: int) -> None:
+        self.state = state
+        CIRCUIT_STATE.set(state, host=self.host)
+
+    def before_request(self) -> None:
+        """
+        请求前检查是否放行。
+
+        Raises:
+            CircuitOpenError: 熔断器打开（或半开且已有探测请求）时抛出。
+        """
+        if self.failure_threshold <= 0:
+            return
+        with self._lock:
+            if self.state == self.CLOSED:
+                return
+            now = time.monotonic()
+            if now - self._opened_at >= self.reset_timeout:
+                # 放行一个探测请求，下一个探测至少再等 reset_timeout 秒
+                self._opened_at = now
+                self._set_state(self.HALF_OPEN)
+                return
+        CIRCUIT_REJECTED.inc(host=self.host)
+        raise CircuitOpenError(
+            "教务系统暂时不可用，请稍后再试",
+            details={"host": self.host, "retry_after": self.reset_timeout},
+        )
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            if self.state != self.CLOSED:
+                logger.info("教务系统已恢复，熔断器关闭: %s", self.host)
+                self._set_state(self.CLOSED)
+
+    def record_failure(self) -> None:
+        if self.failure_threshold <= 0:
+            return
+        with self._lock:
+            self._failures += 1
+            if self.state == self.HALF_OPEN or (
+                self.state == self.CLOSED and self._failures >= self.failure_threshold
+            ):
+                logger.warning(
+                    "教务系统连续失败 %d 次，熔断 %.0f 秒: %s",
+                    self._failures,
+                    self.reset_timeout,
+                    self.host,
+                )
+                self._opened_at = time.monotonic()
+                self._set_state(self.OPEN)
+
+
+_breakers: dict[str, CircuitBreaker] = {}
+
+
+def get_breaker(host: str) -> CircuitBreaker:
+    """获取（或创建）指定主机的熔断器。"""
+    breaker = _breakers.get(host)
+    if breaker is None:
+        breaker = _breakers[host] = CircuitBreaker(
+            host,
+            failure_threshold=settings.CIRCUIT_FAILURE_THRESHOLD,
+            reset_timeout=settings.CIRCUIT_RESET_TIMEOUT,
+        )
+    return breaker
+
+
+def reset() -> None:
+    """清空所有熔断器与延迟统计（用于测试）。"""
+    _breakers.clear()
+    _latencies.clear()
@@ -0,0 +1,48 @@
+"""
+请求合并（single-flight）
+
+同一个键的并发调用只会真正执行一次，其余调用者等待并共享同一个结果或异常。
+"""
+
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Any
+
+
+class SingleFlight:
+    """按键合并并发中的相同异步调用。"""
+
+    def __init__(self):
+        self._calls: dict[Hashable, asyncio.Task] = {}
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        执行 fn，若相同 key 的调用正在进行中则直接等待其结果。
+
+        实际工作在独立的 Task 中运行，因此某个调用者被取消（如客户端断开）
+        不会影响其他仍在等待的调用者。
+
+        Args:
+            key: 合并键，如 ("scores", weiXinID, term)
+            fn: 无参的协程函数
+
+        Returns:
+            fn 的返回值；fn 抛出的异常会原样传播给所有等待者。
+        """
+        task = self._calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._calls[key] = task
+            task.add_done_callback(lambda t: self._forget(key, t))
+        return await asyncio.shield(task)
+
+    def _forget(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        # 所有等待者都被取消时，避免出现 "exception was never retrieved" 警告
+        if not task.cancelled():
+            task.exception()
+
+    def in_flight(self) -> int:
+        """当前正在进行中的调用数量。"""
+        return len(self._calls)
@@ -0,0 +1,60 @@
+"""
+请求内各阶段耗时统计
+
+每个请求在上下文中维护一份阶段耗时记录，上游请求与解析分别计入 upstream /
+parse 阶段，由 ServerTimingMiddleware 以 Server-Timing 响应头返回。
+不在请求上下文中（如脚本、后台轮询）时记录被忽略。
+"""
+
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+
+
+@dataclass
+class RequestTimings:
+    """单个请求的阶段耗时（秒）及附加说明（如缓存是否命中）。"""
+
+    stages: dict[str, float] = field(default_factory=dict)
+    notes: dict[str, str] = field(default_factory=dict)
+    # 路由函数返回的时刻（time.perf_counter()）
+    handler_end: float | None = None
+
+    def header(self, total: float) -> str:
+        """生成 Server-Timing 头，耗时单位为毫秒。"""
+        items = [f"{name};dur={dur * 1000:.1f}" for name, dur in self.stages.items()]
+        items.extend(f'{name};desc="{desc}"' for name, desc in self.notes.items())
+        items.append(f"total;dur={total * 1000:.1f}")
+        return ", ".join(items)
+
+
+# 当前请求的阶段耗时记录，由 ServerTimingMiddleware 在每个请求开始时设置
+request_timings: ContextVar[RequestTimings | None] = ContextVar(
+    "request_timings", default=None
+)
+
+
+def record_stage(name: str, seconds: float) -> None:
+    """将耗时累加到当前请求的阶段记录中，不在请求上下文中时忽略。"""
+    timings = request_timings.get()
+    if timings is not None:
+        timings.stages[name] = timings.stages.get(name, 0.0) + seconds
+
+
+def annotate(name: str, desc: str) -> None:
+    """为当前请求附加一条说明（同名覆盖），如 cache="hit"。"""
+    timings = request_timings.get()
+    if timings is not None:
+        timings.notes[name] = desc
+
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    """统计代码块耗时并计入当前请求的指定阶段。"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_stage(name, time.perf_counter() - start)
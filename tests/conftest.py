@@ -0,0 +1,23 @@
+import pytest
+
+from ecjtu_wechat_api.services.loader import page_fingerprints
+from ecjtu_wechat_api.utils import resilience
+from ecjtu_wechat_api.utils.cache import response_cache
+
+
+@pytest.fixture(autouse=True)
+def clear_response_cache():
+    # 各测试共用同一个应用实例，避免缓存结果在测试之间串扰
+    response_cache.clear()
+    page_fingerprints.clear()
+    yield
+    response_cache.clear()
+    page_fingerprints.clear()
+
+
+@pytest.fixture(autouse=True)
+def reset_circuit_breakers():
+    # 模拟教务系统出错的测试不应让熔断器影响后续测试
+    resilience.reset()
+    yield
+    resilience.reset()
@@ -0,0 +1,111 @@
+import asyncio
+import json
+
+from fastapi.testclient import TestClient
+
+from ecjtu_wechat_api.api.routes import batch
+from ecjtu_wechat_api.core.config import settings
+from ecjtu_wechat_api.core.exceptions import EducationSystemError
+from ecjtu_wechat_api.main import app
+from ecjtu_wechat_api.models.exam import ExamSchedule
+from ecjtu_wechat_api.models.score import StudentScoreInfo
+
+client = TestClient(app)
+
+
+async def fake_scores(weiXinID, term):
+    if weiXinID == "bad":
+        raise EducationSystemError("教务系统请求超时", status_code=504)
+    # 让第一个任务最后完成，验证结果按完成顺序返回
+    await asyncio.sleep(0.05 if weiXinID == "slow" else 0)
+    return StudentScoreInfo(
+        student_name=weiXinID,
+        current_term=term or "2025.1",
+        available_terms=[],
+        score_count=0,
+        scores=[],
+    )
+
+
+async def fake_exams(weiXinID, term):
+    raise RuntimeError("boom")
+
+
+def _post(monkeypatch, jobs):
+    monkeypatch.setattr(batch, "load_score_info", fake_scores)
+    monkeypatch.setattr(batch, "load_exam_schedule", fake_exams)
+    return client.post("/batch", json={"jobs": jobs})
+
+
+def test_batch_streams_ndjson(monkeypatch):
+    response = _post(
+        monkeypatch,
+        [
+            {"weiXinID": "slow", "kind": "scores", "term": "2024.2"},
+            {"weiXinID": "bad", "kind": "scores"},
+            {"weiXinID": "fast", "kind": "scores"},
+        ],
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert lines[-1]["index"] == 0
+
+    results = {line["index"]: line for line in lines}
+    assert results[0]["status"] == "ok"
+    assert results[0]["data"]["current_term"] == "2024.2"
+    assert results[1]["status"] == "error"
+    assert results[1]["error"]["status_code"] == 504
+    assert results[2]["data"]["student_name"] == "fast"
+
+
+def test_batch_unexpected_error_is_per_item(monkeypatch):
+    response = _post(monkeypatch, [{"weiXinID": "wx", "kind": "exams"}])
+
+    (line,) = [json.loads(line) for line in response.text.splitlines()]
+    assert line["status"] == "error"
+    assert line["error"]["status_code"] == 500
+    assert line["data"] is None
+
+
+def test_batch_too_many_jobs(monkeypatch):
+    monkeypatch.setattr(settings, "BATCH_MAX_JOBS", 1)
+    response = _post(monkeypatch, [{"weiXinID": "wx", "kind": "scores"}] * 2)
+    assert response.status_code == 400
+
+
+def test_batch_rejects_unknown_kind():
+    response = client.post("/batch", json={"jobs": [{"weiXinID": "wx", "kind": "x"}]})
+    assert response.status_code == 422
+
+
+def test_run_batch_limits_concurrency(monkeypatch):
+    monkeypatch.setattr(settings, "BATCH_CONCURRENCY", 2)
+    running = 0
+    peak = 0
+
+    async def tracked(weiXinID, term):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        return ExamSchedule(
+            student_name="",
+            current_term="",
+            available_terms=[],
+            exam_count=0,
+            exams=[],
+        )
+
+    monkeypatch.setattr(batch, "load_exam_schedule", tracked)
+    jobs = [batch.BatchJob(weiXinID=str(i), kind="exams") for i in range(6)]
+
+    async def scenario():
+        return [result async for result in batch.run_batch(jobs)]
+
+    results = asyncio.run(scenario())
+    assert sorted(r.index for r in results) == list(range(6))
+    assert all(r.status == "ok" for r in results)
+    assert peak == 2
@@ -0,0 +1,43 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+BENCHMARKS = Path(__file__).parent.parent / "benchmarks"
+
+
+def test_benchmark_suite_smoke(tmp_path):
+    # 以最小规模运行基准套件，确保其与解析器和接口保持同步
+    output = tmp_path / "results.json"
+    subprocess.run(
+        [
+            sys.executable,
+            str(BENCHMARKS / "run.py"),
+            "--quick",
+            "--repeat",
+            "1",
+            "--requests",
+            "2",
+            "--output",
+            str(output),
+        ],
+        capture_output=True,
+        check=True,
+        timeout=120,
+    )
+
+    report = json.loads(output.read_text(encoding="utf-8"))
+    names = [item["name"] for item in report["results"]]
+    assert names == [
+        "parse.courses[6]",
+        "parse.scores[40]",
+        "parse.exams[10]",
+        "e2e.courses.miss",
+        "e2e.courses.hit",
+        "e2e.scores.miss",
+        "e2e.scores.hit",
+        "e2e.exams.miss",
+        "e2e.exams.hit",
+    ]
+    assert all(item.get("items_per_s", 1) > 0 for item in report["results"])
+    assert all(item.get("peak_kib", 1) > 0 for item in report["results"])
@@ -0,0 +1,45 @@
+from unittest.mock import patch
+
+from ecjtu_wechat_api.models.score import TermItem
+from ecjtu_wechat_api.services.loader import is_past_term
+from ecjtu_wechat_api.utils.cache import MemoryCache, NullCache, create_cache
+
+
+def test_memory_cache_ttl_expiry():
+    cache = MemoryCache(max_size=10)
+    with patch("ecjtu_wechat_api.utils.cache.time.monotonic", return_value=100.0):
+        cache.set("k", "v", ttl=5)
+        assert cache.get("k") == "v"
+    with patch("ecjtu_wechat_api.utils.cache.time.monotonic", return_value=106.0):
+        assert cache.get("k") is None
+    assert len(cache) == 0
+
+
+def test_memory_cache_lru_eviction():
+    cache = MemoryCache(max_size=2)
+    cache.set("a", 1, ttl=60)
+    cache.set("b", 2, ttl=60)
+    # 访问 a 使其成为最近使用，插入 c 时应淘汰 b
+    assert cache.get("a") == 1
+    cache.set("c", 3, ttl=60)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+
+def test_memory_cache_ignores_non_positive_ttl():
+    cache = MemoryCache()
+    cache.set("k", "v", ttl=0)
+    assert cache.get("k") is None
+
+
+def test_create_cache_backends():
+    assert isinstance(create_cache("memory"), MemoryCache)
+    assert isinstance(create_cache("none"), NullCache)
+
+
+def test_is_past_term():
+    terms = [TermItem(name="2025.2", url=""), TermItem(name="2025.1", url="")]
+    assert is_past_term("2025.1", terms)
+    assert not is_past_term("2025.2", terms)
+    assert not is_past_term(None, terms)
@@ -0,0 +1,125 @@
+import asyncio
+
+import httpx
+import pytest
+
+from ecjtu_wechat_api.core.config import settings
+from ecjtu_wechat_api.core.exceptions import EducationSystemError
+from ecjtu_wechat_api.models.score import StudentScoreInfo
+from ecjtu_wechat_api.services import loader
+from ecjtu_wechat_api.utils import http
+
+KEY = ("scores", "wx_conditional", "2025.1")
+URL = "https://jwxt.test/weixin/ScoreQuery"
+
+
+@pytest.fixture(autouse=True)
+def no_swr(monkeypatch):
+    # TTL 为 0 时每次都重新抓取，便于观察短路行为
+    monkeypatch.setattr(settings, "SWR_ENABLED", False)
+
+
+class CountingParser:
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, html: str) -> StudentScoreInfo:
+        self.calls += 1
+        return StudentScoreInfo(
+            student_name=html,
+            current_term="2025.1",
+            available_terms=[],
+            score_count=0,
+            scores=[],
+        )
+
+
+def _load_all(pages: list[str], parse) -> list[StudentScoreInfo]:
+    remaining = iter(pages)
+
+    async def fetch():
+        return next(remaining)
+
+    async def scenario():
+        return [
+            await loader.fetch_and_parse(KEY, fetch, parse, lambda _: 0) for _ in pages
+        ]
+
+    return asyncio.run(scenario())
+
+
+def test_unchanged_page_skips_parsing():
+    parse = CountingParser()
+    first, second = _load_all(["<html>a</html>", "<html>a</html>"], parse)
+
+    assert parse.calls == 1
+    assert first.changed is None
+    assert second.changed is False
+    assert second.student_name == first.student_name
+
+
+def test_changed_page_notifies_listeners(monkeypatch):
+    events = []
+    monkeypatch.setattr(loader, "_listeners", [])
+    loader.on_change(lambda key, old, new: events.append((key, old, new)))
+
+    parse = CountingParser()
+    _, second, third = _load_all(["a", "b", "b"], parse)
+
+    assert parse.calls == 2
+    assert second.changed is True
+    assert third.changed is False
+    assert len(events) == 1
+    key, old, new = events[0]
+    assert key == KEY
+    assert (old.student_name, new.student_name) == ("a", "b")
+
+
+def test_etag_not_modified_reuses_parsed_result():
+    seen_headers = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen_headers.append(request.headers.get("If-None-Match"))
+        if request.headers.get("If-None-Match") == '"v1"':
+            return httpx.Response(304)
+        return httpx.Response(200, text="page", headers={"ETag": '"v1"'})
+
+    parse = CountingParser()
+    before = loader.PAGE_FETCHES.value(category="scores", result="not_modified")
+
+    async def scenario():
+        http._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        try:
+            return [
+                await loader.fetch_and_parse(
+                    KEY, lambda: http.get_page(URL), parse, lambda _: 0
+                )
+                for _ in range(2)
+            ]
+        finally:
+            await http.close_http_client()
+
+    first, second = asyncio.run(scenario())
+
+    assert seen_headers == [None, '"v1"']
+    assert parse.calls == 1
+    assert second.student_name == "page"
+    assert second.changed is False
+    after = loader.PAGE_FETCHES.value(category="scores", result="not_modified")
+    assert after == before + 1
+
+
+def test_unconditional_304_is_an_error():
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(304)
+
+    async def scenario():
+        http._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        try:
+            await http.get_page(URL)
+        finally:
+            await http.close_http_client()
+
+    with pytest.raises(EducationSystemError) as exc_info:
+        asyncio.run(scenario())
+    assert exc_info.value.status_code == 304
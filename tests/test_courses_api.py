@@ -0,0 +1,123 @@
+from datetime import date
+from unittest.mock import AsyncMock, patch
+
+from fastapi.testclient import TestClient
+
+from ecjtu_wechat_api.main import app
+from ecjtu_wechat_api.utils.cache import response_cache
+
+client = TestClient(app)
+
+DAY_HTML = """
+<div class="center"><p>{date} 星期{weekday}（第3周）</p></div>
+<div class="calendar">
+    <ul class="rl_info">
+        {items}
+    </ul>
+</div>
+"""
+
+COURSE_ITEM = """
+<li><p>
+    <span class="class_span">{periods}节<br /> </span>
+    {name}(上课)<br />
+    时间：1-16 {periods}<br />
+    地点：进贤2-309<br />
+    教师：李四<br />
+</p></li>
+"""
+
+WEEKDAYS = "一二三四五六日"
+
+
+def _day_html(weiXinID: str, day: str) -> str:
+    d = date.fromisoformat(day)
+    items = ""
+    # 每周一 1,2 节、周三 3,4 节有课
+    if d.isoweekday() == 1:
+        items = COURSE_ITEM.format(name="高等数学", periods="1,2")
+    elif d.isoweekday() == 3:
+        items = COURSE_ITEM.format(name="大学英语", periods="3,4")
+    return DAY_HTML.format(date=day, weekday=WEEKDAYS[d.weekday()], items=items)
+
+
+@patch(
+    "ecjtu_wechat_api.services.loader.fetch_course_schedule",
+    new_callable=AsyncMock,
+)
+def test_get_week_courses(mock_fetch):
+    mock_fetch.side_effect = _day_html
+
+    response = client.get("/courses/week?weiXinID=test_id&date=2026-03-11")
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["start_date"] == "2026-03-09"
+    assert data["end_date"] == "2026-03-15"
+    assert mock_fetch.await_count == 7
+    assert [c["name"] for c in data["courses"]] == ["高等数学", "大学英语"]
+    assert data["grid"]["1"] == {"1": [0], "2": [0]}
+    assert data["grid"]["3"] == {"3": [1], "4": [1]}
+
+
+@patch(
+    "ecjtu_wechat_api.services.loader.fetch_course_schedule",
+    new_callable=AsyncMock,
+)
+def test_get_range_courses_deduplicates_and_reuses_cache(mock_fetch):
+    mock_fetch.side_effect = _day_html
+
+    client.get("/courses/week?weiXinID=test_id&date=2026-03-09")
+    response = client.get(
+        "/courses/range?weiXinID=test_id&start=2026-03-09&end=2026-03-22"
+    )
+
+    assert response.status_code == 200
+    data = response.json()
+    # 两周内同一门课只保留一条，记录出现的所有日期
+    assert len(data["courses"]) == 2
+    assert data["courses"][0]["dates"] == ["2026-03-09", "2026-03-16"]
+    # 第一周已被缓存，只需再抓取第二周的 7 天
+    assert mock_fetch.await_count == 14
+
+
+def test_get_range_courses_rejects_invalid_range():
+    response = client.get(
+        "/courses/range?weiXinID=test_id&start=2026-03-22&end=2026-03-09"
+    )
+    assert response.status_code == 400
+
+    response = client.get(
+        "/courses/range?weiXinID=test_id&start=2025-01-01&end=2026-03-09"
+    )
+    assert response.status_code == 400
+
+
+@patch(
+    "ecjtu_wechat_api.services.loader.fetch_course_schedule",
+    new_callable=AsyncMock,
+)
+def test_course_calendar_is_cached_with_etag(mock_fetch):
+    mock_fetch.side_effect = _day_html
+    url = "/courses/calendar.ics?weiXinID=ics_id&date=2026-03-18"
+
+    response = client.get(url)
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/calendar")
+    # 两门课程各 16 周
+    assert response.text.count("BEGIN:VEVENT") == 32
+    # 第 1 周星期一 1-2 节 08:00-09:35（UTC+8）
+    assert "DTSTART:20260302T000000Z" in response.text
+    assert "DTEND:20260302T013500Z" in response.text
+
+    fetches = mock_fetch.await_count
+    cached = client.get(url, headers={"If-None-Match": response.headers["etag"]})
+    assert cached.status_code == 304
+    assert mock_fetch.await_count == fetches
+
+    # 日历按学期起始日缓存，同一学期的其他日期共用
+    assert response_cache.get(("courses_ics", "ics_id", "2026-03-02")) is not None
+    other = client.get("/courses/calendar.ics?weiXinID=ics_id&date=2026-03-20")
+    assert other.headers["etag"] == response.headers["etag"]
+    assert mock_fetch.await_count == fetches
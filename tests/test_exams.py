@@ -1,5 +1,8 @@
+from datetime import date, datetime
+
 import pytest
 
+from ecjtu_wechat_api.core.config import settings
 from ecjtu_wechat_api.core.exceptions import ParseError
 from ecjtu_wechat_api.models.exam import ExamSchedule
 from ecjtu_wechat_api.services.parse_exam import parse_exam_schedule
@@ -99,6 +102,9 @@ def test_parse_exam_schedule():
     assert exam1.time_range == "14:00-16:00"
     assert exam1.time_start == "14:00"
     assert exam1.time_end == "16:00"
+    assert exam1.exam_day == date(2026, 1, 8)
+    assert exam1.starts_at == datetime(2026, 1, 8, 14, tzinfo=settings.TIMEZONE)
+    assert exam1.ends_at == datetime(2026, 1, 8, 16, tzinfo=settings.TIMEZONE)
     assert exam1.location == "进贤1-502"
     assert exam1.course_type == "必修课"
     assert exam1.class_name == "C语言程序设计(20251-5)【小2班】"
@@ -125,3 +131,29 @@ def test_parse_empty_html():
         parse_exam_schedule("")
     with pytest.raises(ParseError):
         parse_exam_schedule(None)
+
+
+def _exam_with_time(time_text: str) -> str:
+    return f"""
+    <div class="row"><div class="col-xs-12">
+        <div class="text">考试周次:<u>18</u>考试时间:<u>{time_text}</u></div>
+        <div class="course"><mark>线性代数</mark></div>
+    </div></div>
+    """
+
+
+@pytest.mark.parametrize(
+    ("time_text", "exam_day", "has_time"),
+    [
+        ("2026年01月09日(星期五)", date(2026, 1, 9), False),
+        ("2026年02月30日(星期一)08:00-10:00", None, False),
+        ("2026年01月09日(星期五)25:00-26:00", date(2026, 1, 9), False),
+        ("待定", None, False),
+    ],
+)
+def test_parse_exam_time_fallbacks(time_text, exam_day, has_time):
+    (exam,) = parse_exam_schedule(_exam_with_time(time_text)).exams
+
+    assert exam.exam_day == exam_day
+    assert (exam.starts_at is not None) == has_time
+    assert exam.ends_at is None
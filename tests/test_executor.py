@@ -0,0 +1,83 @@
+import asyncio
+import os
+import subprocess
+import sys
+import threading
+import time
+
+import pytest
+
+from ecjtu_wechat_api.core.exceptions import ParseError, ServiceBusyError
+from ecjtu_wechat_api.services.parse_course import parse_course_schedule
+from ecjtu_wechat_api.utils.executor import PARSE_QUEUE_DEPTH, ParsePool
+
+
+def test_parse_runs_off_event_loop():
+    pool = ParsePool(workers=2, queue_size=4)
+    loop_thread = threading.get_ident()
+
+    async def scenario():
+        return await pool.run(threading.get_ident)
+
+    try:
+        assert asyncio.run(scenario()) != loop_thread
+    finally:
+        pool.shutdown()
+
+
+def test_parse_errors_propagate():
+    pool = ParsePool(workers=1, queue_size=1)
+    try:
+        with pytest.raises(ParseError):
+            asyncio.run(pool.run(parse_course_schedule, ""))
+    finally:
+        pool.shutdown()
+
+
+def test_full_queue_rejects_with_backpressure():
+    pool = ParsePool(workers=1, queue_size=1)
+
+    async def scenario():
+        # 1 个任务执行中 + 1 个任务排队，第 3 个任务应被拒绝
+        running = asyncio.ensure_future(pool.run(time.sleep, 0.05))
+        await asyncio.sleep(0.01)
+        queued = asyncio.ensure_future(pool.run(time.sleep, 0))
+        await asyncio.sleep(0)
+        assert pool.queue_depth == 1
+        assert PARSE_QUEUE_DEPTH.value() == 1
+        with pytest.raises(ServiceBusyError) as exc_info:
+            await pool.run(time.sleep, 0)
+        assert exc_info.value.status_code == 503
+        await asyncio.gather(running, queued)
+        assert pool.queue_depth == 0
+
+    try:
+        asyncio.run(scenario())
+    finally:
+        pool.shutdown()
+
+
+def test_process_workers_write_logs():
+    # 工作进程继承了 QueueHandler 却没有监听线程，需由 initializer 重新配置
+    script = """
+import asyncio
+from ecjtu_wechat_api.utils.executor import ParsePool
+from ecjtu_wechat_api.utils.logger import logger
+
+async def main():
+    pool = ParsePool("process", workers=1)
+    try:
+        await pool.run(logger.warning, "来自工作进程的日志: %s", "ok")
+    finally:
+        pool.shutdown()
+
+asyncio.run(main())
+"""
+    result = subprocess.run(
+        [sys.executable, "-c", script],
+        capture_output=True,
+        text=True,
+        check=True,
+        env={**os.environ, "LOG_FORMAT": "text"},
+    )
+    assert "来自工作进程的日志: ok" in result.stdout
@@ -0,0 +1,44 @@
+import pytest
+from test_exams import SAMPLE_HTML as EXAM_HTML
+from test_parser import SAMPLE_HTML as COURSE_HTML
+from test_scores import SAMPLE_HTML as SCORE_HTML
+
+from ecjtu_wechat_api.services.parse_course import parse_course_schedule
+from ecjtu_wechat_api.services.parse_exam import parse_exam_schedule
+from ecjtu_wechat_api.services.parse_score import parse_score_info
+from ecjtu_wechat_api.utils import html
+
+CASES = [
+    (parse_course_schedule, COURSE_HTML),
+    (parse_score_info, SCORE_HTML),
+    (parse_exam_schedule, EXAM_HTML),
+]
+
+
+@pytest.fixture
+def restore_backend():
+    yield
+    html.set_parser_backend(html.DEFAULT_PARSER)
+
+
+def test_unknown_backend_falls_back(restore_backend):
+    assert html.set_parser_backend("selectolax") == html.DEFAULT_PARSER
+
+
+@pytest.mark.parametrize(("parse", "sample"), CASES)
+def test_lxml_output_identical(restore_backend, parse, sample):
+    pytest.importorskip("lxml")
+
+    html.set_parser_backend("html.parser")
+    expected = parse(sample).model_dump_json()
+    assert html.set_parser_backend("lxml") == "lxml"
+    assert parse(sample).model_dump_json() == expected
+
+
+@pytest.mark.parametrize(
+    ("name", "class_"),
+    [("li", None), ("span", "class_span"), ("div", "calendar"), ("ul", "missing")],
+)
+def test_find_first_matches_find(name, class_):
+    soup = html.make_soup(COURSE_HTML)
+    assert html.find_first(soup, name, class_) is soup.find(name, class_=class_)
@@ -0,0 +1,56 @@
+import asyncio
+
+import httpx
+import pytest
+
+from ecjtu_wechat_api.core.exceptions import EducationSystemError
+from ecjtu_wechat_api.utils import http
+
+
+def _mock_client(handler) -> httpx.AsyncClient:
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+def test_shared_client_lifecycle():
+    async def scenario():
+        client = await http.init_http_client()
+        # 多次获取应复用同一个连接池
+        assert http.get_client() is client
+        await http.close_http_client()
+        assert client.is_closed
+        assert http._client is None
+
+    asyncio.run(scenario())
+
+
+def test_get_page_reuses_shared_client(monkeypatch):
+    seen_clients = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, text="<html>ok</html>")
+
+    async def scenario():
+        monkeypatch.setattr(http, "_client", _mock_client(handler))
+        for _ in range(3):
+            assert await http.get_page("https://example.com/a") == "<html>ok</html>"
+            seen_clients.append(http.get_client())
+        await http.close_http_client()
+
+    asyncio.run(scenario())
+    assert len({id(c) for c in seen_clients}) == 1
+
+
+def test_get_page_non_200(monkeypatch):
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(502)
+
+    async def scenario():
+        monkeypatch.setattr(http, "_client", _mock_client(handler))
+        try:
+            with pytest.raises(EducationSystemError) as exc_info:
+                await http.get_page("https://example.com/a")
+            assert exc_info.value.status_code == 502
+        finally:
+            await http.close_http_client()
+
+    asyncio.run(scenario())
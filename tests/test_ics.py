@@ -0,0 +1,152 @@
+from datetime import date, datetime
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from fastapi.testclient import TestClient
+from test_exams import SAMPLE_HTML
+
+from ecjtu_wechat_api.core.config import _env_section_times, settings
+from ecjtu_wechat_api.main import app
+from ecjtu_wechat_api.models.course import Course, TermTimetable
+from ecjtu_wechat_api.services.calendar import course_events, exam_events
+from ecjtu_wechat_api.services.parse_exam import parse_exam_schedule
+from ecjtu_wechat_api.utils.ics import Event, escape_text, fold, render_calendar
+
+client = TestClient(app)
+
+
+def test_fold_long_lines_by_octets():
+    line = "SUMMARY:" + "考试" * 30
+    folded = fold(line)
+
+    assert folded.endswith("\r\n")
+    parts = folded[:-2].split("\r\n")
+    assert all(len(p.encode("utf-8")) <= 75 for p in parts)
+    assert all(p.startswith(" ") for p in parts[1:])
+    assert "".join(p.removeprefix(" ") for p in parts) == line
+
+
+def test_escape_text():
+    assert escape_text("a,b;c\\d\ne") == "a\\,b\\;c\\\\d\\ne"
+
+
+def test_render_calendar_times_in_utc():
+    event = Event(
+        uid="1@test",
+        summary="高等数学 考试",
+        start=datetime(2026, 1, 10, 9, tzinfo=settings.TIMEZONE),
+        end=datetime(2026, 1, 10, 11, tzinfo=settings.TIMEZONE),
+    )
+    all_day = Event(uid="2@test", summary="全天", start=date(2026, 1, 9))
+    text = "".join(render_calendar("考试安排", [event, all_day]))
+
+    assert text.startswith("BEGIN:VCALENDAR\r\n")
+    assert text.endswith("END:VCALENDAR\r\n")
+    assert "DTSTART:20260110T010000Z\r\n" in text
+    assert "DTEND:20260110T030000Z\r\n" in text
+    assert "DTSTART;VALUE=DATE:20260109\r\n" in text
+
+
+def test_exam_events():
+    events = exam_events(parse_exam_schedule(SAMPLE_HTML))
+
+    assert [e.summary for e in events] == ["C语言程序设计 考试", "高等数学 考试"]
+    assert events[0].location == "进贤1-502"
+    assert "备注: 携带学生证" in events[0].description
+    # UID 由学期、课程、班级及考试时间决定，重复生成保持不变
+    assert events[0].uid == exam_events(parse_exam_schedule(SAMPLE_HTML))[0].uid
+
+
+def test_exam_events_unique_uids_for_same_course():
+    schedule = parse_exam_schedule(SAMPLE_HTML)
+    exam = schedule.exams[0]
+    retake = exam.model_copy(
+        update={"exam_day": date(2026, 3, 2), "starts_at": None, "ends_at": None}
+    )
+    schedule.exams = [exam, retake, exam]
+
+    uids = [e.uid for e in exam_events(schedule)]
+
+    assert len(set(uids)) == 3
+    assert uids == [e.uid for e in exam_events(schedule)]
+
+
+@patch("ecjtu_wechat_api.services.loader.fetch_exam_schedule", new_callable=AsyncMock)
+def test_exam_calendar_endpoint_etag(mock_fetch):
+    mock_fetch.return_value = SAMPLE_HTML
+
+    response = client.get("/exams/schedule.ics?weiXinID=ics_id")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/calendar")
+    assert response.text.count("BEGIN:VEVENT") == 2
+    etag = response.headers["etag"]
+
+    cached = client.get(
+        "/exams/schedule.ics?weiXinID=ics_id", headers={"If-None-Match": etag}
+    )
+    assert cached.status_code == 304
+    assert cached.headers["etag"] == etag
+    assert cached.content == b""
+
+    other = client.get(
+        "/exams/schedule.ics?weiXinID=ics_id", headers={"If-None-Match": '"x"'}
+    )
+    assert other.status_code == 200
+
+
+def test_section_times_from_env(monkeypatch):
+    monkeypatch.setenv("TEST_SECTION_TIMES", "1=08:00-08:45, 2=08:55-09:40,")
+    assert _env_section_times("TEST_SECTION_TIMES", {}) == {
+        1: ("08:00", "08:45"),
+        2: ("08:55", "09:40"),
+    }
+
+
+@pytest.mark.parametrize(
+    "value", ["1=08:00", "1=8-9", "x=08:00-08:45", "1=25:00-26:00", "1=09:00-08:00"]
+)
+def test_section_times_reject_malformed_entries(monkeypatch, value):
+    # 格式错误的作息表在启动时报错，而不是导出日历时返回 500
+    monkeypatch.setenv("TEST_SECTION_TIMES", f"2=08:55-09:40,{value}")
+    with pytest.raises(ValueError, match=value):
+        _env_section_times("TEST_SECTION_TIMES", {})
+
+
+def test_course_events_merge_consecutive_sections(monkeypatch):
+    monkeypatch.setattr(
+        settings, "COURSE_SECTION_TIMES", {1: ("08:00", "08:45"), 2: ("08:50", "09:35")}
+    )
+    course = Course(
+        name="高等数学",
+        status="上课",
+        time="1-2 1,2",
+        location="进贤2-309",
+        teacher="李四",
+        weeks=[[1, 2]],
+        periods=[1, 2, 5],
+    )
+    term = TermTimetable(
+        term_start="2026-03-02",
+        courses=[course],
+        index={
+            1: {1: {1: [0], 2: [0], 5: [0]}},
+            2: {1: {1: [0], 2: [0], 5: [0]}},
+        },
+    )
+
+    events = course_events(term)
+
+    # 第 5 节不在作息表中，不输出
+    assert [(e.start, e.end) for e in events] == [
+        (
+            datetime(2026, 3, 2, 8, tzinfo=settings.TIMEZONE),
+            datetime(2026, 3, 2, 9, 35, tzinfo=settings.TIMEZONE),
+        ),
+        (
+            datetime(2026, 3, 9, 8, tzinfo=settings.TIMEZONE),
+            datetime(2026, 3, 9, 9, 35, tzinfo=settings.TIMEZONE),
+        ),
+    ]
+    assert events[0].uid != events[1].uid
+    assert events[0].description == "第1周 1-2节\n教师: 李四\n状态: 上课"
@@ -0,0 +1,63 @@
+import subprocess
+import sys
+
+# 导入包本身允许的累计耗时（微秒），本机约 1 ms，留出足够余量
+IMPORT_BUDGET_US = 50_000
+
+
+def _run(stmt: str) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", stmt],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+
+def _loaded(stmt: str, modules: tuple[str, ...]) -> list[str]:
+    check = f"{stmt}; import sys; print(*(m for m in {modules!r} if m in sys.modules))"
+    return _run(check).stdout.split()
+
+
+def test_package_import_is_lazy():
+    heavy = ("fastapi", "starlette", "bs4", "httpx", "pydantic", "tomllib")
+    assert _loaded("import ecjtu_wechat_api", heavy) == []
+
+
+def test_parser_import_skips_web_framework_and_other_parsers():
+    loaded = _loaded(
+        "from ecjtu_wechat_api import parse_score_info",
+        (
+            "fastapi",
+            "httpx",
+            "sqlite3",
+            "ecjtu_wechat_api.api",
+            "ecjtu_wechat_api.utils.http",
+            "ecjtu_wechat_api.utils.persistence",
+            "ecjtu_wechat_api.models.batch",
+            "ecjtu_wechat_api.services.parse_course",
+            "ecjtu_wechat_api.services.parse_exam",
+        ),
+    )
+    assert loaded == []
+
+
+def test_package_import_time_budget():
+    stderr = _run("import ecjtu_wechat_api").stderr
+    cumulative = next(
+        int(line.split("|")[1])
+        for line in stderr.splitlines()
+        if line.rstrip().endswith("| ecjtu_wechat_api")
+    )
+    assert cumulative < IMPORT_BUDGET_US
+
+
+def test_lazy_attributes_resolve():
+    import ecjtu_wechat_api
+    from ecjtu_wechat_api.api.routes import scores
+    from ecjtu_wechat_api.services.parse_score import parse_score_info
+
+    assert ecjtu_wechat_api.parse_score_info is parse_score_info
+    assert ecjtu_wechat_api.scores_router is scores.router
+    assert isinstance(ecjtu_wechat_api.__version__, str)
+    assert "batch_router" in dir(ecjtu_wechat_api)
@@ -0,0 +1,85 @@
+import io
+import json
+import logging
+
+from ecjtu_wechat_api.utils.logger import SAMPLED, create_handler, redact
+
+
+class _CountingArg:
+    """记录被格式化的次数，用于验证消息在后台线程中惰性格式化。"""
+
+    def __init__(self):
+        self.calls = 0
+
+    def __str__(self) -> str:
+        self.calls += 1
+        return "arg"
+
+
+def _logger(name: str, **options) -> tuple[logging.Logger, io.StringIO, object]:
+    stream = io.StringIO()
+    handler, listener = create_handler(stream, **options)
+    log = logging.getLogger(f"test_logger.{name}")
+    log.propagate = False
+    log.setLevel(logging.DEBUG)
+    log.handlers = [handler]
+    listener.start()
+    return log, stream, listener
+
+
+def test_json_output_redacts_weixin_id_and_keeps_extra_fields():
+    log, stream, listener = _logger("json")
+    log.info("请求成绩: weiXinID=%s, term=%s", "wx_secret", "2025.1", extra={"n": 1})
+    log.info("HTTP Request: GET https://x/ScoreQuery?weiXinID=wx_secret&term=1")
+    listener.stop()
+
+    first, second = (json.loads(line) for line in stream.getvalue().splitlines())
+    assert first["level"] == "INFO"
+    assert first["message"] == f"请求成绩: weiXinID={redact('wx_secret')}, term=2025.1"
+    assert first["n"] == 1
+    assert "sampled" not in first
+    assert "wx_secret" not in second["message"]
+    assert second["message"].endswith(f"weiXinID={redact('wx_secret')}&term=1")
+
+
+def test_messages_are_formatted_lazily():
+    log, stream, listener = _logger("lazy", fmt="text")
+    arg = _CountingArg()
+    log.setLevel(logging.INFO)
+    log.debug("被级别过滤: %s", arg)
+    log.info("输出: %s", arg)
+    listener.stop()
+
+    # 被过滤的日志不格式化，输出的日志只格式化一次（在后台线程中）
+    assert arg.calls == 1
+    assert stream.getvalue().rstrip().endswith("输出: arg")
+
+
+def test_sampling_keeps_one_in_n_per_message():
+    log, stream, listener = _logger("sampling", fmt="text", sample_rate=0.25)
+    for i in range(8):
+        log.info("高频: %d", i, extra=SAMPLED)
+        log.info("其他高频: %d", i, extra=SAMPLED)
+    log.info("普通日志")
+    log.warning("告警不采样: %d", 1, extra=SAMPLED)
+    listener.stop()
+
+    lines = [line.split(" - ")[-1] for line in stream.getvalue().splitlines()]
+    assert lines == [
+        "高频: 0",
+        "其他高频: 0",
+        "高频: 4",
+        "其他高频: 4",
+        "普通日志",
+        "告警不采样: 1",
+    ]
+
+
+def test_sampling_rate_above_one_keeps_everything():
+    log, stream, listener = _logger("sampling_high", fmt="text", sample_rate=2)
+    for i in range(3):
+        log.info("高频: %d", i, extra=SAMPLED)
+    listener.stop()
+
+    lines = [line.split(" - ")[-1] for line in stream.getvalue().splitlines()]
+    assert lines == ["高频: 0", "高频: 1", "高频: 2"]
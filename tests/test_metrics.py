@@ -0,0 +1,71 @@
+import httpx
+from fastapi.testclient import TestClient
+from test_scores import SAMPLE_HTML
+
+from ecjtu_wechat_api.main import app
+from ecjtu_wechat_api.services.loader import CACHE_REQUESTS, PARSE_DURATION
+from ecjtu_wechat_api.utils import http
+from ecjtu_wechat_api.utils.metrics import (
+    Counter,
+    Histogram,
+    Registry,
+    render_prometheus,
+)
+
+client = TestClient(app)
+
+
+def test_histogram_buckets_are_cumulative():
+    registry = Registry()
+    histogram = Histogram("h", "测试", ("path",), buckets=(0.1, 1.0), registry=registry)
+    counter = Counter("c", "测试计数", registry=registry)
+    for value in (0.05, 0.1, 0.5, 3.0):
+        histogram.observe(value, path='a"b')
+    counter.inc(2)
+
+    assert histogram.count(path='a"b') == 4
+    assert histogram.sum(path='a"b') == 3.65
+    lines = render_prometheus(registry).splitlines()
+    assert lines[:2] == ["# HELP h 测试", "# TYPE h histogram"]
+    assert lines[2:7] == [
+        'h_bucket{path="a\\"b",le="0.1"} 2',
+        'h_bucket{path="a\\"b",le="1"} 3',
+        'h_bucket{path="a\\"b",le="+Inf"} 4',
+        'h_sum{path="a\\"b"} 3.65',
+        'h_count{path="a\\"b"} 4',
+    ]
+    assert lines[-1] == "c 2"
+
+
+def test_server_timing_and_metrics_endpoint(monkeypatch):
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, text=SAMPLE_HTML)
+
+    monkeypatch.setattr(
+        http, "_client", httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    )
+    hits = CACHE_REQUESTS.value(category="scores", result="hit")
+    parses = PARSE_DURATION.count(parser="scores")
+
+    first = client.get("/scores/info?weiXinID=metrics_id")
+    assert first.status_code == 200
+    timing = first.headers["server-timing"]
+    for part in ("upstream;dur=", "parse;dur=", "serialize;dur=", 'cache;desc="miss"'):
+        assert part in timing
+    assert timing.split(", ")[-1].startswith("total;dur=")
+
+    second = client.get("/scores/info?weiXinID=metrics_id")
+    assert 'cache;desc="hit"' in second.headers["server-timing"]
+    assert "upstream" not in second.headers["server-timing"]
+    assert CACHE_REQUESTS.value(category="scores", result="hit") == hits + 1
+    assert PARSE_DURATION.count(parser="scores") == parses + 1
+
+    response = client.get("/metrics")
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    text = response.text
+    assert (
+        'ecjtu_upstream_request_duration_seconds_count{endpoint="/weixin/ScoreQuery",'
+        'status="200"}' in text
+    )
+    assert 'ecjtu_http_response_size_bytes_count{route="/scores/info"}' in text
+    assert "# TYPE ecjtu_upstream_in_flight gauge" in text
@@ -0,0 +1,117 @@
+import os
+import subprocess
+import sys
+
+import httpx
+from fastapi.testclient import TestClient
+from test_scores import SAMPLE_HTML
+
+from ecjtu_wechat_api.main import app
+from ecjtu_wechat_api.mock.server import (
+    DirectoryPages,
+    GeneratedPages,
+    MockOptions,
+    StoredPages,
+    create_app,
+)
+from ecjtu_wechat_api.utils import http
+from ecjtu_wechat_api.utils.persistence import PageStore
+
+client = TestClient(app)
+
+
+def _use_mock(monkeypatch, mock_app):
+    monkeypatch.setattr(
+        http, "_client", httpx.AsyncClient(transport=httpx.ASGITransport(app=mock_app))
+    )
+
+
+def test_api_against_generated_pages(monkeypatch):
+    _use_mock(monkeypatch, create_app([GeneratedPages(scores=40, exams=10)]))
+
+    scores = client.get("/scores/info?weiXinID=mock&term=2024.2").json()
+    assert scores["current_term"] == "2024.2"
+    assert scores["score_count"] == 40
+    assert len(scores["available_terms"]) == 12
+
+    # 2026-01-05 是 2025-09-01 起的第 19 周
+    courses = client.get("/courses/daily?weiXinID=mock&date=2026-01-05").json()
+    assert courses["date_info"] == {
+        "date": "2026-01-05",
+        "day_of_week": "星期一",
+        "week_info": "19",
+    }
+    assert len(courses["courses"]) == 6
+
+    exams = client.get("/exams/schedule?weiXinID=mock").json()
+    assert exams["exam_count"] == 10
+
+
+def test_fault_injection_and_rate_limit():
+    mock = TestClient(create_app(options=MockOptions(error_rate=1.0, seed=1)))
+    statuses = {
+        mock.get("/weixin/ScoreQuery?weiXinID=x").status_code for _ in range(20)
+    }
+    assert statuses <= {500, 502, 503}
+
+    mock = TestClient(create_app(options=MockOptions(rate=0.001, burst=2)))
+    codes = [mock.get("/weixin/ExamArrangeCl?weiXinID=x").status_code for _ in range(3)]
+    assert codes == [200, 200, 429]
+    metrics = mock.get("/metrics").text.splitlines()
+    assert (
+        'ecjtu_mock_requests_total{endpoint="ExamArrangeCl",status="200"} 2' in metrics
+    )
+    assert mock.get("/weixin/Unknown?weiXinID=x").status_code == 404
+
+
+def test_conditional_request_returns_304():
+    mock = TestClient(create_app())
+    first = mock.get("/weixin/CalendarServlet?weiXinID=x&date=2026-01-06")
+    assert "2026-01-06 星期二（第19周）" in first.text
+
+    second = mock.get(
+        "/weixin/CalendarServlet?weiXinID=x&date=2026-01-06",
+        headers={"If-None-Match": first.headers["ETag"]},
+    )
+    assert second.status_code == 304
+
+
+def test_replay_from_store_and_directory(tmp_path):
+    store = PageStore(tmp_path / "pages.sqlite3")
+    store.save("scores", "wx1", "2025.1", SAMPLE_HTML, None)
+    store.close()
+    (tmp_path / "pages" / "exams").mkdir(parents=True)
+    (tmp_path / "pages" / "exams" / "2024.2.html").write_text("<p>2024.2</p>")
+    (tmp_path / "pages" / "exams.html").write_text("<p>默认</p>")
+    mock = TestClient(
+        create_app(
+            [
+                StoredPages(tmp_path / "pages.sqlite3"),
+                DirectoryPages(tmp_path / "pages"),
+            ]
+        )
+    )
+
+    # 其他用户请求同一学期时回放已保存的页面
+    assert mock.get("/weixin/ScoreQuery?weiXinID=wx2&term=2025.1").text == SAMPLE_HTML
+    assert mock.get("/weixin/ScoreQuery?weiXinID=wx1&term=2024.1").status_code == 404
+    assert mock.get("/weixin/ExamArrangeCl?weiXinID=x&term=2024.2").text == (
+        "<p>2024.2</p>"
+    )
+    assert mock.get("/weixin/ExamArrangeCl?weiXinID=x&term=..").text == "<p>默认</p>"
+
+
+def test_base_url_from_env():
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "from ecjtu_wechat_api.core.config import settings;"
+            "print(settings.EXAM_URL)",
+        ],
+        capture_output=True,
+        text=True,
+        check=True,
+        env={**os.environ, "JWXT_BASE_URL": "http://127.0.0.1:6895/weixin/"},
+    )
+    assert result.stdout.strip() == "http://127.0.0.1:6895/weixin/ExamArrangeCl"
@@ -0,0 +1,264 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from ecjtu_wechat_api.api.routes import notifications
+from ecjtu_wechat_api.core.config import settings
+from ecjtu_wechat_api.core.exceptions import InvalidParameterError, NotFoundError
+from ecjtu_wechat_api.main import app
+from ecjtu_wechat_api.models.notification import ChangeEvent
+from ecjtu_wechat_api.models.score import ScoreItem, StudentScoreInfo
+from ecjtu_wechat_api.services import loader, notifier
+from ecjtu_wechat_api.utils.persistence import PageStore
+
+client = TestClient(app)
+
+
+def _score(code: str, score: str) -> ScoreItem:
+    return ScoreItem(
+        course_name=f"课程{code}",
+        course_code=code,
+        final_score=score,
+        course_type="必修课",
+        credit=2.0,
+    )
+
+
+def _info(*scores: ScoreItem) -> StudentScoreInfo:
+    return StudentScoreInfo(
+        student_name="张三",
+        current_term="2025.1",
+        available_terms=[],
+        score_count=len(scores),
+        scores=list(scores),
+    )
+
+
+def _event(event_id: int, weixin_id: str = "wx") -> ChangeEvent:
+    return ChangeEvent(
+        id=event_id,
+        kind="scores",
+        weixin_id=weixin_id,
+        term="2025.1",
+        detected_at="2026-01-01T00:00:00",
+    )
+
+
+@pytest.fixture
+def poller(monkeypatch):
+    monkeypatch.setattr(settings, "POLL_RATE", 0)
+    monkeypatch.setattr(settings, "NOTIFY_WEBHOOK_URL", None)
+    monkeypatch.setattr(settings, "NOTIFY_WEBHOOK_ALLOWLIST", ["hooks.test"])
+    broker = notifier.EventBroker(history_size=10, queue_size=2)
+    poller = notifier.ChangePoller(broker)
+    monkeypatch.setattr(loader, "_listeners", [poller.detect])
+    monkeypatch.setattr(notifications, "event_broker", broker)
+    monkeypatch.setattr(notifications, "change_poller", poller)
+    return poller
+
+
+def test_diff_items():
+    old = [_score("A", "80"), _score("B", "70")]
+    new = [_score("A", "85"), _score("C", "90")]
+
+    added, removed, updated = notifier.diff_items(old, new, notifier._score_key)
+
+    assert [i.course_code for i in added] == ["C"]
+    assert [i.course_code for i in removed] == ["B"]
+    assert [(o.final_score, n.final_score) for o, n in updated] == [("80", "85")]
+
+
+def test_broker_history_and_bounded_queue():
+    broker = notifier.EventBroker(history_size=3, queue_size=2)
+    queue = broker.subscribe("wx")
+    other = broker.subscribe("other")
+    for i in range(1, 5):
+        broker.publish(_event(i))
+
+    assert [e.id for e in broker.history("wx")] == [2, 3, 4]
+    assert [e.id for e in broker.history("wx", after=3)] == [4]
+    # 队列满时丢弃最旧的事件
+    assert [queue.get_nowait().id for _ in range(queue.qsize())] == [3, 4]
+    assert other.empty()
+
+
+def test_poll_detects_new_score(poller, monkeypatch):
+    pages = iter(["a", "b", "b"])
+    parsed = {
+        "a": _info(_score("A", "80")),
+        "b": _info(_score("A", "80"), _score("B", "90")),
+    }
+
+    async def load(kind, weixin_id, term):
+        return await loader.fetch_and_parse(
+            (kind, weixin_id, term),
+            fetch=lambda: asyncio.sleep(0, next(pages)),
+            parse=parsed.__getitem__,
+            ttl=lambda _: 0,
+            refresh=True,
+        )
+
+    monkeypatch.setattr(notifier, "_load", load)
+
+    async def scenario():
+        await poller.subscribe("wx-poll", ["scores"])
+        for _ in range(3):
+            await poller.poll_once()
+
+    asyncio.run(scenario())
+
+    # 内容变化由抓取流程的 on_change 回调发现，未变化的抓取不产生事件
+    [event] = poller.broker.history("wx-poll")
+    assert event.kind == "scores"
+    assert [item["course_code"] for item in event.added] == ["B"]
+
+
+def test_poll_compares_first_fetch_with_stored_page(poller, monkeypatch):
+    async def load_from_store(key):
+        return _info(_score("A", "80"))
+
+    results = iter([_info(_score("A", "85")), _info()])
+
+    async def fake_load(kind, weixin_id, term):
+        return next(results)
+
+    monkeypatch.setattr(notifier, "load_from_store", load_from_store)
+    monkeypatch.setattr(notifier, "_load", fake_load)
+
+    async def scenario():
+        subscription = await poller.subscribe("wx-store", ["scores"])
+        await poller.check(subscription, "scores")
+        stale = next(results)
+        stale.stale = True
+        monkeypatch.setattr(notifier, "_load", lambda *args: asyncio.sleep(0, stale))
+        # 教务系统不可用时返回的过期数据不参与比较
+        await poller.check(subscription, "scores")
+
+    asyncio.run(scenario())
+
+    [event] = poller.broker.history("wx-store")
+    assert [
+        (u.before["final_score"], u.after["final_score"]) for u in event.updated
+    ] == [("80", "85")]
+
+
+def test_subscriptions_survive_restart(poller, monkeypatch, tmp_path):
+    store = PageStore(tmp_path / "pages.sqlite3")
+    monkeypatch.setattr(settings, "STORE_ENABLED", True)
+    monkeypatch.setattr(notifier, "page_store", store)
+
+    async def scenario():
+        await poller.subscribe("wx-1", ["scores"], term="2025.1")
+        await poller.subscribe("wx-2", ["exams"])
+        await poller.unsubscribe("wx-2")
+        # 重启后新建的轮询器从页面存储恢复订阅
+        restarted = notifier.ChangePoller(poller.broker)
+        assert await restarted.restore() == 1
+        return restarted
+
+    try:
+        restarted = asyncio.run(scenario())
+    finally:
+        store.close()
+
+    subscription = restarted.get("wx-1")
+    assert subscription.kinds == ["scores"]
+    assert subscription.term == "2025.1"
+    with pytest.raises(NotFoundError):
+        restarted.get("wx-2")
+
+
+def test_emit_posts_webhook(poller, monkeypatch):
+    received = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        received.append((str(request.url), json.loads(request.content)))
+        return httpx.Response(204)
+
+    async def scenario():
+        monkeypatch.setattr(
+            notifier,
+            "_webhook_client",
+            httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+        )
+        subscription = await poller.subscribe(
+            "wx", ["scores"], webhook_url="https://hooks.test/ecjtu"
+        )
+        try:
+            poller.emit(_event(7), subscription)
+            await poller.drain()
+        finally:
+            await notifier.close_webhook_client()
+
+    asyncio.run(scenario())
+
+    assert received == [("https://hooks.test/ecjtu", _event(7).model_dump())]
+
+
+def test_webhook_must_not_target_private_addresses(monkeypatch):
+    for url in (
+        "http://127.0.0.1:8080/hook",
+        "http://localhost/hook",
+        "http://10.0.0.1/hook",
+        "http://[::ffff:169.254.169.254]/latest",
+    ):
+        with pytest.raises(InvalidParameterError):
+            asyncio.run(notifier.check_webhook_url(url))
+
+    monkeypatch.setattr(settings, "NOTIFY_WEBHOOK_ALLOWLIST", ["127.0.0.1"])
+    asyncio.run(notifier.check_webhook_url("http://127.0.0.1:8080/hook"))
+
+
+def test_subscription_endpoints(poller):
+    response = client.post(
+        "/notifications/subscriptions?weiXinID=wx&kinds=exams"
+        "&webhook_url=https://hooks.test/x"
+    )
+    assert response.status_code == 200
+    assert response.json()["kinds"] == ["exams"]
+
+    assert client.get("/notifications/subscriptions?weiXinID=wx").status_code == 200
+    assert client.delete("/notifications/subscriptions?weiXinID=wx").status_code == 200
+    assert client.get("/notifications/subscriptions?weiXinID=wx").status_code == 404
+
+
+def test_subscription_rejects_bad_webhook(poller):
+    for webhook_url in ("ftp://x", "http://127.0.0.1/hook"):
+        response = client.post(
+            f"/notifications/subscriptions?weiXinID=wx&webhook_url={webhook_url}"
+        )
+        assert response.status_code == 400
+
+
+def test_events_endpoint(poller):
+    poller.broker.publish(_event(1))
+    poller.broker.publish(_event(2, "other"))
+
+    response = client.get("/notifications/events?weiXinID=wx")
+
+    assert [e["id"] for e in response.json()] == [1]
+    # 必须指定用户，不提供所有用户的事件
+    assert client.get("/notifications/events").status_code == 422
+    assert client.get("/notifications/stream").status_code == 422
+
+
+def test_event_ids_survive_restart(poller):
+    before = notifier.EventBroker(history_size=10, queue_size=2).next_id()
+    # 重启后新事件的序号仍大于客户端保存的 Last-Event-ID
+    event = _event(poller.broker.next_id())
+    poller.broker.publish(event)
+    assert event.id > before
+
+    async def first_message(last_event_id: int) -> str:
+        stream = notifications._event_stream("wx", last_event_id)
+        try:
+            return await anext(stream)
+        finally:
+            await stream.aclose()
+
+    assert f"id: {event.id}\n" in asyncio.run(first_message(before))
+    # 来自“未来”的序号（如时钟回拨）视为重新开始，补发全部历史事件
+    assert f"id: {event.id}\n" in asyncio.run(first_message(event.id * 2))
@@ -1,3 +1,5 @@
+import time
+
 import pytest
 
 from ecjtu_wechat_api.core.exceptions import ParseError
@@ -81,3 +83,79 @@ def test_parse_empty_html():
         parse_course_schedule("")
     with pytest.raises(ParseError):
         parse_course_schedule(None)
+
+
+EDGE_CASE_HTML = """
+<div class="center"><p>2026-03-04 星期三</p></div>
+<div class="calendar">
+    <ul class="rl_info">
+        <li>
+            <p>
+                <span class="class_span">1-2节<br /> </span>
+                时间：1-3，x 1,2<br />
+                数据库原理<br />
+                1-2节<br />
+                地点 进贤1-101<br />
+                教师：王五<br />
+                教师：赵六<br />
+                其他说明(补充)<br />
+                时间：5 7，8<br />
+            </p>
+        </li>
+        <li>没有详情</li>
+        <li><p>时间：3 1,2<br />地点：进贤1-102</p></li>
+        <li><p><span class="class_span">9节</span>体育（上课）</p></li>
+    </ul>
+</div>
+"""
+
+
+def test_parse_course_edge_cases():
+    result = parse_course_schedule(EDGE_CASE_HTML)
+
+    assert result.date_info.model_dump() == {
+        "date": "2026-03-04",
+        "day_of_week": "星期三",
+        "week_info": None,
+    }
+    # 没有 <p> 或没有课程名称的条目被跳过
+    assert [c.model_dump() for c in result.courses] == [
+        {
+            "name": "数据库原理",
+            "status": "",
+            # 多个时间行: 时间取最后一行，周次累加，无法解析的部分被忽略
+            "time": "5 7，8",
+            "location": "地点 进贤1-101",
+            "teacher": "赵六",
+            "weeks": [[1, 3], [5]],
+            "periods": [7, 8],
+        },
+        {
+            "name": "体育",
+            "status": "上课",
+            "time": "",
+            "location": "",
+            "teacher": "",
+            "weeks": [],
+            "periods": [],
+        },
+    ]
+
+
+@pytest.mark.benchmark
+def test_parse_course_schedule_micro_benchmark(record_property):
+    # 课表是访问量最大的接口，逐条目解析应保持单次遍历的开销；
+    # 耗时记录在测试报告中，断言只防止数量级的退化
+    item = SAMPLE_HTML.split("<li>", 1)[1].split("</li>", 1)[0]
+    page = SAMPLE_HTML.replace(f"<li>{item}</li>", f"<li>{item}</li>" * 30, 1)
+    assert len(parse_course_schedule(page).courses) == 31
+
+    best = float("inf")
+    for _ in range(5):
+        started = time.perf_counter()
+        for _ in range(20):
+            parse_course_schedule(page)
+        best = min(best, (time.perf_counter() - started) / 20)
+    record_property("parse_course_schedule_ms", round(best * 1000, 3))
+    # 本机约 7 ms，预算放宽到 0.5 s，慢速环境中可用 -m "not benchmark" 跳过
+    assert best < 0.5
@@ -0,0 +1,80 @@
+import asyncio
+import sqlite3
+import threading
+
+import pytest
+
+from ecjtu_wechat_api.models.course import CourseSchedule, DateInfo
+from ecjtu_wechat_api.utils.persistence import PageStore
+
+
+def test_save_and_latest_roundtrip(tmp_path):
+    store = PageStore(tmp_path / "pages.sqlite3")
+    parsed = CourseSchedule(date_info=DateInfo(date="2026-01-05"))
+    store.save("courses", "wx1", "2026-01-05", "<html>old</html>", parsed, 1.0)
+    store.save("courses", "wx1", "2026-01-05", "<html>new</html>", parsed, 2.0)
+    store.close()
+
+    page = store.latest("courses", "wx1", "2026-01-05")
+    assert page.html == "<html>new</html>"
+    assert page.fetched_at == 2.0
+    assert CourseSchedule.model_validate(page.data) == parsed
+    assert store.latest("courses", "wx2", "2026-01-05") is None
+
+
+def test_blobs_are_compressed(tmp_path):
+    path = tmp_path / "pages.sqlite3"
+    store = PageStore(path)
+    html = "<div class='row'>成绩</div>" * 500
+    store.save("scores", "wx1", "2025.1", html, {"score_count": 0})
+    store.close()
+
+    (blob,) = sqlite3.connect(path).execute("SELECT html FROM pages").fetchone()
+    assert len(blob) < len(html.encode("utf-8")) / 10
+
+
+def test_prefix_lookup(tmp_path):
+    store = PageStore(tmp_path / "pages.sqlite3")
+    for key in ("2025-12-31", "2026-01-05", "2026-01-06", "2026-02-01"):
+        store.save("courses", "wx1", key, None, {"key": key})
+    store.save("courses", "wx2", "2026-01-07", None, {"key": "other"})
+    store.close()
+
+    keys = sorted(p.key for p in store.find("courses", "wx1", key_prefix="2026-01"))
+    assert keys == ["2026-01-05", "2026-01-06"]
+    assert len(store.find("courses", key_prefix="2026-01")) == 3
+
+    page = asyncio.run(store.alatest("courses", "wx1", "2026-02-01"))
+    assert page.data == {"key": "2026-02-01"}
+
+
+def test_close_releases_connections_and_does_not_reopen(tmp_path):
+    store = PageStore(tmp_path / "pages.sqlite3")
+    store.save("scores", "wx1", "2025.1", None, {"n": 1})
+    reader = store._reader()
+    store.close()
+
+    # 读连接随 close() 关闭，关闭后的读取与保存都不会重新启动写线程
+    with pytest.raises(sqlite3.ProgrammingError):
+        reader.execute("SELECT 1")
+    assert store.latest("scores", "wx1", "2025.1").data == {"n": 1}
+    store.save("scores", "wx1", "2025.2", None, {"n": 2})
+    assert store._writer is None
+    assert store.latest("scores", "wx1", "2025.2") is None
+    store.close()
+
+
+def test_parsed_data_is_serialized_in_writer_thread(tmp_path):
+    threads = []
+
+    class Recorded(DateInfo):
+        def model_dump_json(self, **kwargs):
+            threads.append(threading.current_thread().name)
+            return super().model_dump_json(**kwargs)
+
+    store = PageStore(tmp_path / "pages.sqlite3")
+    store.save("courses", "wx1", "2026-01-05", None, Recorded(date="2026-01-05"))
+    store.close()
+
+    assert threads == ["ecjtu-store-writer"]
+    assert store.latest("courses", "wx1", "2026-01-05").data["date"] == "2026-01-05"
@@ -0,0 +1,140 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from ecjtu_wechat_api.core.config import settings
+from ecjtu_wechat_api.core.exceptions import EducationSystemError, ServiceBusyError
+from ecjtu_wechat_api.utils import http
+from ecjtu_wechat_api.utils.ratelimit import (
+    UPSTREAM_CONCURRENCY_LIMIT,
+    AdaptiveLimiter,
+    TokenBucket,
+    UpstreamLimiter,
+)
+
+
+def test_token_bucket_limits_rate():
+    bucket = TokenBucket(rate=100, burst=2)
+
+    async def scenario():
+        start = time.monotonic()
+        for _ in range(4):
+            await bucket.acquire()
+        return time.monotonic() - start
+
+    # 2 个突发令牌之后，剩余 2 个需按 100/s 的速率等待约 20ms
+    assert asyncio.run(scenario()) >= 0.015
+
+
+def test_aimd_increases_on_success_and_backs_off_on_errors():
+    limiter = AdaptiveLimiter(
+        initial=10, min_limit=2, max_limit=12, latency_target=1.0, cooldown=0
+    )
+
+    async def scenario():
+        for _ in range(30):
+            await limiter.acquire()
+            limiter.release(0.01, ok=True)
+        assert limiter.limit == 12
+
+        await limiter.acquire()
+        limiter.release(0.01, ok=False)
+        assert limiter.limit == 8
+
+        # 延迟超过目标同样视为过载
+        await limiter.acquire()
+        limiter.release(5.0, ok=True)
+        assert limiter.limit == 5
+
+        for _ in range(10):
+            await limiter.acquire()
+            limiter.release(0.01, ok=False)
+        assert limiter.limit == 2
+
+    asyncio.run(scenario())
+
+
+def test_concurrency_is_capped():
+    limiter = AdaptiveLimiter(initial=2, min_limit=1, max_limit=2, latency_target=1.0)
+    peak = 0
+
+    async def worker():
+        nonlocal peak
+        await limiter.acquire()
+        peak = max(peak, limiter.in_flight)
+        await asyncio.sleep(0.01)
+        limiter.release(0.01, ok=True)
+
+    async def scenario():
+        await asyncio.gather(*(worker() for _ in range(8)))
+
+    asyncio.run(scenario())
+    assert peak == 2
+    assert limiter.in_flight == 0
+
+
+def test_slot_times_out_with_service_busy(monkeypatch):
+    monkeypatch.setattr(settings, "UPSTREAM_MAX_CONCURRENCY", 1)
+    monkeypatch.setattr(settings, "UPSTREAM_MIN_CONCURRENCY", 1)
+    monkeypatch.setattr(settings, "UPSTREAM_ACQUIRE_TIMEOUT", 0.05)
+    limiter = UpstreamLimiter()
+
+    async def scenario():
+        async with limiter.slot("jwxt.test") as permit:
+            permit.record(True)
+            with pytest.raises(ServiceBusyError) as exc_info:
+                async with limiter.slot("jwxt.test"):
+                    pass
+            assert exc_info.value.status_code == 503
+        # 超时的请求不应占用配额
+        async with limiter.slot("jwxt.test") as permit:
+            permit.record(True)
+
+    asyncio.run(scenario())
+    snapshot = limiter.snapshot()["jwxt.test"]
+    assert snapshot["in_flight"] == 0
+    assert snapshot["concurrency_limit"] == 1
+
+
+def test_cancelled_request_does_not_shrink_limit(monkeypatch):
+    monkeypatch.setattr(settings, "UPSTREAM_INITIAL_CONCURRENCY", 16)
+    limiter = UpstreamLimiter()
+
+    async def hold_slot():
+        async with limiter.slot("jwxt.test"):
+            await asyncio.sleep(10)
+
+    async def scenario():
+        task = asyncio.create_task(hold_slot())
+        await asyncio.sleep(0.05)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(scenario())
+    snapshot = limiter.snapshot()["jwxt.test"]
+    assert snapshot["in_flight"] == 0
+    assert snapshot["concurrency_limit"] == 16
+
+
+def test_get_page_reports_overload_to_limiter(monkeypatch):
+    limiter = UpstreamLimiter()
+    monkeypatch.setattr(http, "upstream_limiter", limiter)
+    monkeypatch.setattr(settings, "UPSTREAM_INITIAL_CONCURRENCY", 10)
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(503, text="busy")
+
+    async def scenario():
+        monkeypatch.setattr(
+            http, "_client", httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        )
+        with pytest.raises(EducationSystemError):
+            await http.get_page("https://jwxt.test/weixin/ScoreQuery")
+        await http.close_http_client()
+
+    asyncio.run(scenario())
+    assert limiter.snapshot()["jwxt.test"]["concurrency_limit"] == 7
+    assert UPSTREAM_CONCURRENCY_LIMIT.value(host="jwxt.test") == 7
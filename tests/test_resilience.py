@@ -0,0 +1,164 @@
+import asyncio
+
+import httpx
+import pytest
+
+from ecjtu_wechat_api.core.config import settings
+from ecjtu_wechat_api.core.exceptions import CircuitOpenError, EducationSystemError
+from ecjtu_wechat_api.utils import http, resilience
+from ecjtu_wechat_api.utils.ratelimit import UpstreamLimiter
+from ecjtu_wechat_api.utils.resilience import (
+    CIRCUIT_STATE,
+    UPSTREAM_HEDGE_WINS,
+    UPSTREAM_RETRIES,
+    CircuitBreaker,
+    backoff_delay,
+)
+
+URL = "https://jwxt.test/weixin/ScoreQuery"
+
+
+@pytest.fixture(autouse=True)
+def fast_retries(monkeypatch):
+    monkeypatch.setattr(settings, "HTTP_RETRIES", 2)
+    monkeypatch.setattr(settings, "HTTP_RETRY_BACKOFF", 0.001)
+    monkeypatch.setattr(settings, "HTTP_RETRY_BACKOFF_MAX", 0.002)
+
+
+def _run(handler, scenario):
+    async def wrapper():
+        http._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        try:
+            return await scenario()
+        finally:
+            await http.close_http_client()
+
+    return asyncio.run(wrapper())
+
+
+def test_backoff_is_bounded(monkeypatch):
+    monkeypatch.setattr(settings, "HTTP_RETRY_BACKOFF", 0.1)
+    monkeypatch.setattr(settings, "HTTP_RETRY_BACKOFF_MAX", 0.5)
+    assert all(0 <= backoff_delay(0) <= 0.1 for _ in range(50))
+    assert all(0 <= backoff_delay(10) <= 0.5 for _ in range(50))
+
+
+def test_retries_transient_errors():
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        if len(calls) == 1:
+            raise httpx.ConnectError("reset", request=request)
+        if len(calls) == 2:
+            return httpx.Response(502)
+        return httpx.Response(200, text="ok")
+
+    before = UPSTREAM_RETRIES.value(host="jwxt.test")
+    assert _run(handler, lambda: http.get_page(URL)) == "ok"
+    assert len(calls) == 3
+    assert UPSTREAM_RETRIES.value(host="jwxt.test") == before + 2
+
+
+def test_client_errors_are_not_retried():
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        return httpx.Response(404)
+
+    with pytest.raises(EducationSystemError) as exc_info:
+        _run(handler, lambda: http.get_page(URL))
+    assert exc_info.value.status_code == 404
+    assert len(calls) == 1
+
+
+def test_circuit_opens_and_fails_fast(monkeypatch):
+    monkeypatch.setattr(settings, "CIRCUIT_FAILURE_THRESHOLD", 3)
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        return httpx.Response(503)
+
+    async def scenario():
+        # 1 次请求 + 2 次重试 = 连续 3 次失败，熔断器打开
+        with pytest.raises(EducationSystemError):
+            await http.get_page(URL)
+        with pytest.raises(CircuitOpenError) as exc_info:
+            await http.get_page(URL)
+        return exc_info.value
+
+    error = _run(handler, scenario)
+    assert error.status_code == 503
+    assert len(calls) == 3
+    assert CIRCUIT_STATE.value(host="jwxt.test") == CircuitBreaker.OPEN
+
+
+def test_half_open_probe_closes_circuit():
+    breaker = CircuitBreaker("jwxt.test", failure_threshold=1, reset_timeout=0.01)
+    breaker.record_failure()
+    with pytest.raises(CircuitOpenError):
+        breaker.before_request()
+
+    asyncio.run(asyncio.sleep(0.02))
+    breaker.before_request()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    # 半开期间只放行一个探测请求
+    with pytest.raises(CircuitOpenError):
+        breaker.before_request()
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+    breaker.before_request()
+
+
+def test_hedged_request_wins_over_slow_primary(monkeypatch):
+    monkeypatch.setattr(settings, "HTTP_HEDGE_ENABLED", True)
+    monkeypatch.setattr(settings, "HTTP_HEDGE_DELAY", 0.02)
+    monkeypatch.setattr(settings, "HTTP_HEDGE_MIN_DELAY", 0.01)
+    calls = 0
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            await asyncio.sleep(1)
+            return httpx.Response(200, text="slow")
+        return httpx.Response(200, text="fast")
+
+    before = UPSTREAM_HEDGE_WINS.value(host="jwxt.test")
+    assert _run(handler, lambda: http.get_page(URL)) == "fast"
+    assert calls == 2
+    assert UPSTREAM_HEDGE_WINS.value(host="jwxt.test") == before + 1
+
+
+def test_hedge_win_does_not_shrink_concurrency_limit(monkeypatch):
+    monkeypatch.setattr(settings, "HTTP_HEDGE_ENABLED", True)
+    monkeypatch.setattr(settings, "HTTP_HEDGE_DELAY", 0.02)
+    monkeypatch.setattr(settings, "HTTP_HEDGE_MIN_DELAY", 0.01)
+    monkeypatch.setattr(settings, "UPSTREAM_INITIAL_CONCURRENCY", 16)
+    limiter = UpstreamLimiter()
+    monkeypatch.setattr(http, "upstream_limiter", limiter)
+    calls = 0
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            await asyncio.sleep(1)
+        return httpx.Response(200, text="ok")
+
+    assert _run(handler, lambda: http.get_page(URL)) == "ok"
+    # 落败的原请求被取消后归还配额，不计为上游失败
+    snapshot = limiter.snapshot()["jwxt.test"]
+    assert snapshot["in_flight"] == 0
+    assert snapshot["concurrency_limit"] >= 16
+
+
+def test_hedge_delay_follows_p95(monkeypatch):
+    monkeypatch.setattr(settings, "HTTP_HEDGE_MIN_SAMPLES", 10)
+    monkeypatch.setattr(settings, "HTTP_HEDGE_MIN_DELAY", 0.0)
+    assert resilience.hedge_delay("jwxt.test") == settings.HTTP_HEDGE_DELAY
+    for i in range(1, 101):
+        resilience.observe_latency("jwxt.test", i / 100)
+    assert resilience.hedge_delay("jwxt.test") == pytest.approx(0.96)
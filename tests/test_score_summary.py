@@ -0,0 +1,115 @@
+import gc
+from unittest.mock import AsyncMock, patch
+
+from fastapi.testclient import TestClient
+
+from ecjtu_wechat_api.api.routes import scores as scores_route
+from ecjtu_wechat_api.main import app
+from ecjtu_wechat_api.models.score import ScoreItem, StudentScoreInfo, TermItem
+from ecjtu_wechat_api.services.score_summary import (
+    grade_point,
+    merge_term_scores,
+    weighted_gpa,
+)
+
+client = TestClient(app)
+
+TERMS = [TermItem(name=n, url="") for n in ("2025.1", "2024.2", "2024.1")]
+
+
+def _score(name, code, final, credit, reexam=None):
+    return ScoreItem(
+        course_name=name,
+        course_code=code,
+        final_score=final,
+        reexam_score=reexam,
+        course_type="必修课",
+        credit=credit,
+        major="主修",
+    )
+
+
+def _info(term, scores):
+    return StudentScoreInfo(
+        student_name="张三",
+        current_term=term,
+        available_terms=TERMS,
+        score_count=len(scores),
+        scores=scores,
+    )
+
+
+def test_grade_point_conversion():
+    assert grade_point("95") == 4.5
+    assert grade_point("60") == 1.0
+    assert grade_point("59") == 0.0
+    assert grade_point("良好") == 3.5
+    assert grade_point("合格") is None
+    assert grade_point("") is None
+
+
+def test_weighted_gpa_uses_best_attempt_and_skips_pass_fail():
+    scores = [
+        _score("高等数学", "1", "55", 4.0, reexam="70"),
+        _score("大学英语", "2", "90", 2.0),
+        _score("军事技能", "3", "合格", 1.0),
+    ]
+    # (2.0 * 4 + 4.0 * 2) / 6
+    assert weighted_gpa(scores) == 2.67
+
+
+def test_merge_deduplicates_retaken_courses():
+    result = merge_term_scores(
+        "张三",
+        [
+            ("2024.2", _info("2024.2", [_score("高等数学", "1", "85", 4.0)])),
+            (
+                "2024.1",
+                _info(
+                    "2024.1",
+                    [_score("高等数学", "1", "40", 4.0), _score("体育", "2", "80", 1)],
+                ),
+            ),
+        ],
+    )
+
+    assert [t.term for t in result.terms] == ["2024.2", "2024.1"]
+    assert result.terms[1].total_credit == 5.0
+    assert result.score_count == 2
+    assert result.total_credit == 5.0
+    math = next(s for s in result.scores if s.course_code == "1")
+    assert math.term == "2024.2"
+    assert math.final_score == "85"
+
+
+@patch("ecjtu_wechat_api.services.loader.fetch_score_info", new_callable=AsyncMock)
+@patch("ecjtu_wechat_api.services.loader.parse_score_info")
+def test_get_all_scores_fans_out_over_terms(mock_parse, mock_fetch):
+    pages = {
+        None: _info("2025.1", [_score("数据结构", "10", "92", 3.0)]),
+        "2024.2": _info("2024.2", [_score("离散数学", "11", "78", 2.0)]),
+        "2024.1": _info("2024.1", [_score("高等数学", "12", "88", 5.0)]),
+    }
+    mock_fetch.side_effect = lambda weiXinID, term: term
+    mock_parse.side_effect = lambda term: pages[term]
+
+    response = client.get("/scores/all?weiXinID=test_id")
+
+    assert response.status_code == 200
+    data = response.json()
+    assert [t["term"] for t in data["terms"]] == ["2025.1", "2024.2", "2024.1"]
+    assert data["score_count"] == 3
+    assert data["total_credit"] == 10.0
+    # 当前学期只抓取一次，其余学期各一次
+    assert mock_fetch.await_count == 3
+
+
+def test_fanout_semaphore_is_shared_per_user():
+    first = scores_route._fanout_semaphore("test_id")
+    assert scores_route._fanout_semaphore("test_id") is first
+    assert scores_route._fanout_semaphore("other_id") is not first
+
+    # 没有请求持有时回收，不会随用户数增长
+    del first
+    gc.collect()
+    assert "test_id" not in scores_route._fanout_semaphores
@@ -0,0 +1,162 @@
+import pytest
+
+from ecjtu_wechat_api.core.exceptions import ParseError
+from ecjtu_wechat_api.models.score import StudentScoreInfo
+from ecjtu_wechat_api.services.parse_score import parse_score_info
+
+SAMPLE_HTML = """
+<!DOCTYPE html>
+<html>
+    <body>
+        <div class="right">
+            姓名:<span>张三</span>
+            <br />
+            当前学期:<span>2025.1</span>
+        </div>
+
+        <ul class="dropdown-menu dropdown-menu-left btn-block" role="menu">
+            <li><a href="/weixin/ScoreQuery?weiXinID=xxx&term=2025.1">2025.1</a></li>
+            <li><a href="/weixin/ScoreQuery?weiXinID=xxx&term=2024.2">2024.2</a></li>
+        </ul>
+
+        <div class="words">
+            您好！本学期当前你共有
+            <strong>2</strong>门考试成绩。
+        </div>
+
+        <div class="row ">
+            <div class="col-xs-12">
+                <div class="text">
+                    <span class="course">【主修】【1500190200】军事技能(学分:1.0)</span>
+                    <div class="grade">
+                        期末成绩:
+                        <span class="score">合格</span>
+                        <br />
+                        重考成绩:
+                        <span class="score"></span>
+                        <br />
+                        重修成绩:
+                        <span class="score"></span>
+                        <br />
+                        <span class="flag">主修</span>
+                    </div>
+                </div>
+                <div class="img">
+                    <img src="/weixin/imgs/myschedule/dian.png;jsessionid=xxx">
+                </div>
+                <div class="type">
+                    <span class="require"><mark>必修课</mark> </span>
+                </div>
+            </div>
+        </div>
+
+        <div class="row ">
+            <div class="col-xs-12">
+                <div class="text">
+                    <span class="course">【主修】【1000111100】大学物理(学分:5.5)</span>
+                    <div class="grade">
+                        期末成绩:
+                        <span class="score">55</span>
+                        <br />
+                        重考成绩:
+                        <span class="score">62</span>
+                        <br />
+                        重修成绩:
+                        <span class="score"></span>
+                        <br />
+                        <span class="flag">主修</span>
+                    </div>
+                </div>
+                <div class="type">
+                    <span class="require"><mark>必修课</mark> </span>
+                </div>
+            </div>
+        </div>
+    </body>
+</html>
+"""
+
+
+def test_parse_score_info():
+    result = parse_score_info(SAMPLE_HTML)
+
+    assert isinstance(result, StudentScoreInfo)
+    assert result.student_name == "张三"
+    assert result.current_term == "2025.1"
+    assert result.score_count == 2
+
+    # 检查可选学期
+    assert [t.name for t in result.available_terms] == ["2025.1", "2024.2"]
+    assert "ScoreQuery" in result.available_terms[0].url
+
+    assert len(result.scores) == 2
+
+    score1 = result.scores[0]
+    assert score1.course_name == "军事技能"
+    assert score1.course_code == "1500190200"
+    assert score1.major == "主修"
+    assert score1.credit == 1.0
+    assert score1.final_score == "合格"
+    assert score1.reexam_score is None
+    assert score1.retake_score is None
+    assert score1.course_type == "必修课"
+
+    score2 = result.scores[1]
+    assert score2.course_name == "大学物理"
+    assert score2.credit == 5.5
+    assert score2.final_score == "55"
+    assert score2.reexam_score == "62"
+
+
+def test_parse_empty_html():
+    with pytest.raises(ParseError):
+        parse_score_info("")
+    with pytest.raises(ParseError):
+        parse_score_info(None)
+
+
+EDGE_CASE_HTML = """
+<div class="row">
+    <div class="text">
+        <span class="course">体育(学分:abc)</span>
+        <div class="type"><mark>限选课</mark></div>
+    </div>
+</div>
+<div class="row">
+    <div class="text">
+        <span class="course">【辅修】【B01】 数据结构 (学分:3)</span>
+        <div class="grade"><span class="score"> 良好 </span></div>
+    </div>
+    <div class="text"><span class="course">【x】【y】z</span></div>
+    <div class="type"><span><mark>选修课</mark></span><mark>忽略</mark></div>
+</div>
+<div class="row"><div class="col-xs-12">没有成绩</div></div>
+<div class="row"><div class="text"><div class="grade"></div></div></div>
+"""
+
+
+def test_parse_score_row_edge_cases():
+    scores = parse_score_info(EDGE_CASE_HTML).scores
+
+    assert [s.model_dump() for s in scores] == [
+        {
+            "course_name": "体育(学分:abc)",
+            "course_code": None,
+            "final_score": "",
+            "reexam_score": None,
+            "retake_score": None,
+            "course_type": "限选课",
+            "credit": 0.0,
+            "major": None,
+        },
+        {
+            "course_name": "数据结构",
+            "course_code": "B01",
+            "final_score": "良好",
+            "reexam_score": None,
+            "retake_score": None,
+            "course_type": "选修课",
+            "credit": 3.0,
+            "major": "辅修",
+        },
+    ]
@@ -8,8 +8,8 @@ from ecjtu_wechat_api.main import app
 client = TestClient(app)
 
 
-@patch("ecjtu_wechat_api.api.routes.scores.fetch_score_info", new_callable=AsyncMock)
-@patch("ecjtu_wechat_api.api.routes.scores.parse_score_info")
+@patch("ecjtu_wechat_api.services.loader.fetch_score_info", new_callable=AsyncMock)
+@patch("ecjtu_wechat_api.services.loader.parse_score_info")
 def test_get_score_info_success(mock_parse, mock_fetch):
     # Mocking successful fetch and parse
     mock_fetch.return_value = "<html>Mocked HTML</html>"
@@ -40,7 +40,7 @@ def test_get_score_info_success(mock_parse, mock_fetch):
     assert data["scores"][0]["course_name"] == "高等数学"
 
 
-@patch("ecjtu_wechat_api.api.routes.scores.fetch_score_info", new_callable=AsyncMock)
+@patch("ecjtu_wechat_api.services.loader.fetch_score_info", new_callable=AsyncMock)
 def test_get_score_info_network_error(mock_fetch):
     # Mocking network error
     mock_fetch.side_effect = EducationSystemError("网络请求失败", status_code=500)
@@ -51,8 +51,8 @@ def test_get_score_info_network_error(mock_fetch):
     assert "网络请求失败" in response.json()["message"]
 
 
-@patch("ecjtu_wechat_api.api.routes.scores.fetch_score_info", new_callable=AsyncMock)
-@patch("ecjtu_wechat_api.api.routes.scores.parse_score_info")
+@patch("ecjtu_wechat_api.services.loader.fetch_score_info", new_callable=AsyncMock)
+@patch("ecjtu_wechat_api.services.loader.parse_score_info")
 def test_get_score_info_parse_error(mock_parse, mock_fetch):
     # Mocking successful fetch but failed parse
     mock_fetch.return_value = "<html>Invalid HTML</html>"
@@ -62,3 +62,24 @@ def test_get_score_info_parse_error(mock_parse, mock_fetch):
 
     assert response.status_code == 400
     assert "数据解析失败" in response.json()["message"]
+
+
+@patch("ecjtu_wechat_api.services.loader.fetch_score_info", new_callable=AsyncMock)
+@patch("ecjtu_wechat_api.services.loader.parse_score_info")
+def test_get_score_info_cached(mock_parse, mock_fetch):
+    # 相同 (weiXinID, term) 的第二次请求应直接命中缓存
+    mock_fetch.return_value = "<html>Mocked HTML</html>"
+    mock_parse.return_value = {
+        "student_name": "张三",
+        "current_term": "2025.1",
+        "available_terms": [],
+        "score_count": 0,
+        "scores": [],
+    }
+
+    first = client.get("/scores/info?weiXinID=test_id")
+    second = client.get("/scores/info?weiXinID=test_id")
+
+    assert first.json() == second.json()
+    assert mock_fetch.await_count == 1
+    assert mock_parse.call_count == 1
@@ -0,0 +1,89 @@
+import asyncio
+
+import pytest
+
+from ecjtu_wechat_api.core.exceptions import EducationSystemError
+from ecjtu_wechat_api.services.loader import fetch_and_parse
+from ecjtu_wechat_api.utils.singleflight import SingleFlight
+
+
+def test_concurrent_calls_share_one_execution():
+    calls = 0
+
+    async def work():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return calls
+
+    async def scenario():
+        group = SingleFlight()
+        results = await asyncio.gather(*(group.do("k", work) for _ in range(10)))
+        assert group.in_flight() == 0
+        return results
+
+    assert asyncio.run(scenario()) == [1] * 10
+    assert calls == 1
+
+
+def test_waiters_receive_same_error():
+    async def failing():
+        await asyncio.sleep(0.01)
+        raise EducationSystemError("教务系统超时", status_code=504)
+
+    async def scenario():
+        group = SingleFlight()
+        return await asyncio.gather(
+            *(group.do("k", failing) for _ in range(3)), return_exceptions=True
+        )
+
+    errors = asyncio.run(scenario())
+    assert all(isinstance(e, EducationSystemError) for e in errors)
+    assert errors[0] is errors[1] is errors[2]
+
+
+def test_cancelled_caller_does_not_cancel_others():
+    async def work():
+        await asyncio.sleep(0.02)
+        return "done"
+
+    async def scenario():
+        group = SingleFlight()
+        first = asyncio.ensure_future(group.do("k", work))
+        second = asyncio.ensure_future(group.do("k", work))
+        await asyncio.sleep(0)
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        return await second
+
+    assert asyncio.run(scenario()) == "done"
+
+
+def test_fetch_and_parse_coalesces_fetch_and_parse():
+    fetches = 0
+    parses = 0
+
+    async def fetch():
+        nonlocal fetches
+        fetches += 1
+        await asyncio.sleep(0.01)
+        return "<html></html>"
+
+    def parse(html):
+        nonlocal parses
+        parses += 1
+        return {"html": html}
+
+    async def scenario():
+        return await asyncio.gather(
+            *(
+                fetch_and_parse(("test", "id", None), fetch, parse, lambda _: 60)
+                for _ in range(5)
+            )
+        )
+
+    results = asyncio.run(scenario())
+    assert all(r is results[0] for r in results)
+    assert fetches == 1
+    assert parses == 1
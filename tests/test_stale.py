@@ -0,0 +1,107 @@
+import asyncio
+
+import httpx
+
+from ecjtu_wechat_api.core.config import settings
+from ecjtu_wechat_api.core.exceptions import EducationSystemError
+from ecjtu_wechat_api.models.score import StudentScoreInfo
+from ecjtu_wechat_api.services import loader
+from ecjtu_wechat_api.utils import http
+from ecjtu_wechat_api.utils.persistence import PageStore
+from ecjtu_wechat_api.utils.ratelimit import UpstreamLimiter
+
+KEY = ("scores", "wx1", "2025.1")
+
+
+def _info(name: str) -> StudentScoreInfo:
+    return StudentScoreInfo(
+        student_name=name,
+        current_term="2025.1",
+        available_terms=[],
+        score_count=0,
+        scores=[],
+    )
+
+
+def test_stale_entry_served_while_revalidating():
+    pages = iter(["old", "new"])
+
+    async def fetch():
+        return next(pages)
+
+    async def scenario():
+        first = await loader.fetch_and_parse(KEY, fetch, _info, lambda _: 0.01)
+        await asyncio.sleep(0.02)
+
+        stale = await loader.fetch_and_parse(KEY, fetch, _info, lambda _: 60)
+        # 后台刷新完成后，后续请求得到新数据
+        await asyncio.gather(*loader._background)
+        fresh = await loader.fetch_and_parse(KEY, fetch, _info, lambda _: 60)
+        return first, stale, fresh
+
+    first, stale, fresh = asyncio.run(scenario())
+    assert first.student_name == "old"
+    assert not first.stale
+    assert stale.student_name == "old"
+    assert stale.stale
+    assert stale.age is not None
+    assert fresh.student_name == "new"
+    assert not fresh.stale
+
+
+def test_falls_back_to_store_when_upstream_down(tmp_path, monkeypatch):
+    store = PageStore(tmp_path / "pages.sqlite3")
+    store.save(*KEY, "<html></html>", _info("张三"), fetched_at=1000.0)
+    store.close()
+    monkeypatch.setattr(loader, "page_store", store)
+    monkeypatch.setattr(settings, "STORE_ENABLED", True)
+
+    async def fetch():
+        raise EducationSystemError("网络请求失败: timeout")
+
+    result = asyncio.run(loader.fetch_and_parse(KEY, fetch, _info, lambda _: 60))
+
+    assert isinstance(result, StudentScoreInfo)
+    assert result.student_name == "张三"
+    assert result.stale
+    assert result.age > 0
+
+
+def test_falls_back_to_stale_entry_when_limiter_saturated(monkeypatch):
+    # 教务系统变慢时并发上限收缩，排队超时不应让已有缓存的请求失败
+    monkeypatch.setattr(settings, "SWR_ENABLED", False)
+    monkeypatch.setattr(settings, "UPSTREAM_MAX_CONCURRENCY", 1)
+    monkeypatch.setattr(settings, "UPSTREAM_MIN_CONCURRENCY", 1)
+    monkeypatch.setattr(settings, "UPSTREAM_ACQUIRE_TIMEOUT", 0.05)
+    limiter = UpstreamLimiter()
+    monkeypatch.setattr(http, "upstream_limiter", limiter)
+    key = ("scores", "wx-busy", "2025.1")
+    url = "https://jwxt.test/weixin/ScoreQuery"
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, text="李四")
+
+    async def scenario():
+        monkeypatch.setattr(
+            http, "_client", httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        )
+        try:
+            first = await loader.fetch_and_parse(
+                key, lambda: http.get_page(url), _info, lambda _: 0.01
+            )
+            await asyncio.sleep(0.02)
+            # 占满唯一的许可，后续请求排队超时
+            async with limiter.slot("jwxt.test") as permit:
+                permit.record(True)
+                second = await loader.fetch_and_parse(
+                    key, lambda: http.get_page(url), _info, lambda _: 60
+                )
+            return first, second
+        finally:
+            await http.close_http_client()
+
+    first, second = asyncio.run(scenario())
+
+    assert not first.stale
+    assert second.student_name == "李四"
+    assert second.stale
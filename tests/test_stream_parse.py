@@ -0,0 +1,231 @@
+import asyncio
+import random
+import re
+import threading
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+from test_exams import SAMPLE_HTML as EXAM_HTML
+from test_scores import EDGE_CASE_HTML
+from test_scores import SAMPLE_HTML as SCORE_HTML
+
+from ecjtu_wechat_api.core.config import settings
+from ecjtu_wechat_api.core.exceptions import EducationSystemError, ParseError
+from ecjtu_wechat_api.main import app
+from ecjtu_wechat_api.services.parse_exam import ExamStreamParser, parse_exam_schedule
+from ecjtu_wechat_api.services.parse_score import (
+    ScoreStreamParser,
+    parse_score_info,
+    stream_score_info,
+)
+from ecjtu_wechat_api.utils import http
+from ecjtu_wechat_api.utils.executor import ParsePool
+from ecjtu_wechat_api.utils.html_stream import IrregularMarkup
+
+client = TestClient(app)
+
+
+def _feed(parser, html: str, size: int):
+    for i in range(0, len(html), size):
+        parser.feed(html[i : i + size])
+    return parser.result()
+
+
+@pytest.mark.parametrize("size", [1, 7, 64, 100000])
+def test_score_stream_matches_soup(size):
+    assert _feed(ScoreStreamParser(), SCORE_HTML, size) == parse_score_info(SCORE_HTML)
+
+
+@pytest.mark.parametrize("size", [1, 7, 64, 100000])
+def test_exam_stream_matches_soup(size):
+    assert _feed(ExamStreamParser(), EXAM_HTML, size) == parse_exam_schedule(EXAM_HTML)
+
+
+def test_score_stream_edge_cases():
+    expected = parse_score_info(EDGE_CASE_HTML)
+    assert _feed(ScoreStreamParser(), EDGE_CASE_HTML, 5) == expected
+
+
+_TAG_RE = re.compile(r"<[^>]+>")
+_STRAY_TAGS = ["</div>", "<div>", "<p>", "</span>", "<li>", '<div class="row">', "<b>"]
+
+
+def _mutate(html: str, rng: random.Random) -> str:
+    """随机删除、重复、错位标签或截断页面，构造不规范的 HTML。"""
+    tags = list(_TAG_RE.finditer(html))
+    if not tags:
+        return html
+    tag = rng.choice(tags)
+    op = rng.randrange(5)
+    if op == 0:
+        return html[: tag.start()] + html[tag.end() :]
+    if op == 1:
+        return html[: rng.randrange(len(html))]
+    if op == 2:
+        return html[: tag.end()] + tag.group() + html[tag.end() :]
+    if op == 3:
+        return html[: tag.start()] + rng.choice(_STRAY_TAGS) + html[tag.start() :]
+    first, second = sorted([tag, rng.choice(tags)], key=lambda m: m.start())
+    if first.end() > second.start():
+        return html
+    return (
+        html[: first.start()]
+        + second.group()
+        + html[first.end() : second.start()]
+        + first.group()
+        + html[second.end() :]
+    )
+
+
+@pytest.mark.parametrize(
+    "parser_cls, parse, html",
+    [
+        (ScoreStreamParser, parse_score_info, SCORE_HTML),
+        (ScoreStreamParser, parse_score_info, EDGE_CASE_HTML),
+        (ExamStreamParser, parse_exam_schedule, EXAM_HTML),
+    ],
+)
+def test_stream_matches_soup_or_reports_irregular(parser_cls, parse, html):
+    # 不规范的页面上增量解析要么与 BeautifulSoup 结果相同，要么明确要求改用完整解析
+    rng = random.Random(0)
+    irregular = 0
+    for _ in range(300):
+        page = html
+        for _ in range(rng.randint(1, 3)):
+            page = _mutate(page, rng)
+        try:
+            result = _feed(parser_cls(), page, 64)
+        except IrregularMarkup:
+            irregular += 1
+            continue
+        except ParseError:
+            with pytest.raises(ParseError):
+                parse(page)
+            continue
+        assert result == parse(page), page
+    assert irregular > 0
+
+
+def test_stream_score_info_falls_back_on_irregular_page(monkeypatch):
+    # 第一行成绩缺少结束标签，后面的成绩行被嵌套在其中
+    page = SCORE_HTML.replace("</div>", "", 1)
+    with pytest.raises(IrregularMarkup):
+        _feed(ScoreStreamParser(), page, 64)
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, content=page.encode("utf-8"))
+
+    async def scenario():
+        _mock_stream(monkeypatch, handler)
+        try:
+            return await stream_score_info("test_id")
+        finally:
+            await http.close_http_client()
+
+    html, result = asyncio.run(scenario())
+    assert html is None
+    assert result == parse_score_info(page)
+
+
+def test_stream_empty_page():
+    with pytest.raises(ParseError):
+        ScoreStreamParser().result()
+
+
+def _mock_stream(monkeypatch, handler):
+    monkeypatch.setattr(
+        http, "_client", httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    )
+
+
+def test_stream_score_info_keeps_html(monkeypatch):
+    def handler(request: httpx.Request) -> httpx.Response:
+        assert request.url.params["term"] == "2025.1"
+        return httpx.Response(200, content=SCORE_HTML.encode("utf-8"))
+
+    async def scenario():
+        _mock_stream(monkeypatch, handler)
+        try:
+            return await stream_score_info("test_id", "2025.1", keep_html=True)
+        finally:
+            await http.close_http_client()
+
+    html, result = asyncio.run(scenario())
+    assert html == SCORE_HTML
+    assert result == parse_score_info(SCORE_HTML)
+
+
+def test_stream_non_200(monkeypatch):
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(404)
+
+    async def scenario():
+        _mock_stream(monkeypatch, handler)
+        try:
+            await stream_score_info("test_id")
+        finally:
+            await http.close_http_client()
+
+    with pytest.raises(EducationSystemError) as exc_info:
+        asyncio.run(scenario())
+    assert exc_info.value.status_code == 404
+
+
+def test_exam_route_uses_stream_when_enabled(monkeypatch):
+    monkeypatch.setattr(settings, "STREAM_PARSE_ENABLED", True)
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, content=EXAM_HTML.encode("utf-8"))
+
+    monkeypatch.setattr(
+        http, "_client", httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    )
+    response = client.get("/exams/schedule?weiXinID=stream_id")
+    http._client = None
+
+    assert response.status_code == 200
+    assert response.json()["exams"] == [
+        e.model_dump(mode="json") for e in parse_exam_schedule(EXAM_HTML).exams
+    ]
+
+
+def test_stream_parse_runs_in_pool():
+    threads = set()
+
+    class RecordingParser(ScoreStreamParser):
+        def feed(self, data: str) -> None:
+            threads.add(threading.current_thread().name)
+            super().feed(data)
+
+    async def chunks():
+        for i in range(0, len(SCORE_HTML), 100):
+            yield SCORE_HTML[i : i + 100]
+            await asyncio.sleep(0)
+
+    async def scenario():
+        pool = ParsePool(workers=1)
+        try:
+            return await pool.parse_stream(RecordingParser(), chunks())
+        finally:
+            pool.shutdown()
+
+    assert asyncio.run(scenario()) == parse_score_info(SCORE_HTML)
+    assert threads and all(name.startswith("ecjtu-parse") for name in threads)
+
+
+def test_stream_not_modified_is_not_a_parse_error(monkeypatch):
+    def handler(request: httpx.Request) -> httpx.Response:
+        assert request.headers["If-None-Match"] == '"v1"'
+        return httpx.Response(304)
+
+    async def scenario():
+        _mock_stream(monkeypatch, handler)
+        try:
+            with http.conditional(http.Validators(etag='"v1"')):
+                await stream_score_info("test_id")
+        finally:
+            await http.close_http_client()
+
+    with pytest.raises(http.NotModified):
+        asyncio.run(scenario())
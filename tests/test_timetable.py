@@ -0,0 +1,128 @@
+from datetime import date, timedelta
+from unittest.mock import AsyncMock, patch
+
+from fastapi.testclient import TestClient
+
+from ecjtu_wechat_api.core.config import settings
+from ecjtu_wechat_api.main import app
+from ecjtu_wechat_api.models.course import Course, CourseSchedule, DateInfo
+from ecjtu_wechat_api.services.timetable import (
+    expand_term_timetable,
+    expand_weeks,
+    next_sample_dates,
+    term_start_from,
+)
+
+client = TestClient(app)
+
+TERM_START = date(2026, 3, 2)
+
+DAY_HTML = """
+<div class="center"><p>{date} 星期X（第{week}周）</p></div>
+<div class="calendar"><ul class="rl_info">{items}</ul></div>
+"""
+
+COURSE_ITEM = """
+<li><p>
+    <span class="class_span">节<br /> </span>
+    {name}({status})<br />
+    时间：{time}<br />
+    地点：进贤2-309<br />
+    教师：李四<br />
+</p></li>
+"""
+
+
+def _course(name, status, weeks, periods):
+    return Course(
+        name=name,
+        status=status,
+        time="",
+        location="",
+        teacher="",
+        weeks=weeks,
+        periods=periods,
+    )
+
+
+def _day_html(weiXinID: str, day: str) -> str:
+    d = date.fromisoformat(day)
+    week = (d - TERM_START).days // 7 + 1
+    items = ""
+    if d.isoweekday() == 1:
+        items = COURSE_ITEM.format(name="高等数学", status="上课", time="1-16 1,2")
+    elif d.isoweekday() == 3:
+        # 第 12 周之前页面显示为调课，实际第 12 周恢复正常上课
+        status = "上课" if week == 12 else "调课"
+        items = COURSE_ITEM.format(name="大学物理", status=status, time="1-16 3,4")
+    return DAY_HTML.format(date=day, week=week, items=items)
+
+
+def test_term_start_from_date_info():
+    info = DateInfo(date="2026-03-25", day_of_week="星期三", week_info="4")
+    assert term_start_from(info) == TERM_START
+    assert term_start_from(DateInfo(date="2026-03-25")) is None
+
+
+def test_expand_weeks():
+    assert expand_weeks([[1, 4], [6]]) == [1, 2, 3, 4, 6]
+
+
+def test_next_sample_dates_fills_weeks_not_covered_by_known_courses():
+    monday, tuesday, wednesday = (TERM_START + timedelta(days=i) for i in range(3))
+    samples = [
+        (monday, CourseSchedule(courses=[_course("高等数学", "上课", [[1, 8]], [1])])),
+        (tuesday, CourseSchedule(courses=[])),
+        (wednesday, CourseSchedule(courses=[_course("物理", "上课", [[1, 16]], [3])])),
+    ]
+
+    # 星期一第 9-16 周、星期二第 2-16 周未覆盖，各取离第 1 周最远的第 16 周；
+    # 星期三已完全覆盖；其余星期几尚未抓取过
+    dates = next_sample_dates(TERM_START, samples, limit=10)
+    assert dates[:2] == [date(2026, 6, 15), date(2026, 6, 16)]
+    assert date(2026, 6, 17) not in dates
+    assert len(dates) == 6
+    assert next_sample_dates(TERM_START, samples, limit=1) == [date(2026, 6, 15)]
+
+
+def test_expand_term_timetable_indexes_weeks_and_flags_anomalies():
+    samples = [
+        (
+            TERM_START,
+            CourseSchedule(courses=[_course("高等数学", "上课", [[1, 3]], [1, 2])]),
+        ),
+        (
+            TERM_START + timedelta(days=2),
+            CourseSchedule(courses=[_course("大学物理", "调课", [[5]], [3, 4])]),
+        ),
+    ]
+
+    term = expand_term_timetable(TERM_START, samples)
+
+    assert sorted(term.index) == [1, 2, 3]
+    assert term.index[2] == {1: {1: [0], 2: [0]}}
+    assert term.anomalous_days == {5: [3]}
+    assert len(term.courses) == 1
+
+
+@patch(
+    "ecjtu_wechat_api.services.loader.fetch_course_schedule",
+    new_callable=AsyncMock,
+)
+def test_term_week_only_refetches_anomalous_days(mock_fetch, monkeypatch):
+    monkeypatch.setattr(settings, "TIMETABLE_SAMPLE_WEEKS", [])
+    monkeypatch.setattr(settings, "TIMETABLE_MAX_SAMPLE_DAYS", 7)
+    mock_fetch.side_effect = _day_html
+
+    response = client.get("/courses/term/week?weiXinID=test_id&week=12&date=2026-03-02")
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["start_date"] == "2026-05-18"
+    assert [c["name"] for c in data["courses"]] == ["高等数学", "大学物理"]
+    assert data["courses"][1]["status"] == "上课"
+    # 采样第 1 周 7 天 + 核实第 12 周星期三 1 天
+    assert mock_fetch.await_count == 8
+    fetched = {call.args[1] for call in mock_fetch.await_args_list}
+    assert "2026-05-20" in fetched
+    assert "2026-05-18" not in fetched